@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Yarr! In-memory caches for our analytics treasure chest
+Keeps recently loaded DataFrames and analysis results in the hold so we don't
+re-parse the same CSV on every request, while never letting the cargo sink the ship!
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+from .compact import object_nbytes
+
+
+def file_fingerprint(path: str) -> Tuple[int, int]:
+    """
+    Get a cheap fingerprint for a file - its modification time (ns) and size.
+    Replacing or rewriting the file changes the fingerprint, invalidating caches.
+    """
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def frame_memory_usage(df: pd.DataFrame) -> int:
+    """Deep memory usage of a DataFrame in bytes (including object strings)"""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+class FrameCache:
+    """
+    A thread-safe LRU cache of loaded DataFrames bounded by a memory budget.
+
+    Entries are keyed by whatever the caller passes (DataManager uses
+    source name, file fingerprints and projected columns) and evicted in
+    least-recently-used order once the total size exceeds ``max_bytes``.
+    A frame larger than the whole budget is never cached.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[pd.DataFrame, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        """Fetch a cached frame (marking it most recently used) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, df: pd.DataFrame) -> None:
+        """Store a frame, evicting least recently used entries to stay in budget"""
+        size = frame_memory_usage(df)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (df, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def snapshot(self) -> List[Tuple[Hashable, pd.DataFrame, int]]:
+        """The cached ``(key, frame, size)`` entries, least recently used first"""
+        with self._lock:
+            return [(key, df, size) for key, (df, size) in self._entries.items()]
+
+    def invalidate(self, predicate=None) -> int:
+        """
+        Drop entries whose key matches ``predicate`` (all entries if None).
+        Returns the number of entries dropped.
+        """
+        with self._lock:
+            doomed = [
+                key for key in self._entries if predicate is None or predicate(key)
+            ]
+            for key in doomed:
+                self.current_bytes -= self._entries.pop(key)[1]
+            return len(doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current memory usage"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class ResultCache:
+    """
+    A thread-safe LRU cache of small analysis results with a time-to-live.
+
+    Keys should include the data fingerprint, so a changed file never serves
+    stale results; the TTL just bounds how long unused entries linger.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Fetch a fresh cached result (marking it most recently used) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a result, evicting the least recently used beyond ``max_entries``"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, self._clock() + self.ttl_seconds)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def nbytes(self) -> int:
+        """Rough memory held by the cached results (and their keys)"""
+        with self._lock:
+            entries = list(self._entries.items())
+        return sum(
+            object_nbytes(key) + object_nbytes(value) for key, (value, _) in entries
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction/expiration counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
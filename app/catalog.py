@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Yarr! A persistent catalog of the data directory, so the ship needn't chart
+the whole harbour again on every boot. A sidecar JSON file remembers what
+discovery found in each directory or archive, and per data file its columns,
+row count, distinct-value counts and (for schema files) the parsed table -
+each entry tagged with the fingerprint it was taken from, and trusted only
+while that fingerprint still matches.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+# Name of the catalog sidecar inside a data directory
+CATALOG_FILE_NAME = ".catalog.json"
+
+# Bumped whenever the layout changes - older catalogs are simply rebuilt
+CATALOG_VERSION = 1
+
+
+def _fingerprint_token(fingerprint: Any) -> Any:
+    """Fingerprints as they round-trip through JSON (tuples become lists)"""
+    return list(fingerprint) if isinstance(fingerprint, (tuple, list)) else fingerprint
+
+
+class SourceCatalog:
+    """
+    Listings (what a directory or archive holds) and file facts, keyed by
+    location and validated by fingerprint. Thread-safe. With ``path`` None
+    the catalog lives in memory only.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._listings: Dict[str, Dict[str, Any]] = {}
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        """Read the sidecar, if there is a readable one of our version"""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Warning: Ignoring unreadable catalog {self.path}: {e}")
+            return
+        if data.get("version") == CATALOG_VERSION:
+            self._listings = data.get("listings", {})
+            self._files = data.get("files", {})
+
+    def listing(self, location: str, fingerprint: Any) -> Optional[Dict[str, Any]]:
+        """What discovery found at ``location``, if it hasn't changed since"""
+        with self._lock:
+            entry = self._listings.get(location)
+            if entry is None or entry["fingerprint"] != _fingerprint_token(fingerprint):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry["listing"]
+
+    def put_listing(self, location: str, fingerprint: Any, listing: Dict[str, Any]):
+        """Remember what discovery found at ``location``"""
+        with self._lock:
+            self._listings[location] = {
+                "fingerprint": _fingerprint_token(fingerprint),
+                "listing": listing,
+            }
+            self._dirty = True
+
+    def file_info(self, key: str, fingerprint: Any) -> Dict[str, Any]:
+        """Known facts about a file's current version (empty if none)"""
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is None or entry["fingerprint"] != _fingerprint_token(fingerprint):
+                return {}
+            return dict(entry["info"])
+
+    def update_file(self, key: str, fingerprint: Any, **info):
+        """
+        Record facts about a file version - merged with what's known about the
+        same version, replacing anything recorded for an older one
+        """
+        fingerprint = _fingerprint_token(fingerprint)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is None or entry["fingerprint"] != fingerprint:
+                entry = self._files[key] = {"fingerprint": fingerprint, "info": {}}
+            entry["info"].update(info)
+            self._dirty = True
+
+    def retain(self, locations: Iterable[str], keys: Iterable[str]):
+        """Forget listings and files that are no longer there"""
+        locations, keys = set(locations), set(keys)
+        with self._lock:
+            for stale in [loc for loc in self._listings if loc not in locations]:
+                del self._listings[stale]
+                self._dirty = True
+            for stale in [key for key in self._files if key not in keys]:
+                del self._files[stale]
+                self._dirty = True
+
+    def save(self):
+        """
+        Write the sidecar if anything changed - atomically, and only warning
+        when the data directory is read-only (the catalog still works in memory)
+        """
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+            data = {
+                "version": CATALOG_VERSION,
+                "listings": self._listings,
+                "files": self._files,
+            }
+            temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            try:
+                temp_path.write_text(json.dumps(data), encoding="utf-8")
+                os.replace(temp_path, self.path)
+                self._dirty = False
+            except OSError as e:
+                print(f"⚠️ Warning: Could not save catalog {self.path}: {e}")
+            finally:
+                if temp_path.exists():
+                    temp_path.unlink()
+
+    def stats(self) -> Dict[str, Any]:
+        """Listing hit/miss counters and catalog size"""
+        with self._lock:
+            return {
+                "listings": len(self._listings),
+                "files": len(self._files),
+                "listing_hits": self.hits,
+                "listing_misses": self.misses,
+                "persistent": self.path is not None,
+            }
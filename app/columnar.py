@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Yarr! Persistent columnar (Parquet) copies of our CSV treasure
+The first load of a CSV writes a Parquet copy right next to it, with the
+multi-value technology columns stored pre-tokenized as lists. Later loads read
+the copy instead - no text parsing, and only the columns we ask for!
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .token_counting import TokenColumn, tokenize_series
+
+# Pre-tokenized columns are stored next to the raw ones under this prefix
+TOKEN_COLUMN_PREFIX = "__tokens__"
+
+# Parquet metadata key recording which version of the CSV a copy was built from
+FINGERPRINT_METADATA_KEY = b"source_fingerprint"
+
+# Rows per Parquet row group - row groups are the unit of parallel counting
+ROW_GROUP_ROWS = 64 * 1024
+
+
+def columnar_path(csv_path: str) -> Path:
+    """Where the columnar copy of a CSV lives - a hidden file beside it"""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f".{csv_path.name}.parquet")
+
+
+def _fingerprint_token(fingerprint: Tuple[int, int]) -> bytes:
+    """Serialize a file fingerprint for the Parquet metadata"""
+    return f"{fingerprint[0]}:{fingerprint[1]}".encode()
+
+
+def is_columnar_current(path: Path, fingerprint: Tuple[int, int]) -> bool:
+    """Check whether a columnar copy exists and was built from this CSV version"""
+    if not path.exists():
+        return False
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except Exception:
+        return False
+    return metadata.get(FINGERPRINT_METADATA_KEY) == _fingerprint_token(fingerprint)
+
+
+def _token_list_array(column: TokenColumn) -> pa.LargeListArray:
+    """Convert a TokenColumn to an Arrow list<string> array (null rows stay null)"""
+    return pa.LargeListArray.from_arrays(
+        pa.array(column.offsets, type=pa.int64()),
+        pa.array(column.vocabulary[column.codes], type=pa.string()),
+        mask=pa.array(~column.valid),
+    )
+
+
+def build_columnar_copy(
+    df: pd.DataFrame,
+    path: Path,
+    fingerprint: Tuple[int, int],
+    token_columns: Iterable[str],
+) -> Path:
+    """
+    Write the columnar copy of a freshly parsed CSV to ``path``, tagged with
+    the CSV's ``fingerprint``. ``token_columns`` present in the frame are also
+    stored pre-tokenized. The copy is written to a temporary file and moved
+    into place atomically.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    for column in token_columns:
+        if column in df.columns:
+            table = table.append_column(
+                TOKEN_COLUMN_PREFIX + column,
+                _token_list_array(tokenize_series(df[column])),
+            )
+
+    metadata = dict(table.schema.metadata or {})
+    metadata[FINGERPRINT_METADATA_KEY] = _fingerprint_token(fingerprint)
+    table = table.replace_schema_metadata(metadata)
+
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        pq.write_table(table, temp_path, row_group_size=ROW_GROUP_ROWS)
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+    return path
+
+
+def columnar_columns(path: Path) -> List[str]:
+    """Raw (non-token) column names stored in a columnar copy"""
+    return [
+        name
+        for name in pq.read_schema(path).names
+        if not name.startswith(TOKEN_COLUMN_PREFIX)
+    ]
+
+
+def read_columnar(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read raw columns (all of them if ``columns`` is None) from a columnar copy"""
+    if columns is None:
+        columns = columnar_columns(path)
+    return pq.read_table(path, columns=columns).to_pandas()
+
+
+def iter_columnar(
+    path: Path, columns: List[str], batch_rows: int
+) -> Iterator[pd.DataFrame]:
+    """Read raw columns from a columnar copy in frames of at most ``batch_rows``"""
+    for batch in pq.ParquetFile(path).iter_batches(
+        batch_size=batch_rows, columns=columns
+    ):
+        yield batch.to_pandas()
+
+
+def stored_bytes(path: Path, columns: Iterable[str]) -> int:
+    """Compressed bytes of ``columns`` in a columnar copy - what reading them costs"""
+    wanted = set(columns)
+    metadata = pq.ParquetFile(path).metadata
+    total = 0
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            chunk = row_group.column(j)
+            if chunk.path_in_schema.split(".")[0] in wanted:
+                total += chunk.total_compressed_size
+    return total
+
+
+def row_count(path: Path) -> int:
+    """Number of rows in a columnar copy (from its footer, no data read)"""
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def has_token_column(path: Path, column: str) -> bool:
+    """Whether a columnar copy stores ``column`` pre-tokenized"""
+    return TOKEN_COLUMN_PREFIX + column in pq.read_schema(path).names
+
+
+def read_token_columns(path: Path, columns: List[str]) -> Dict[str, TokenColumn]:
+    """
+    Read pre-tokenized columns from a columnar copy in one go, as TokenColumns
+    Columns the copy has no token list stored for are left out of the result.
+    """
+    names = set(pq.read_schema(path).names)
+    stored = [column for column in columns if TOKEN_COLUMN_PREFIX + column in names]
+    if not stored:
+        return {}
+
+    table = pq.read_table(path, columns=[TOKEN_COLUMN_PREFIX + c for c in stored])
+    return {
+        column: token_column_from_lists(table.column(TOKEN_COLUMN_PREFIX + column))
+        for column in stored
+    }
+
+
+def read_token_column(path: Path, column: str) -> Optional[TokenColumn]:
+    """
+    Read a pre-tokenized column from a columnar copy as a TokenColumn,
+    or None if the copy has no token list stored for ``column``.
+    """
+    return read_token_columns(path, [column]).get(column)
+
+
+def token_column_from_lists(lists: pa.ChunkedArray) -> TokenColumn:
+    """Convert a stored token list column back into a TokenColumn"""
+    lists = lists.combine_chunks()
+    offsets = np.asarray(lists.offsets, dtype=np.int64)
+    # Dictionary encoding assigns codes in first-appearance order
+    encoded = pc.dictionary_encode(lists.flatten())
+    return TokenColumn(
+        vocabulary=np.asarray(encoded.dictionary.to_pylist(), dtype=object),
+        codes=np.asarray(encoded.indices, dtype=np.int32),
+        offsets=offsets - offsets[0],
+        valid=~np.asarray(lists.is_null(), dtype=bool),
+    )
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Yarr! Compact in-memory frames and memory accounting for the hold
+In compact mode loaded frames keep categorical and multi-value technology
+columns dictionary-encoded (integer codes into one table of distinct values)
+and numeric columns in the smallest dtype that holds them without loss.
+Multi-value columns are encoded by whole answer - one entry per distinct
+semicolon-joined combination, not per technology. Per-technology codes live
+in the token columns of the technology indexes and the token store.
+"""
+
+import sys
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+# Multi-value columns get dictionary-encoded up to this share of distinct answers
+MAX_DISTINCT_RATIO = 0.5
+
+
+def array_nbytes(array: np.ndarray) -> int:
+    """Memory held by a NumPy array, counting the Python objects in object arrays"""
+    if array.dtype != object:
+        return int(array.nbytes)
+    return int(array.nbytes) + sum(sys.getsizeof(value) for value in array)
+
+
+def object_nbytes(value) -> int:
+    """
+    Rough memory held by a cached value - arrays and anything with an
+    ``nbytes`` (like TokenCounts) by their buffers, containers with their items
+    """
+    if isinstance(value, np.ndarray):
+        return array_nbytes(value)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            object_nbytes(key) + object_nbytes(item) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(object_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def downcast_numeric(series: pd.Series) -> pd.Series:
+    """
+    The smallest numeric dtype holding ``series`` exactly - integers shrink to
+    the narrowest signed type, floats to float32 only if every value survives
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    if pd.api.types.is_float_dtype(series):
+        narrow = series.astype(np.float32)
+        if narrow.astype(np.float64).equals(series.astype(np.float64)):
+            return narrow
+    return series
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    categorical_columns: Iterable[str],
+    multi_value_columns: Iterable[str],
+) -> pd.DataFrame:
+    """
+    A compact copy of ``df``: categorical and multi-value columns become
+    pandas categoricals (each distinct whole answer stored once, rows hold
+    integer codes) and numeric columns get downcast. Values are unchanged.
+    Multi-value columns whose answers are mostly unique stay as they are -
+    a dictionary of near-unique strings saves nothing.
+    """
+    categorical_columns = set(categorical_columns)
+    multi_value_columns = set(multi_value_columns)
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        if column in categorical_columns or (
+            column in multi_value_columns
+            and series.nunique() <= len(series) * MAX_DISTINCT_RATIO
+        ):
+            series = series.astype("category")
+        elif pd.api.types.is_numeric_dtype(series):
+            series = downcast_numeric(series)
+        columns[column] = series
+
+    compacted = pd.DataFrame(columns, index=df.index)
+    compacted.attrs.update(df.attrs)
+    return compacted
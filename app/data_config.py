@@ -5,13 +5,40 @@ This be where we define different data sources and their schemas, matey!
 Enhanced to handle multiple zip files automatically like a proper data pirate!
 """
 
+import multiprocessing
 import os
+import threading
 import pandas as pd
 import zipfile
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
+from . import columnar, partitions, sampling, source_io, token_store
+from .cache import FrameCache, file_fingerprint
+from .catalog import CATALOG_FILE_NAME, SourceCatalog
+from .compact import compact_frame
+from .incremental import AppendTracker
+from .metrics import metrics
+from .parsing import INFER_ROWS, ParsingProfile, infer_parsing_profile, resolve_engine
+from .tech_index import CategoricalEncoding, CoOccurrence, TechnologyIndex
+from .token_counting import TokenColumn, TokenCounts, tokenize_series
+
+# Default memory budget for cached DataFrames (overridable per DataManager)
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+# Sources bigger than this are streamed in chunks when their load_mode is "auto"
+DEFAULT_STREAMING_THRESHOLD_BYTES = 2 * 1024 * 1024 * 1024
+
+# Rows per chunk in streaming mode - peak memory scales with this, not the file
+DEFAULT_STREAM_CHUNK_ROWS = 100_000
+
+LOAD_MODES = ("auto", "memory", "streaming")
+
+# Rows sampled per source and column for approximate analyses
+DEFAULT_APPROX_SAMPLE_ROWS = sampling.DEFAULT_SAMPLE_ROWS
+
 
 @dataclass
 class DataSource:
@@ -23,12 +50,24 @@ class DataSource:
     description: str
     file_path: str
     schema_file: Optional[str] = None
+    # Yarr! When set, file_path and schema_file be member names inside this zip
+    archive_path: Optional[str] = None
     primary_columns: List[str] = None
     date_columns: List[str] = None
     categorical_columns: List[str] = None
+    # "memory" loads whole columns, "streaming" aggregates chunk by chunk and
+    # "auto" streams only files above the DataManager's size threshold
+    load_mode: str = "auto"
+    # Yarr! Explicit dtypes and parser engine for full reads - inferred during
+    # discovery when left out (None parses with pandas' defaults)
+    parsing_profile: Optional[ParsingProfile] = None
 
     def __post_init__(self):
         """Yarr! Set up default values after initialization"""
+        if self.load_mode not in LOAD_MODES:
+            raise ValueError(
+                f"Arrr! Unknown load_mode '{self.load_mode}'. Choose from: {list(LOAD_MODES)}"
+            )
         if self.primary_columns is None:
             self.primary_columns = []
         if self.date_columns is None:
@@ -43,18 +82,148 @@ class DataManager:
     Automatically extracts zip files and manages multiple data sources like a seasoned pirate!
     """
 
-    def __init__(self, base_data_path: str):
+    def __init__(
+        self,
+        base_data_path: str,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        columnar_cache: bool = True,
+        extract_archives: bool = False,
+        streaming_threshold_bytes: Optional[int] = DEFAULT_STREAMING_THRESHOLD_BYTES,
+        stream_chunk_rows: int = DEFAULT_STREAM_CHUNK_ROWS,
+        parallel_workers: int = 1,
+        incremental_appends: bool = True,
+        compact_frames: bool = False,
+        persistent_catalog: bool = True,
+        approx_sample_rows: int = DEFAULT_APPROX_SAMPLE_ROWS,
+        mapped_token_store: bool = True,
+        csv_engine: str = "auto",
+    ):
         self.base_data_path = Path(base_data_path)
-        self.data_sources = {}
-        self._ensure_data_extracted()
-        self._setup_data_sources()
+        # Yarr! Discovery results and file facts survive restarts in a sidecar
+        self.persistent_catalog = persistent_catalog
+        self._catalog = SourceCatalog(None)
+        self._schema_frames = {}
+        self.extract_archives = extract_archives
+        # Yarr! Parser engine of inferred parsing profiles ("auto" prefers pyarrow)
+        self.csv_engine = resolve_engine(csv_engine)
+        self.streaming_threshold_bytes = streaming_threshold_bytes
+        self.stream_chunk_rows = stream_chunk_rows
+        # Yarr! More than one worker counts partitions of a source in processes
+        self.parallel_workers = parallel_workers
+        self.parallel_min_partition_bytes = partitions.MIN_PARTITION_BYTES
+        self._process_pool = None
+        self._pool_lock = threading.Lock()
+        # Yarr! Counts of growing files get the appended tail merged in
+        self.incremental_appends = incremental_appends
+        self._append_tracker = AppendTracker()
+        self._data_sources = {}
+        self._initialized = False
+        self._initializing = False
+        self._init_lock = threading.RLock()
+        self.warmup_status = {
+            "state": "idle",
+            "completed": 0,
+            "total": 0,
+            "error": None,
+        }
+        self._frame_cache = FrameCache(cache_max_bytes)
+        # Yarr! Dictionary-encode and downcast loaded frames to save memory
+        self.compact_frames = compact_frames
+        self._header_cache = {}
+        self.columnar_cache = columnar_cache
+        self._columnar_state = {}
+        # Yarr! Tokenized columns shared between worker processes via mmap
+        self.mapped_token_store = mapped_token_store
+        self._token_store_failures = {}
+        self._categorical_encodings = {}
+        self._technology_indexes = {}
+        self._co_occurrences = {}
+        # Yarr! Row samples behind approximate analyses, per file version
+        self.approx_sample_rows = approx_sample_rows
+        self._token_samples = {}
+        # Yarr! Builds of copies, indexes and samples lock per source (and column),
+        # so a cold source never holds up the others
+        self._build_locks = {}
+        self._build_locks_guard = threading.Lock()
+
+    def _build_lock(self, *key) -> threading.Lock:
+        """The lock serializing one build - e.g. ("columnar", source name)"""
+        with self._build_locks_guard:
+            return self._build_locks.setdefault(key, threading.Lock())
+
+    @property
+    def data_sources(self) -> Dict[str, DataSource]:
+        """Registered data sources - discovering them on first access"""
+        self.initialize()
+        return self._data_sources
+
+    @property
+    def is_initialized(self) -> bool:
+        """Whether zip extraction and source discovery have run"""
+        return self._initialized
+
+    def initialize(self):
+        """
+        Yarr! Extract archives and discover data sources, once
+        Deferred until first use (or a startup warm-up) so creating the
+        DataManager - and importing the app - costs nothing.
+        """
+        if self._initialized:
+            return
+        with self._init_lock:
+            # Registering discovered sources re-enters here through data_sources
+            if self._initialized or self._initializing:
+                return
+            self._initializing = True
+            try:
+                if self.persistent_catalog:
+                    self._catalog = SourceCatalog(
+                        self.base_data_path / CATALOG_FILE_NAME
+                    )
+                self._ensure_data_extracted()
+                self._setup_data_sources()
+                self._initialized = True
+            finally:
+                self._initializing = False
+
+    def warm_up(self):
+        """
+        Yarr! Initialize, then pre-build columnar copies and technology indexes
+        for every primary column so the first real requests find a stocked hold.
+        Progress is reported through ``warmup_status``.
+        """
+        self.warmup_status.update(state="running", completed=0, total=0, error=None)
+        try:
+            self.initialize()
+            # Streaming sources be too big to hold an index - nothing to pre-build
+            tasks = [
+                (name, column)
+                for name, source in self.data_sources.items()
+                if not self.is_streaming(name)
+                for column in source.primary_columns
+            ]
+            self.warmup_status["total"] = len(tasks)
+
+            for name, column in tasks:
+                try:
+                    self.get_technology_index(name, column)
+                except Exception as e:
+                    print(f"⚠️ Warning: Could not warm up {name}/{column}: {str(e)}")
+                self.warmup_status["completed"] += 1
+
+            self.warmup_status["state"] = "done"
+            print(f"🏴‍☠️ Warm-up complete: {len(tasks)} technology columns ready")
+        except Exception as e:
+            self.warmup_status.update(state="failed", error=str(e))
+            print(f"⚠️ Warning: Warm-up failed: {str(e)}")
 
     def _ensure_data_extracted(self):
         """
-        Yarr! Automatically extract any zip files found in the data directory
+        Yarr! Extract any zip files found in the data directory
+        Only when ``extract_archives`` is on - otherwise archives are read in place.
         This be our treasure extraction process for compressed data sources!
         """
-        if not self.base_data_path.exists():
+        if not self.extract_archives or not self.base_data_path.exists():
             return
 
         # Find all zip files in the data directory
@@ -84,49 +253,100 @@ class DataManager:
                     print(f"⚠️ Warning: Failed to extract {zip_file.name}: {str(e)}")
                     continue
 
+    @staticmethod
+    def _pick_source_files(csv_files):
+        """
+        Pick the main data file and schema file among ``(path, size)`` candidates
+        Yarr! Prefers "results"/"survey" files for main data, else the largest CSV.
+        """
+        main_data_file = None
+        main_data_size = -1
+        schema_file = None
+
+        for csv_file, size in csv_files:
+            file_name = Path(csv_file).name.lower()
+            if "schema" in file_name:
+                schema_file = csv_file
+            elif "results" in file_name or "survey" in file_name:
+                # Yarr! Prefer non-schema files for main data
+                if main_data_file is None or size > main_data_size:
+                    main_data_file, main_data_size = csv_file, size
+
+        # If no obvious main file, use the largest CSV
+        if not main_data_file and csv_files:
+            main_data_file = max(csv_files, key=lambda f: f[1])[0]
+
+        return main_data_file, schema_file
+
     def _discover_data_sources(self):
         """
         Yarr! Automatically discover data sources from extracted directories
+        and from zip archives, which are read in place when not extracted.
         This makes adding new data sources as easy as dropping a zip file!
         """
         discovered_sources = {}
 
-        # Look for extracted directories
+        if not self.base_data_path.exists():
+            return discovered_sources
+
+        # Look for extracted directories - a directory's mtime changes whenever
+        # files get added, removed or renamed, so an unchanged one keeps its
+        # catalogued listing and its CSVs needn't be globbed and stat()ed again
         for item in self.base_data_path.iterdir():
             if item.is_dir() and not item.name.startswith("."):
-                # Look for CSV files in the directory
-                csv_files = list(item.glob("*.csv"))
-
-                if csv_files:
-                    # Check for common survey data patterns
-                    main_data_file = None
-                    schema_file = None
-
-                    for csv_file in csv_files:
-                        if "schema" in csv_file.name.lower():
-                            schema_file = csv_file
-                        elif (
-                            "results" in csv_file.name.lower()
-                            or "survey" in csv_file.name.lower()
-                        ):
-                            # Yarr! Prefer non-schema files for main data
-                            if (
-                                main_data_file is None
-                                or csv_file.stat().st_size
-                                > main_data_file.stat().st_size
-                            ):
-                                main_data_file = csv_file
+                listing_fingerprint = item.stat().st_mtime_ns
+                listing = self._catalog.listing(item.name, listing_fingerprint)
+                if listing is None:
+                    # Look for CSV files in the directory
+                    csv_files = [(f, f.stat().st_size) for f in item.glob("*.csv")]
+                    main_data_file, schema_file = self._pick_source_files(csv_files)
+                    listing = {
+                        "data_file": main_data_file and main_data_file.name,
+                        "schema_file": schema_file and schema_file.name,
+                        "all_files": [f.name for f, _ in csv_files],
+                    }
+                    self._catalog.put_listing(item.name, listing_fingerprint, listing)
 
-                    # If no obvious main file, use the largest CSV
-                    if not main_data_file and csv_files:
-                        main_data_file = max(csv_files, key=lambda f: f.stat().st_size)
+                if listing["all_files"]:
+                    discovered_sources[item.name] = {
+                        "data_file": item / listing["data_file"],
+                        "schema_file": (
+                            item / listing["schema_file"]
+                            if listing["schema_file"]
+                            else None
+                        ),
+                        "all_files": [item / name for name in listing["all_files"]],
+                        "archive": None,
+                    }
+
+        # Zip archives without an extracted directory - list their members from
+        # the central directory and read them straight out of the archive
+        for zip_file in sorted(self.base_data_path.glob("*.zip")):
+            if zip_file.stem in discovered_sources:
+                continue
+            listing_fingerprint = file_fingerprint(zip_file)
+            listing = self._catalog.listing(zip_file.name, listing_fingerprint)
+            if listing is None:
+                try:
+                    csv_members = source_io.list_archive_csvs(zip_file)
+                except Exception as e:
+                    print(
+                        f"⚠️ Warning: Could not read archive {zip_file.name}: {str(e)}"
+                    )
+                    continue
+                main_data_file, schema_file = self._pick_source_files(csv_members)
+                listing = {
+                    "data_file": main_data_file,
+                    "schema_file": schema_file,
+                    "all_files": [member for member, _ in csv_members],
+                }
+                self._catalog.put_listing(zip_file.name, listing_fingerprint, listing)
 
-                    if main_data_file:
-                        discovered_sources[item.name] = {
-                            "data_file": main_data_file,
-                            "schema_file": schema_file,
-                            "all_files": csv_files,
-                        }
+            if listing["all_files"]:
+                discovered_sources[zip_file.stem] = {
+                    **listing,
+                    "archive": zip_file,
+                }
 
         return discovered_sources
 
@@ -148,6 +368,9 @@ class DataManager:
                     schema_file=(
                         str(so_2023["schema_file"]) if so_2023["schema_file"] else None
                     ),
+                    archive_path=(
+                        str(so_2023["archive"]) if so_2023["archive"] else None
+                    ),
                     primary_columns=[
                         "LanguageHaveWorkedWith",
                         "LanguageWantToWorkWith",
@@ -173,46 +396,56 @@ class DataManager:
         # Auto-configure other discovered data sources with generic settings
         for dir_name, files_info in discovered.items():
             if dir_name not in ["kaggle_so_2023_data"]:  # Skip already configured ones
-                # Try to detect common column patterns by loading a sample
+                # Try to detect common column patterns from the header row alone
                 try:
-                    sample_df = pd.read_csv(files_info["data_file"], nrows=1)
-                    columns = list(sample_df.columns)
-
-                    # Look for technology-related columns (semicolon-separated patterns)
-                    tech_columns = []
-                    for col in columns:
-                        col_lower = col.lower()
-                        if any(
-                            tech_word in col_lower
-                            for tech_word in [
-                                "language",
-                                "database",
-                                "platform",
-                                "framework",
-                                "tool",
-                                "tech",
-                            ]
-                        ):
-                            tech_columns.append(col)
-
-                    # Register the discovered data source
                     source_name = dir_name.lower().replace("-", "_").replace(" ", "_")
-                    self.register_data_source(
-                        DataSource(
-                            name=source_name,
-                            description=f"Auto-discovered data source: {dir_name}",
-                            file_path=str(files_info["data_file"]),
-                            schema_file=(
-                                str(files_info["schema_file"])
-                                if files_info["schema_file"]
-                                else None
-                            ),
-                            primary_columns=tech_columns[
-                                :8
-                            ],  # Limit to first 8 technology columns
-                            categorical_columns=[],  # Would need more analysis to determine
-                        )
+                    data_source = DataSource(
+                        name=source_name,
+                        description=f"Auto-discovered data source: {dir_name}",
+                        file_path=str(files_info["data_file"]),
+                        schema_file=(
+                            str(files_info["schema_file"])
+                            if files_info["schema_file"]
+                            else None
+                        ),
+                        archive_path=(
+                            str(files_info["archive"])
+                            if files_info["archive"]
+                            else None
+                        ),
+                        categorical_columns=[],  # Would need more analysis to determine
                     )
+                    fingerprint = source_io.source_fingerprint(data_source)
+                    catalog_key = self._catalog_key(data_source, data_source.file_path)
+                    tech_columns = self._catalog.file_info(
+                        catalog_key, fingerprint
+                    ).get("technology_columns")
+
+                    if tech_columns is None:
+                        # Look for technology-related columns (semicolon-separated patterns)
+                        tech_columns = []
+                        for col in self._source_columns(data_source):
+                            col_lower = col.lower()
+                            if any(
+                                tech_word in col_lower
+                                for tech_word in [
+                                    "language",
+                                    "database",
+                                    "platform",
+                                    "framework",
+                                    "tool",
+                                    "tech",
+                                ]
+                            ):
+                                tech_columns.append(col)
+                        self._catalog.update_file(
+                            catalog_key, fingerprint, technology_columns=tech_columns
+                        )
+
+                    # Register the discovered data source
+                    # Limit to first 8 technology columns
+                    data_source.primary_columns = tech_columns[:8]
+                    self.register_data_source(data_source)
 
                     print(f"🏴‍☠️ Auto-registered data source: {source_name}")
                     if tech_columns:
@@ -224,6 +457,166 @@ class DataManager:
                     print(f"⚠️ Could not auto-configure {dir_name}: {str(e)}")
                     continue
 
+        # Yarr! Pin down how to parse each data file, once per file version
+        for source in self._data_sources.values():
+            try:
+                self._apply_parsing_profile(source)
+            except Exception as e:
+                print(f"⚠️ Could not infer a parsing profile for {source.name}: {e}")
+
+        # Yarr! Forget whatever left the harbour and chart the rest for next boot
+        self._catalog.retain(
+            [
+                info["archive"].name if info["archive"] else name
+                for name, info in discovered.items()
+            ],
+            [
+                self._catalog_key(source, path)
+                for source in self._data_sources.values()
+                for path in (source.file_path, source.schema_file)
+                if path is not None
+            ],
+        )
+        self._catalog.save()
+
+    def _catalog_key(self, source: DataSource, path: str) -> str:
+        """Catalog key of a source file - relative to the data directory"""
+        location = source.archive_path or path
+        key = os.path.relpath(location, self.base_data_path)
+        return f"{key}!{path}" if source.archive_path else key
+
+    def _source_columns(self, source: DataSource) -> List[str]:
+        """
+        Column names of a source's data file - from the catalog while the
+        file is unchanged, else from its header row (and then catalogued)
+        """
+        fingerprint = source_io.source_fingerprint(source)
+        key = self._catalog_key(source, source.file_path)
+        columns = self._catalog.file_info(key, fingerprint).get("columns")
+        if columns is None:
+            columns = list(
+                source_io.read_csv(source, source.file_path, nrows=0).columns
+            )
+            self._catalog.update_file(key, fingerprint, columns=columns)
+            if self._initialized:
+                self._catalog.save()
+        return columns
+
+    def _apply_parsing_profile(self, source: DataSource):
+        """
+        Give a discovered source its parsing profile - from the catalog while
+        the data file is unchanged, else inferred from its first rows
+        """
+        if source.parsing_profile is not None or not source_io.file_exists(
+            source, source.file_path
+        ):
+            return
+        fingerprint = source_io.source_fingerprint(source)
+        key = self._catalog_key(source, source.file_path)
+        stored = self._catalog.file_info(key, fingerprint).get("parsing_profile")
+        if stored is not None:
+            profile = ParsingProfile.from_dict(stored)
+        else:
+            sample = source_io.read_csv(source, source.file_path, nrows=INFER_ROWS)
+            profile = infer_parsing_profile(sample, source.categorical_columns)
+            self._catalog.update_file(
+                key, fingerprint, parsing_profile=profile.to_dict()
+            )
+        # The engine is ours to pick - only the types belong to the file
+        profile.engine = self.csv_engine
+        source.parsing_profile = profile
+
+    def _read_source_csv(
+        self, source: DataSource, columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Parse (the ``columns`` of) a source's whole data file per its parsing
+        profile. Should the data no longer fit the profile's types, it's parsed
+        with pandas' inference instead and the profile corrected from that.
+        """
+        profile = source.parsing_profile
+        if profile is None:
+            return source_io.read_csv(source, source.file_path, usecols=columns)
+        try:
+            return source_io.read_csv(
+                source,
+                source.file_path,
+                usecols=columns,
+                **profile.read_kwargs(columns),
+            )
+        except (ValueError, TypeError) as e:
+            print(
+                f"⚠️ Warning: {source.name} no longer fits its parsing profile ({e}) - re-inferring types"
+            )
+
+        df = source_io.read_csv(source, source.file_path, usecols=columns)
+        corrected = infer_parsing_profile(df, source.categorical_columns)
+        dtypes = {
+            name: dtype
+            for name, dtype in profile.dtypes.items()
+            if name not in df.columns
+        }
+        dtypes.update(corrected.dtypes)
+        source.parsing_profile = ParsingProfile(
+            dtypes=dtypes,
+            na_values=profile.na_values,
+            # Yarr! Same types yet it failed - then the engine was the trouble
+            engine=profile.engine if dtypes != profile.dtypes else "c",
+        )
+        self._save_parsing_profile(source)
+        # Yarr! Same dtypes as the next (profiled) read will give
+        return df.astype(corrected.dtypes)
+
+    def _save_parsing_profile(self, source: DataSource):
+        """Keep a source's (corrected) parsing profile in the catalog"""
+        self._catalog.update_file(
+            self._catalog_key(source, source.file_path),
+            source_io.source_fingerprint(source),
+            parsing_profile=source.parsing_profile.to_dict(),
+        )
+        self._catalog.save()
+
+    def _relax_parsing_profile(self, source: DataSource, error: Exception) -> bool:
+        """
+        Drop the types a chunked read found the data no longer fits - only
+        categoricals and NA values stay. False when there were none to drop.
+        """
+        profile = source.parsing_profile
+        if profile is None or profile.relaxed().dtypes == profile.dtypes:
+            return False
+        print(
+            f"⚠️ Warning: {source.name} no longer fits its parsing profile ({error}) - relaxing its types"
+        )
+        source.parsing_profile = profile.relaxed()
+        self._save_parsing_profile(source)
+        return True
+
+    def _profiled(self, source: DataSource, read: Callable[[], Any]) -> Any:
+        """
+        Run a chunked ``read`` of a source - once more with a relaxed parsing
+        profile if the data no longer fits its types
+        """
+        try:
+            return read()
+        except (ValueError, TypeError) as e:
+            if not self._relax_parsing_profile(source, e):
+                raise
+        return read()
+
+    def _iter_source_chunks(
+        self, source: DataSource, columns: List
+    ) -> Iterator[pd.DataFrame]:
+        """
+        The ``columns`` of a source's data file in chunks of
+        ``stream_chunk_rows`` rows, parsed per its parsing profile (with the C
+        engine - pyarrow can't read in chunks)
+        """
+        profile = source.parsing_profile
+        kwargs = {} if profile is None else profile.read_kwargs(columns, partial=True)
+        return source_io.iter_csv_chunks(
+            source, source.file_path, self.stream_chunk_rows, usecols=columns, **kwargs
+        )
+
     def register_data_source(self, data_source: DataSource):
         """Register a new data source for analysis"""
         self.data_sources[data_source.name] = data_source
@@ -232,30 +625,104 @@ class DataManager:
         """Get all available data sources and their descriptions"""
         return {name: source.description for name, source in self.data_sources.items()}
 
-    def load_data(self, source_name: str) -> pd.DataFrame:
-        """
-        Load data from a specified source with proper error handling
-        """
+    def _get_existing_source(self, source_name: str) -> DataSource:
+        """Look up a registered data source whose data file be present on disk"""
         if source_name not in self.data_sources:
             raise ValueError(f"Arrr! Unknown data source: {source_name}")
 
         source = self.data_sources[source_name]
 
-        if not os.path.exists(source.file_path):
+        if not source_io.file_exists(source, source.file_path):
             raise FileNotFoundError(
                 f"Shiver me timbers! Data file not found: {source.file_path}"
             )
+        return source
+
+    def get_columns(self, source_name: str) -> List[str]:
+        """
+        Get the column names of a data source by reading only its header row
+        Headers are cached per file fingerprint (and kept in the catalog across
+        restarts), so repeated calls be nearly free.
+        """
+        source = self._get_existing_source(source_name)
+        fingerprint = source_io.source_fingerprint(source)
+
+        cached = self._header_cache.get(source_name)
+        if cached is not None and cached[0] == fingerprint:
+            return list(cached[1])
+
+        columns = self._source_columns(source)
+        self._header_cache[source_name] = (fingerprint, columns)
+        return list(columns)
+
+    def load_data(
+        self, source_name: str, columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Load data from a specified source with proper error handling
+        Pass ``columns`` to parse only those columns (the schema is skipped then).
+        Frames are cached by source, file fingerprint and projected columns, so
+        repeated calls are cheap and a replaced data file is picked up on the next call.
+        The returned frame may be shared between callers - treat it as read-only!
+        """
+        source = self._get_existing_source(source_name)
+
+        if columns is not None:
+            columns = list(dict.fromkeys(columns))
+            available_columns = self.get_columns(source_name)
+            missing = [col for col in columns if col not in available_columns]
+            if missing:
+                raise ValueError(
+                    f"Arrr! Columns not found in data source '{source_name}': {missing}"
+                )
+
+        has_schema = source_io.file_exists(source, source.schema_file)
+        fingerprints = (
+            source_io.source_fingerprint(source),
+            (
+                source_io.source_fingerprint(source, source.schema_file)
+                if has_schema
+                else None
+            ),
+        )
+        cache_key = (
+            source_name,
+            fingerprints,
+            tuple(columns) if columns is not None else None,
+        )
+        cached = self._frame_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Any other entries for this source were loaded from an older version
+        self._frame_cache.invalidate(
+            lambda key: key[0] == source_name and key[1] != fingerprints
+        )
 
         try:
-            # Load the main data
-            df = pd.read_csv(source.file_path)
+            with metrics.stage("load"):
+                # Load the main data, parsing only the projected columns if given
+                columnar_copy = self._get_columnar_copy(source)
+                with metrics.stage("parse"):
+                    if columnar_copy is not None:
+                        df = columnar.read_columnar(columnar_copy, columns)
+                    else:
+                        df = self._read_source_csv(source, columns)
+                self._record_read(source, columnar_copy, len(df), list(df.columns))
 
-            # Load schema information if available
-            if source.schema_file and os.path.exists(source.schema_file):
-                schema_df = pd.read_csv(source.schema_file)
-                # Store schema info as metadata (could be used for validation)
-                df.attrs["schema"] = schema_df
+                if self.compact_frames:
+                    df = compact_frame(
+                        df, source.categorical_columns, source.primary_columns
+                    )
 
+                if columns is not None:
+                    # Yarr! usecols keeps file order - hand back the order asked for
+                    df = df[columns]
+                elif has_schema:
+                    # Store schema info as metadata (could be used for validation)
+                    df.attrs["schema"] = self.get_schema_info(source_name)
+
+            self._frame_cache.put(cache_key, df)
             return df
 
         except Exception as e:
@@ -263,15 +730,669 @@ class DataManager:
                 f"Blimey! Error loading data from {source.file_path}: {str(e)}"
             )
 
+    def _record_read(
+        self,
+        source: DataSource,
+        columnar_copy: Optional[Path],
+        rows: Optional[int],
+        columns: List[str],
+        mode: str = "memory",
+    ):
+        """
+        Count rows (when known) and bytes read from a source's CSV or its
+        columnar copy - ``columns`` picks the Parquet columns that were read
+        """
+        if not metrics.enabled:
+            return
+        if columnar_copy is not None:
+            file_format = "parquet"
+            nbytes = columnar.stored_bytes(columnar_copy, columns)
+        else:
+            # Yarr! A CSV gets scanned end to end, however few columns we keep
+            file_format = "csv"
+            nbytes = source_io.file_size(source, source.file_path)
+        labels = {"source": source.name, "format": file_format, "mode": mode}
+        if rows is not None:
+            metrics.increment(
+                "rows_processed_total", rows, help="Data rows parsed", **labels
+            )
+        metrics.increment(
+            "bytes_read_total", nbytes, help="Data file bytes read", **labels
+        )
+
+    def _get_columnar_copy(self, source: DataSource) -> Optional[Path]:
+        """
+        Yarr! Get the up-to-date columnar copy of a source, writing it on first use
+        Returns None when the columnar cache is disabled or the copy can't be
+        written (e.g. a read-only data directory) - callers then read the CSV.
+        """
+        if not self.columnar_cache or self.is_streaming(source.name):
+            return None
+
+        fingerprint = source_io.source_fingerprint(source)
+        with self._build_lock("columnar", source.name):
+            state = self._columnar_state.get(source.name)
+            if state is not None and state[0] == fingerprint:
+                return state[1]
+
+            path = source_io.columnar_copy_path(source)
+            if not columnar.is_columnar_current(path, fingerprint):
+                try:
+                    print(f"🏴‍☠️ Writing columnar copy of {source.name}...")
+                    with metrics.stage("parse"):
+                        df = self._read_source_csv(source)
+                    self._record_read(source, None, len(df), list(df.columns))
+                    # Yarr! The whole file be in hand - catalog its statistics too
+                    self._record_stats(source, fingerprint, df)
+                    with metrics.stage("columnar_write"):
+                        columnar.build_columnar_copy(
+                            df, path, fingerprint, source.primary_columns
+                        )
+                except Exception as e:
+                    print(f"⚠️ Warning: Columnar copy of {source.name} failed: {e}")
+                    path = None
+
+            # Remember failures too, so we only retry once the file changes
+            self._columnar_state[source.name] = (fingerprint, path)
+            return path
+
+    def _load_token_columns(
+        self, source_name: str, columns: List[str]
+    ) -> Dict[str, TokenColumn]:
+        """
+        Get multi-value columns tokenized - mapped read-only from the token
+        store when it holds them, else read (see ``_read_token_columns``) and
+        then stored, so other worker processes can map them too
+        """
+        source = self.data_sources[source_name]
+        fingerprint = source_io.source_fingerprint(source)
+        store = self._get_token_store(source, fingerprint)
+
+        token_columns = {}
+        if store is not None:
+            for column in columns:
+                mapped = token_store.read_token_column(store, column, fingerprint)
+                if mapped is not None:
+                    token_columns[column] = mapped
+
+        missing = [column for column in columns if column not in token_columns]
+        if missing:
+            loaded = self._read_token_columns(source_name, missing)
+            if store is not None:
+                loaded = self._store_token_columns(source, fingerprint, loaded)
+            token_columns.update(loaded)
+        return {column: token_columns[column] for column in columns}
+
+    def _get_token_store(
+        self, source: DataSource, fingerprint: Tuple[int, int]
+    ) -> Optional[Path]:
+        """
+        The token store directory of a source - None when the store is off,
+        or when writing it failed for this file version (e.g. read-only disk)
+        """
+        if not self.mapped_token_store:
+            return None
+        if self._token_store_failures.get(source.name) == fingerprint:
+            return None
+        return source_io.token_store_path(source)
+
+    def _store_token_columns(
+        self,
+        source: DataSource,
+        fingerprint: Tuple[int, int],
+        token_columns: Dict[str, TokenColumn],
+    ) -> Dict[str, TokenColumn]:
+        """
+        Write freshly tokenized columns to the token store and hand back their
+        mapped versions - the in-process copies can then be freed. One writer
+        per column at a time; a column another thread just stored is mapped,
+        not written again.
+        """
+        store = source_io.token_store_path(source)
+        mapped = {}
+        try:
+            for column, tokens in token_columns.items():
+                with self._build_lock("token_store", source.name, column):
+                    mapped[column] = token_store.read_token_column(
+                        store, column, fingerprint
+                    )
+                    if mapped[column] is None:
+                        token_store.write_token_column(
+                            store, column, fingerprint, tokens
+                        )
+                        mapped[column] = token_store.read_token_column(
+                            store, column, fingerprint
+                        )
+        except OSError as e:
+            print(f"⚠️ Warning: Token store of {source.name} failed: {e}")
+            self._token_store_failures[source.name] = fingerprint
+            return token_columns
+        return {
+            column: mapped[column] if mapped[column] is not None else tokens
+            for column, tokens in token_columns.items()
+        }
+
+    def _read_token_columns(
+        self, source_name: str, columns: List[str]
+    ) -> Dict[str, TokenColumn]:
+        """
+        Get multi-value columns tokenized - straight from the pre-tokenized
+        columnar copy when there is one, otherwise by tokenizing the loaded
+        columns. Either way the source is read only once for all of them.
+        """
+        token_columns = {}
+        source = self.data_sources[source_name]
+        columnar_copy = self._get_columnar_copy(source)
+        if columnar_copy is not None:
+            with metrics.stage("load"), metrics.stage("parse"):
+                token_columns = columnar.read_token_columns(columnar_copy, columns)
+            if token_columns:
+                self._record_read(
+                    source,
+                    columnar_copy,
+                    next(iter(token_columns.values())).n_rows,
+                    [columnar.TOKEN_COLUMN_PREFIX + c for c in token_columns],
+                )
+
+        remaining = [column for column in columns if column not in token_columns]
+        if remaining:
+            df = self.load_data(source_name, columns=remaining)
+            with metrics.stage("tokenize"):
+                for column in remaining:
+                    token_columns[column] = tokenize_series(df[column])
+        return token_columns
+
+    def _load_token_column(self, source_name: str, column: str) -> TokenColumn:
+        """Get one multi-value column tokenized (see ``_load_token_columns``)"""
+        return self._load_token_columns(source_name, [column])[column]
+
+    def is_streaming(self, source_name: str) -> bool:
+        """
+        Whether analyses of a source stream the file in chunks instead of
+        loading whole columns - per the source's ``load_mode``, or its file size
+        against ``streaming_threshold_bytes`` in "auto" mode
+        """
+        source = self.data_sources[source_name]
+        if source.load_mode != "auto":
+            return source.load_mode == "streaming"
+        if self.streaming_threshold_bytes is None:
+            return False
+        if not source_io.file_exists(source, source.file_path):
+            return False
+        size = source_io.file_size(source, source.file_path)
+        return size > self.streaming_threshold_bytes
+
+    def _check_count_columns(
+        self,
+        source_name: str,
+        technology_columns: List[str],
+        filters: Dict[str, List[str]],
+    ) -> List[str]:
+        """
+        Validate a count over raw file data and return the columns it reads
+        Filters must be on categorical columns, as with the technology index.
+        """
+        source = self._get_existing_source(source_name)
+        for column in filters:
+            if column not in source.categorical_columns:
+                raise ValueError(
+                    f"Arrr! Cannot filter on '{column}'. Filterable columns: {sorted(source.categorical_columns)}"
+                )
+
+        columns = list(dict.fromkeys(list(technology_columns) + list(filters)))
+        missing = [col for col in columns if col not in self.get_columns(source_name)]
+        if missing:
+            raise ValueError(
+                f"Arrr! Columns not found in data source '{source_name}': {missing}"
+            )
+        return columns
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """The worker processes for parallel counting, started on first use"""
+        with self._pool_lock:
+            if self._process_pool is None:
+                # Spawned, not forked - forking a threaded server be asking for deadlocks
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.parallel_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._process_pool
+
+    def shutdown(self):
+        """Stop the parallel counting workers, if any were started"""
+        with self._pool_lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=True)
+                self._process_pool = None
+
+    def _parallel_token_counts(
+        self,
+        source_name: str,
+        technology_column: str,
+        filters: Optional[Dict[str, List[str]]] = None,
+    ) -> Optional[TokenCounts]:
+        """
+        Yarr! Count a multi-value column on every core
+        Partitions are runs of row groups when an up-to-date columnar copy
+        exists, else line-aligned byte ranges of the CSV. Returns None - use the
+        serial path - when parallelism is off or the source is too small (or a
+        compressed archive member, which can't be split) to be worth it.
+        """
+        if self.parallel_workers <= 1:
+            return None
+
+        source = self._get_existing_source(source_name)
+        filters = filters or {}
+        self._check_count_columns(source_name, [technology_column], filters)
+        task = partitions.CountTask.create(technology_column, filters)
+        fingerprint = source_io.source_fingerprint(source)
+        copy_path = source_io.columnar_copy_path(source)
+
+        try:
+            if (
+                self.columnar_cache
+                and columnar.is_columnar_current(copy_path, fingerprint)
+                and columnar.has_token_column(copy_path, technology_column)
+            ):
+                runs = partitions.row_group_runs(copy_path, self.parallel_workers)
+                if len(runs) < 2:
+                    return None
+                with metrics.stage("count"):
+                    counts = partitions.count_partitions(
+                        self._get_process_pool(),
+                        partitions.count_row_groups,
+                        [(str(copy_path), run) for run in runs],
+                        task,
+                    )
+                self._record_read(
+                    source,
+                    copy_path,
+                    columnar.row_count(copy_path) if metrics.enabled else None,
+                    [columnar.TOKEN_COLUMN_PREFIX + technology_column, *filters],
+                    mode="parallel",
+                )
+                return counts
+
+            if source.archive_path is not None:
+                return None
+            n_partitions = partitions.partition_count(
+                os.path.getsize(source.file_path),
+                self.parallel_workers,
+                self.parallel_min_partition_bytes,
+            )
+            if n_partitions < 2:
+                return None
+            header = partitions.read_header(source.file_path)
+            if not header:
+                return None
+            ranges = partitions.csv_byte_ranges(
+                source.file_path, n_partitions, len(header)
+            )
+            if len(ranges) < 2:
+                return None
+            with metrics.stage("count"):
+                counts = partitions.count_partitions(
+                    self._get_process_pool(),
+                    partitions.count_csv_range,
+                    [(source.file_path, start, end) for start, end in ranges],
+                    header,
+                    task,
+                    source.parsing_profile,
+                )
+            # Rows get parsed in the workers - only the bytes are known here
+            self._record_read(source, None, None, [], mode="parallel")
+            return counts
+        except Exception as e:
+            raise RuntimeError(
+                f"Blimey! Error counting {source.file_path} in parallel: {str(e)}"
+            )
+
+    def _stream_token_counts(
+        self,
+        source_name: str,
+        technology_columns: List[str],
+        filters: Optional[Dict[str, List[str]]] = None,
+    ) -> Dict[str, TokenCounts]:
+        """
+        Yarr! Count multi-value columns chunk by chunk in a single pass, keeping
+        only running token counts - memory stays bounded by ``stream_chunk_rows``,
+        not the file. ``filters`` work like in the technology index, per chunk.
+        """
+        source = self._get_existing_source(source_name)
+        filters = filters or {}
+        columns = self._check_count_columns(source_name, technology_columns, filters)
+
+        try:
+            return self._profiled(
+                source,
+                lambda: self._count_chunks(
+                    source, columns, technology_columns, filters
+                ),
+            )
+        except Exception as e:
+            raise RuntimeError(
+                f"Blimey! Error streaming data from {source.file_path}: {str(e)}"
+            )
+
+    def _count_chunks(
+        self,
+        source: DataSource,
+        columns: List[str],
+        technology_columns: List[str],
+        filters: Dict[str, List[str]],
+    ) -> Dict[str, TokenCounts]:
+        """One streaming pass behind ``_stream_token_counts``"""
+        counts = {column: TokenCounts.merge([]) for column in technology_columns}
+        chunks = self._iter_source_chunks(source, columns)
+        rows = 0
+        while True:
+            with metrics.stage("parse"):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            rows += len(chunk)
+            with metrics.stage("count"):
+                row_mask = None
+                for column, values in filters.items():
+                    encoding = CategoricalEncoding.from_series(chunk[column])
+                    mask = encoding.mask(values)
+                    row_mask = mask if row_mask is None else row_mask & mask
+                for column in technology_columns:
+                    chunk_counts = tokenize_series(chunk[column]).counts(row_mask)
+                    # Chunks arrive in file order, so first-appearance order holds
+                    counts[column] = TokenCounts.merge([counts[column], chunk_counts])
+        self._record_read(source, None, rows, columns, mode="streaming")
+        return counts
+
+    def iter_respondents(
+        self,
+        source_name: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Dict[str, List[str]]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yarr! The rows of respondents matching ``filters``, projected to
+        ``columns`` (all of them when None), as frames of at most
+        ``stream_chunk_rows`` rows - read from the columnar copy when it's up
+        to date, else streamed from the CSV. Columns and filters are checked
+        right away, before the first row is read.
+        """
+        source = self._get_existing_source(source_name)
+        filters = filters or {}
+        columns = list(dict.fromkeys(columns or self.get_columns(source_name)))
+        read_columns = self._check_count_columns(source_name, columns, filters)
+        return self._respondent_chunks(source, columns, read_columns, filters)
+
+    def _respondent_chunks(
+        self,
+        source: DataSource,
+        columns: List[str],
+        read_columns: List[str],
+        filters: Dict[str, List[str]],
+    ) -> Iterator[pd.DataFrame]:
+        """Generator behind ``iter_respondents``"""
+        fingerprint = source_io.source_fingerprint(source)
+        copy_path = source_io.columnar_copy_path(source)
+        if (
+            self.columnar_cache
+            and not self.is_streaming(source.name)
+            and columnar.is_columnar_current(copy_path, fingerprint)
+        ):
+            chunks = columnar.iter_columnar(
+                copy_path, read_columns, self.stream_chunk_rows
+            )
+        else:
+            copy_path = None
+            chunks = self._iter_source_chunks(source, read_columns)
+
+        rows = 0
+        while True:
+            try:
+                chunk = next(chunks, None)
+            except (ValueError, TypeError) as e:
+                # Yarr! Rows already sent can't be re-parsed - relax the profile
+                # and start over if there are none, else fix it for next time
+                if not self._relax_parsing_profile(source, e) or rows:
+                    raise
+                chunks = self._iter_source_chunks(source, read_columns)
+                continue
+            if chunk is None:
+                break
+            rows += len(chunk)
+            row_mask = None
+            for column, values in filters.items():
+                mask = CategoricalEncoding.from_series(chunk[column]).mask(values)
+                row_mask = mask if row_mask is None else row_mask & mask
+            if row_mask is not None:
+                chunk = chunk[row_mask]
+            yield chunk[columns]
+        self._record_read(source, copy_path, rows, read_columns, mode="export")
+
+    def get_source_fingerprint(self, source_name: str) -> str:
+        """
+        A short token identifying the current version of a source's data file
+        Changes whenever the file is replaced or rewritten - handy for ETags!
+        """
+        source = self._get_existing_source(source_name)
+        mtime_ns, size = source_io.source_fingerprint(source)
+        return f"{mtime_ns:x}-{size:x}"
+
+    def get_schema_fingerprint(self, source_name: str) -> Optional[str]:
+        """Like ``get_source_fingerprint``, for the schema file (None without one)"""
+        if source_name not in self.data_sources:
+            return None
+        source = self.data_sources[source_name]
+        if not source_io.file_exists(source, source.schema_file):
+            return None
+        mtime_ns, size = source_io.source_fingerprint(source, source.schema_file)
+        return f"{mtime_ns:x}-{size:x}"
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction statistics for the DataFrame cache"""
+        return self._frame_cache.stats()
+
+    def get_memory_report(self) -> Dict[str, Any]:
+        """
+        Yarr! Where the memory goes - per source and per column
+        Counts cached frames (deep, per column, summed over all cached
+        projections), technology indexes, categorical encodings,
+        co-occurrence matrices and row samples currently held by this
+        DataManager.
+        ``mapped_bytes`` is the part of those backed by the token store - page
+        cache shared with every other worker process, not private memory.
+        """
+        sources = {}
+
+        def entry(source_name):
+            return sources.setdefault(
+                source_name,
+                {
+                    "frames_bytes": 0,
+                    "columns": {},
+                    "indexes_bytes": 0,
+                    "index_columns": {},
+                    "categorical_bytes": 0,
+                    "co_occurrence_bytes": 0,
+                    "samples_bytes": 0,
+                    "mapped_bytes": 0,
+                },
+            )
+
+        for key, df, _ in self._frame_cache.snapshot():
+            report = entry(key[0])
+            usage = df.memory_usage(deep=True, index=False)
+            for column, size in usage.items():
+                report["columns"][column] = report["columns"].get(column, 0) + int(size)
+            report["frames_bytes"] += int(usage.sum())
+
+        for (source_name, column), (_, index) in list(self._technology_indexes.items()):
+            report = entry(source_name)
+            report["index_columns"][column] = index.nbytes
+            report["indexes_bytes"] += index.nbytes
+            tokens = index.tokens
+            report["mapped_bytes"] += sum(
+                array.nbytes
+                for array in (tokens.codes, tokens.offsets, tokens.valid)
+                if token_store.is_mapped(array)
+            )
+
+        for source_name, (_, encodings) in list(self._categorical_encodings.items()):
+            report = entry(source_name)
+            for encoding in encodings.values():
+                report["categorical_bytes"] += encoding.nbytes
+                if token_store.is_mapped(encoding.codes):
+                    report["mapped_bytes"] += encoding.codes.nbytes
+
+        for key, (_, co_occurrence) in list(self._co_occurrences.items()):
+            entry(key[0])["co_occurrence_bytes"] += co_occurrence.nbytes
+
+        for (source_name, _), (_, sample) in list(self._token_samples.items()):
+            if sample is not None and not sample.exact:
+                # Exact "samples" share the index's or token store's arrays
+                entry(source_name)["samples_bytes"] += sample.nbytes
+
+        for report in sources.values():
+            report["total_bytes"] = (
+                report["frames_bytes"]
+                + report["indexes_bytes"]
+                + report["categorical_bytes"]
+                + report["co_occurrence_bytes"]
+                + report["samples_bytes"]
+            )
+
+        return {
+            "compact_frames": self.compact_frames,
+            "total_bytes": sum(report["total_bytes"] for report in sources.values()),
+            "sources": sources,
+        }
+
+    def get_append_stats(self) -> Dict[str, int]:
+        """Get full vs incremental recount statistics for growing data files"""
+        return self._append_tracker.stats()
+
+    def _record_stats(
+        self, source: DataSource, fingerprint: Tuple[int, int], df: pd.DataFrame
+    ):
+        """Catalog the row count and per-column distinct counts of a full frame"""
+        self._catalog.update_file(
+            self._catalog_key(source, source.file_path),
+            fingerprint,
+            row_count=len(df),
+            distinct_counts={
+                str(column): int(df[column].nunique()) for column in df.columns
+            },
+        )
+        self._catalog.save()
+
+    def get_source_stats(
+        self, source_name: str, compute: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Yarr! Row count and distinct-value counts per column of a source
+        Served from the catalog while the data file is unchanged. Otherwise
+        computed from the full frame (only the categorical columns get distinct
+        counts for streaming sources) - or, with ``compute=False``, None.
+        """
+        if source_name not in self.data_sources:
+            raise ValueError(f"Arrr! Unknown data source: {source_name}")
+        source = self.data_sources[source_name]
+        if not compute and not source_io.file_exists(source, source.file_path):
+            return None
+
+        source = self._get_existing_source(source_name)
+        fingerprint = source_io.source_fingerprint(source)
+        key = self._catalog_key(source, source.file_path)
+        info = self._catalog.file_info(key, fingerprint)
+        if "row_count" not in info:
+            if not compute:
+                return None
+            if self.is_streaming(source_name):
+                self._stream_stats(source, fingerprint)
+            else:
+                self._record_stats(source, fingerprint, self.load_data(source_name))
+            info = self._catalog.file_info(key, fingerprint)
+
+        return {
+            "row_count": info.get("row_count"),
+            "distinct_counts": info.get("distinct_counts", {}),
+        }
+
+    def _stream_stats(self, source: DataSource, fingerprint: Tuple[int, int]):
+        """Catalog the row count (and categorical distinct counts) chunk by chunk"""
+        columns = [
+            col
+            for col in source.categorical_columns
+            if col in self._source_columns(source)
+        ]
+
+        def scan():
+            rows = 0
+            distinct = {column: set() for column in columns}
+            for chunk in self._iter_source_chunks(source, columns or [0]):
+                rows += len(chunk)
+                for column in columns:
+                    distinct[column].update(chunk[column].dropna().unique())
+            return rows, distinct
+
+        try:
+            rows, distinct = self._profiled(source, scan)
+        except Exception as e:
+            raise RuntimeError(
+                f"Blimey! Error streaming data from {source.file_path}: {str(e)}"
+            )
+
+        self._catalog.update_file(
+            self._catalog_key(source, source.file_path),
+            fingerprint,
+            row_count=rows,
+            distinct_counts={
+                column: len(values) for column, values in distinct.items()
+            },
+        )
+        self._catalog.save()
+
+    def get_catalog_stats(self) -> Dict[str, Any]:
+        """Get listing hit/miss statistics and the size of the source catalog"""
+        return self._catalog.stats()
+
     def get_schema_info(self, source_name: str) -> Optional[pd.DataFrame]:
-        """Get schema information for a data source if available"""
+        """
+        Get schema information for a data source if available
+        Parsed once per schema file version and kept in memory and in the
+        catalog - the returned frame may be shared, so treat it as read-only!
+        """
         if source_name not in self.data_sources:
             return None
 
         source = self.data_sources[source_name]
-        if source.schema_file and os.path.exists(source.schema_file):
-            return pd.read_csv(source.schema_file)
-        return None
+        if not source_io.file_exists(source, source.schema_file):
+            return None
+
+        fingerprint = source_io.source_fingerprint(source, source.schema_file)
+        cached = self._schema_frames.get(source_name)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        key = self._catalog_key(source, source.schema_file)
+        table = self._catalog.file_info(key, fingerprint).get("table")
+        if table is not None:
+            schema_df = pd.DataFrame(table["data"], columns=table["columns"])
+        else:
+            schema_df = source_io.read_csv(source, source.schema_file)
+            # NaN isn't JSON - blanks go into the catalog as nulls
+            values = schema_df.astype(object).where(schema_df.notna(), None)
+            self._catalog.update_file(
+                key,
+                fingerprint,
+                table={
+                    "columns": [str(column) for column in schema_df.columns],
+                    "data": values.values.tolist(),
+                },
+            )
+            self._catalog.save()
+
+        self._schema_frames[source_name] = (fingerprint, schema_df)
+        return schema_df
 
     def analyze_technology_usage(
         self, source_name: str, technology_column: str, top_n: int = 10
@@ -280,38 +1401,355 @@ class DataManager:
         Analyze technology usage from semicolon-separated data
         This be the core analysis function that can work with different technology columns
         """
-        df = self.load_data(source_name)
+        return self.get_technology_counts(source_name, technology_column).top(top_n)
 
-        if technology_column not in df.columns:
+    def get_technology_counts(
+        self, source_name: str, technology_column: str
+    ) -> TokenCounts:
+        """
+        Yarr! Count every technology in a multi-value column of a source
+        The full counts behind ``analyze_technology_usage`` - to be treated as
+        read-only, since results may be cached and shared.
+        """
+        if technology_column not in self.get_columns(source_name):
             raise ValueError(
                 f"Column '{technology_column}' not found in dataset. Available columns with technology data: {self.data_sources[source_name].primary_columns}"
             )
 
-        # Count technologies (handling semicolon-separated values)
-        tech_counts = {}
+        source = self.data_sources[source_name]
+        if not self.incremental_appends or source.archive_path is not None:
+            return self._full_token_counts(source_name, technology_column)
+
+        # Only bytes appended since the last count get parsed, unless rewritten
+        return self._append_tracker.counts(
+            source.file_path,
+            technology_column,
+            lambda: self._full_token_counts(source_name, technology_column),
+            source.parsing_profile,
+        )
 
-        for tech_str in df[technology_column].dropna():
-            if pd.isna(tech_str) or tech_str == "":
-                continue
+    def _full_token_counts(
+        self, source_name: str, technology_column: str
+    ) -> TokenCounts:
+        """Count a multi-value column over the whole data file"""
+        counts = self._parallel_token_counts(source_name, technology_column)
+        if counts is not None:
+            return counts
 
-            # Split by semicolon and clean up each technology name
-            technologies = [
-                tech.strip() for tech in str(tech_str).split(";") if tech.strip()
-            ]
+        if self.is_streaming(source_name):
+            counts = self._stream_token_counts(source_name, [technology_column])
+            return counts[technology_column]
 
-            for tech in technologies:
-                tech_counts[tech] = tech_counts.get(tech, 0) + 1
+        # Count technologies (handling semicolon-separated values) in one vectorized
+        # pass, reading only the one column we be counting
+        token_column = self._load_token_column(source_name, technology_column)
+        with metrics.stage("count"):
+            return token_column.counts()
 
-        # Sort and get top N
-        sorted_techs = sorted(tech_counts.items(), key=lambda x: x[1], reverse=True)[
-            :top_n
+    def analyze_technology_usage_approx(
+        self, source_name: str, technology_column: str, top_n: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Yarr! Estimate the top technologies of a column from a row sample
+        Like ``analyze_technology_usage`` plus per-item ``error_bounds``, the
+        ``sample_fraction`` and the ``confidence`` of the bounds. Sources too
+        small to be worth sampling (or inside a zip) get exact counts instead,
+        with zero bounds and a sample fraction of 1.
+        """
+        sample = self.get_token_sample(source_name, technology_column)
+        if sample is not None:
+            return sample.top(top_n)
+        counts = self.get_technology_counts(source_name, technology_column)
+        return sampling.exact_top(counts, top_n)
+
+    def get_token_sample(
+        self, source_name: str, technology_column: str
+    ) -> Optional[sampling.TokenSample]:
+        """
+        The tokenized row sample of a multi-value column - drawn on first use
+        and held in memory until the data file changes. None when the source
+        can't (or needn't) be sampled.
+        """
+        source = self._get_existing_source(source_name)
+        if technology_column not in self.get_columns(source_name):
+            raise ValueError(
+                f"Column '{technology_column}' not found in dataset. Available columns with technology data: {source.primary_columns}"
+            )
+
+        fingerprint = source_io.source_fingerprint(source)
+        key = (source_name, technology_column)
+        with self._build_lock("sample", source_name, technology_column):
+            cached = self._token_samples.get(key)
+            if cached is not None and cached[0] == fingerprint:
+                return cached[1]
+
+            try:
+                with metrics.stage("sample"):
+                    sample = self._draw_token_sample(
+                        source, technology_column, fingerprint
+                    )
+            except Exception as e:
+                raise RuntimeError(
+                    f"Blimey! Error sampling {source.file_path}: {str(e)}"
+                )
+            if sample is not None:
+                metrics.increment(
+                    "rows_processed_total",
+                    sample.tokens.n_rows,
+                    help="Data rows parsed",
+                    source=source_name,
+                    format="sample",
+                    mode="approx",
+                )
+            self._token_samples[key] = (fingerprint, sample)
+            return sample
+
+    def _draw_token_sample(
+        self, source: DataSource, technology_column: str, fingerprint: Tuple[int, int]
+    ) -> Optional[sampling.TokenSample]:
+        """
+        Sample from the cheapest place available: an index or token store
+        already holding every row, the columnar copy's row groups, or byte
+        blocks of the CSV
+        """
+        cached = self._technology_indexes.get((source.name, technology_column))
+        tokens = cached[1].tokens if cached and cached[0] == fingerprint else None
+        store = self._get_token_store(source, fingerprint)
+        if tokens is None and store is not None:
+            tokens = token_store.read_token_column(
+                store, technology_column, fingerprint
+            )
+        if tokens is not None:
+            return sampling.TokenSample(tokens, tokens.n_rows, exact=True)
+
+        copy_path = source_io.columnar_copy_path(source)
+        if (
+            self.columnar_cache
+            and columnar.is_columnar_current(copy_path, fingerprint)
+            and columnar.has_token_column(copy_path, technology_column)
+        ):
+            return sampling.sample_row_groups(
+                copy_path, technology_column, self.approx_sample_rows
+            )
+
+        # Compressed archive members can't be seeked into
+        if source.archive_path is not None:
+            return None
+        info = self._catalog.file_info(
+            self._catalog_key(source, source.file_path), fingerprint
+        )
+        return sampling.sample_csv(
+            source.file_path,
+            technology_column,
+            self.approx_sample_rows,
+            population_rows=info.get("row_count"),
+            profile=source.parsing_profile,
+        )
+
+    def analyze_technology_usage_batch(
+        self, source_name: str, requests: List[Tuple[str, int]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Yarr! Analyze many technology columns with one load and one scan
+        ``requests`` holds ``(column, top_n)`` pairs; each result carries either
+        the analysis (in the ``analyze_technology_usage`` format) or an error for
+        that column, so one bad column doesn't sink the whole batch.
+        """
+        available_columns = self.get_columns(source_name)
+        columns = list(
+            dict.fromkeys(
+                column for column, _ in requests if column in available_columns
+            )
+        )
+
+        if not columns:
+            counts = {}
+        elif self.is_streaming(source_name):
+            counts = self._stream_token_counts(source_name, columns)
+        else:
+            token_columns = self._load_token_columns(source_name, columns)
+            with metrics.stage("count"):
+                counts = {column: token_columns[column].counts() for column in columns}
+
+        results = []
+        for column, top_n in requests:
+            if column in counts:
+                results.append(
+                    {
+                        "column": column,
+                        "top_n": top_n,
+                        "result": counts[column].top(top_n),
+                    }
+                )
+            else:
+                results.append(
+                    {
+                        "column": column,
+                        "top_n": top_n,
+                        "error": f"Column '{column}' not found in dataset. Available columns with technology data: {self.data_sources[source_name].primary_columns}",
+                    }
+                )
+        return results
+
+    def _get_categorical_encodings(
+        self, source_name: str
+    ) -> Dict[str, CategoricalEncoding]:
+        """Dictionary-encoded categorical columns of a source, built once per file version"""
+        source = self._get_existing_source(source_name)
+        fingerprint = source_io.source_fingerprint(source)
+
+        cached = self._categorical_encodings.get(source_name)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        available_columns = self.get_columns(source_name)
+        columns = [
+            col for col in source.categorical_columns if col in available_columns
         ]
+        store = self._get_token_store(source, fingerprint)
+        encodings = {}
+        if store is not None:
+            for column in columns:
+                mapped = token_store.read_categorical(store, column, fingerprint)
+                if mapped is not None:
+                    encodings[column] = mapped
+
+        missing = [column for column in columns if column not in encodings]
+        if missing:
+            df = self.load_data(source_name, columns=missing)
+            with metrics.stage("index"):
+                built = {
+                    column: CategoricalEncoding.from_series(df[column])
+                    for column in missing
+                }
+            if store is not None:
+                built = self._store_categoricals(source, fingerprint, built)
+            encodings.update(built)
+
+        encodings = {column: encodings[column] for column in columns}
+        self._categorical_encodings[source_name] = (fingerprint, encodings)
+        return encodings
+
+    def _store_categoricals(
+        self,
+        source: DataSource,
+        fingerprint: Tuple[int, int],
+        encodings: Dict[str, CategoricalEncoding],
+    ) -> Dict[str, CategoricalEncoding]:
+        """Like ``_store_token_columns``, for categorical encodings"""
+        store = source_io.token_store_path(source)
+        mapped = {}
+        try:
+            for column, encoding in encodings.items():
+                with self._build_lock("categorical_store", source.name, column):
+                    mapped[column] = token_store.read_categorical(
+                        store, column, fingerprint
+                    )
+                    if mapped[column] is None:
+                        token_store.write_categorical(
+                            store, column, fingerprint, encoding
+                        )
+                        mapped[column] = token_store.read_categorical(
+                            store, column, fingerprint
+                        )
+        except OSError as e:
+            print(f"⚠️ Warning: Token store of {source.name} failed: {e}")
+            self._token_store_failures[source.name] = fingerprint
+            return encodings
+        return {
+            column: mapped[column] if mapped[column] is not None else encoding
+            for column, encoding in encodings.items()
+        }
+
+    def get_technology_index(
+        self, source_name: str, technology_column: str
+    ) -> TechnologyIndex:
+        """
+        Yarr! Get the respondent x technology index for a primary column
+        Built on first use and held in memory until the data file changes.
+        """
+        source = self._get_existing_source(source_name)
+        if technology_column not in self.get_columns(source_name):
+            raise ValueError(
+                f"Column '{technology_column}' not found in dataset. Available columns with technology data: {source.primary_columns}"
+            )
+
+        fingerprint = source_io.source_fingerprint(source)
+        key = (source_name, technology_column)
+        with self._build_lock("index", source_name, technology_column):
+            cached = self._technology_indexes.get(key)
+            if cached is not None and cached[0] == fingerprint:
+                return cached[1]
+
+            token_column = self._load_token_column(source_name, technology_column)
+            encodings = self._get_categorical_encodings(source_name)
+            with metrics.stage("index"):
+                index = TechnologyIndex(token_column, encodings)
+            self._technology_indexes[key] = (fingerprint, index)
+            return index
+
+    def analyze_technology_usage_filtered(
+        self,
+        source_name: str,
+        technology_column: str,
+        filters: Dict[str, List[str]],
+        top_n: int = 10,
+    ) -> Dict[str, List]:
+        """
+        Analyze technology usage for respondents matching categorical filters
+        e.g. ``{"Country": ["Germany"], "OrgSize": ["2 to 9 employees"]}`` -
+        answered from the in-memory technology index with a masked sum,
+        or chunk by chunk for streaming sources.
+        """
+        if self.is_streaming(source_name):
+            counts = self._parallel_token_counts(
+                source_name, technology_column, filters
+            )
+            if counts is None:
+                counts = self._stream_token_counts(
+                    source_name, [technology_column], filters
+                )[technology_column]
+            return counts.top(top_n)
+
+        index = self.get_technology_index(source_name, technology_column)
+        with metrics.stage("count"):
+            return index.counts(filters).top(top_n)
+
+    def analyze_co_occurrence(
+        self,
+        source_name: str,
+        technology_column: str,
+        other_column: Optional[str] = None,
+        top_k: int = 20,
+        sort_by: str = "count",
+    ) -> Dict[str, Any]:
+        """
+        Yarr! Find which technologies get used together
+        Pairs within one column, or across two columns when ``other_column`` is
+        given. The full pair matrix is cached per source and column pair.
+        """
+        source = self._get_existing_source(source_name)
+        fingerprint = source_io.source_fingerprint(source)
+        key = (source_name, technology_column, other_column)
+
+        cached = self._co_occurrences.get(key)
+        if cached is None or cached[0] != fingerprint:
+            left = self.get_technology_index(source_name, technology_column)
+            right = (
+                self.get_technology_index(source_name, other_column)
+                if other_column is not None and other_column != technology_column
+                else None
+            )
+            with metrics.stage("index"):
+                cached = (fingerprint, CoOccurrence(left, right))
+            self._co_occurrences[key] = cached
 
+        co_occurrence = cached[1]
+        with metrics.stage("count"):
+            pairs = co_occurrence.top(top_k, sort_by)
         return {
-            "labels": [tech[0] for tech in sorted_techs],
-            "values": [tech[1] for tech in sorted_techs],
-            "total_responses": len(df[technology_column].dropna()),
-            "unique_technologies": len(tech_counts),
+            "pairs": pairs,
+            "total_respondents": co_occurrence.total_respondents,
         }
 
     def get_available_analysis_columns(self, source_name: str) -> List[str]:
@@ -326,16 +1764,50 @@ class DataManager:
             return None
 
         source = self.data_sources[source_name]
+        file_exists = source_io.file_exists(source, source.file_path)
+        stats = self.get_source_stats(source_name, compute=False)
         return {
             "name": source.name,
             "description": source.description,
             "file_path": source.file_path,
+            "archive_path": source.archive_path,
             "has_schema": source.schema_file is not None,
             "primary_columns": source.primary_columns,
             "categorical_columns": source.categorical_columns,
-            "file_exists": os.path.exists(source.file_path),
+            "load_mode": source.load_mode,
+            "parsing_profile": (
+                source.parsing_profile.to_dict() if source.parsing_profile else None
+            ),
+            "streaming": self.is_streaming(source_name),
+            "file_exists": file_exists,
+            "columns": self.get_columns(source_name) if file_exists else [],
+            "row_count": stats["row_count"] if stats else None,
+            "distinct_counts": stats["distinct_counts"] if stats else {},
         }
 
 
 # Global data manager instance
-data_manager = DataManager(os.path.join(os.path.dirname(__file__), "..", "data"))
+data_manager = DataManager(
+    os.environ.get("DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data")),
+    cache_max_bytes=int(os.environ.get("DATA_CACHE_MAX_MB", "1024")) * 1024 * 1024,
+    columnar_cache=os.environ.get("DATA_COLUMNAR_CACHE", "1") != "0",
+    extract_archives=os.environ.get("DATA_EXTRACT_ARCHIVES", "0") == "1",
+    streaming_threshold_bytes=int(os.environ.get("DATA_STREAMING_THRESHOLD_MB", "2048"))
+    * 1024
+    * 1024,
+    stream_chunk_rows=int(
+        os.environ.get("DATA_STREAM_CHUNK_ROWS", str(DEFAULT_STREAM_CHUNK_ROWS))
+    ),
+    # Yarr! 0 means one worker per CPU core
+    parallel_workers=int(os.environ.get("DATA_PARALLEL_WORKERS", "1"))
+    or os.cpu_count()
+    or 1,
+    incremental_appends=os.environ.get("DATA_INCREMENTAL_APPENDS", "1") != "0",
+    compact_frames=os.environ.get("DATA_COMPACT_FRAMES", "0") == "1",
+    persistent_catalog=os.environ.get("DATA_CATALOG", "1") != "0",
+    mapped_token_store=os.environ.get("DATA_TOKEN_STORE", "1") != "0",
+    csv_engine=os.environ.get("DATA_CSV_ENGINE", "auto"),
+    approx_sample_rows=int(
+        os.environ.get("DATA_APPROX_SAMPLE_ROWS", str(DEFAULT_APPROX_SAMPLE_ROWS))
+    ),
+)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Yarr! Keep heavy pandas work off the event loop
+Analyses run in a bounded thread pool so one slow query can't becalm every
+other request, and identical in-flight queries share a single computation.
+"""
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+
+class AnalysisExecutor:
+    """
+    A bounded thread pool with single-flight coalescing.
+
+    ``run`` with a ``key`` joins an identical call already in flight instead of
+    starting a new one; every waiter gets the same result (or exception), so
+    results must be treated as read-only. Context variables of the caller are
+    carried into the worker thread. The pool starts on first use - and again
+    after ``shutdown``, so an app restarted in the same process gets a fresh one.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Dict[Hashable, Future] = {}
+        # Every submitted future until it finishes, so shutdown can cancel the queue
+        self._pending: Set[Future] = set()
+        # Re-entrant: a future that finishes instantly runs _forget while we hold it
+        self._lock = threading.RLock()
+        self.submitted = 0
+        self.coalesced = 0
+
+    def _submit(self, key: Optional[Hashable], func: Callable, args: tuple) -> Future:
+        """Start ``func`` in the pool, or return the in-flight future for ``key``"""
+        context = contextvars.copy_context()
+        with self._lock:
+            if key is not None and key in self._in_flight:
+                self.coalesced += 1
+                return self._in_flight[key]
+
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="analysis"
+                )
+            future = self._pool.submit(context.run, func, *args)
+            self.submitted += 1
+            self._pending.add(future)
+            future.add_done_callback(self._discard)
+            if key is not None:
+                self._in_flight[key] = future
+                future.add_done_callback(lambda done: self._forget(key, done))
+            return future
+
+    def _discard(self, future: Future) -> None:
+        """Stop tracking a finished (or cancelled) future"""
+        with self._lock:
+            self._pending.discard(future)
+
+    def _forget(self, key: Hashable, future: Future) -> None:
+        """Drop a finished computation so the next call starts afresh"""
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    async def run(self, key: Optional[Hashable], func: Callable, *args) -> Any:
+        """
+        Run ``func(*args)`` in the pool and await its result.
+        Pass ``key=None`` to opt out of coalescing.
+        """
+        future = self._submit(key, func, args)
+        # Shield so one impatient waiter can't cancel the shared computation
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def stats(self) -> Dict[str, int]:
+        """Pool size and submitted/coalesced counters"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": len(self._in_flight),
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+            }
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker threads: queued analyses are cancelled, running ones
+        waited for. A later ``run`` starts a new pool.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+            pending = list(self._pending)
+            self._in_flight.clear()
+        # Yarr! Cancel by hand - shutdown(cancel_futures=...) needs Python 3.9
+        for future in pending:
+            future.cancel()
+        if pool is not None:
+            pool.shutdown(wait=True)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Yarr! Streaming exports - whole distributions and respondent slices, any size
+Results are encoded a chunk at a time as NDJSON (one JSON object per line) or
+CSV, so a response starts flowing at once and memory stays flat however many
+rows the client ends up taking aboard.
+"""
+
+from typing import Dict, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .token_counting import TokenCounts
+
+# Export formats and their media types
+EXPORT_MEDIA_TYPES: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Distribution entries encoded per chunk
+DISTRIBUTION_CHUNK_ROWS = 10_000
+
+
+def encode_frame(frame: pd.DataFrame, export_format: str, header: bool) -> bytes:
+    """One chunk of rows as NDJSON lines or CSV records (nulls stay empty/null)"""
+    if export_format == "ndjson":
+        if frame.empty:
+            return b""
+        lines = frame.to_json(
+            orient="records", lines=True, force_ascii=False, date_format="iso"
+        )
+        return lines.rstrip("\n").encode("utf-8") + b"\n"
+    return frame.to_csv(index=False, header=header).encode("utf-8")
+
+
+def stream_frames(
+    chunks: Iterable[pd.DataFrame], export_format: str
+) -> Iterator[bytes]:
+    """Encode DataFrame chunks one by one (CSV gets its header once)"""
+    header = True
+    for chunk in chunks:
+        data = encode_frame(chunk, export_format, header)
+        if data:
+            header = False
+            yield data
+
+
+def stream_distribution(
+    counts: TokenCounts,
+    export_format: str,
+    chunk_rows: int = DISTRIBUTION_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """
+    Every technology of a column with its count and share of respondents,
+    most used first (ties in first-appearance order, like ``top``)
+    """
+    order = np.argsort(-counts.counts, kind="stable")
+    total = counts.total_responses
+
+    def chunks():
+        for start in range(0, max(len(order), 1), chunk_rows):
+            selected = order[start : start + chunk_rows]
+            values = counts.counts[selected]
+            yield pd.DataFrame(
+                {
+                    "technology": [str(label) for label in counts.labels[selected]],
+                    "count": values.astype(np.int64),
+                    "share": values / total if total else np.zeros(len(values)),
+                }
+            )
+
+    return stream_frames(chunks(), export_format)
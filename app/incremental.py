@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Yarr! Incremental recounts for data files that only ever grow
+Response batches get appended to a survey CSV throughout the day. For every
+(file, column) we remember the counts up to the last complete record and a
+checksum of the bytes around that offset, plus the file's fingerprint at the
+time. An unchanged fingerprint needs no reading at all; when the file has
+merely grown, only the new tail gets parsed and merged in. Anything else - a
+shrunk file, a touched file that didn't grow, changed bytes before the
+offset - means a rewrite and a full recount. Files that disappear are
+forgotten.
+"""
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional, Tuple
+
+from .cache import file_fingerprint
+from .metrics import metrics
+from .parsing import ParsingProfile
+from .partitions import last_record_end, read_header, read_records
+from .token_counting import TokenCounts, tokenize_series
+
+# Bytes checksummed at the start of the file and just before the counted offset
+SIGNATURE_WINDOW_BYTES = 64 * 1024
+
+
+@dataclass
+class AppendState:
+    """Counts of one column over a data file, up to a record boundary"""
+
+    offset: int
+    signature: bytes
+    counts: TokenCounts
+    fingerprint: Tuple[int, int]
+
+
+def file_signature(path: str, offset: int) -> bytes:
+    """
+    Checksum of the first and the last ``SIGNATURE_WINDOW_BYTES`` before
+    ``offset`` - appends leave it alone, rewrites (almost surely) don't
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        digest.update(handle.read(min(offset, SIGNATURE_WINDOW_BYTES)))
+        tail_start = max(0, offset - SIGNATURE_WINDOW_BYTES)
+        handle.seek(tail_start)
+        digest.update(handle.read(offset - tail_start))
+    return digest.digest()
+
+
+def count_records(
+    header: bytes,
+    data: bytes,
+    column: str,
+    profile: Optional[ParsingProfile] = None,
+) -> TokenCounts:
+    """Count ``column`` over header-less CSV records (``header`` is the raw header)"""
+    with metrics.stage("parse"):
+        frame = read_records(header, data, [column], profile)
+    with metrics.stage("count"):
+        return tokenize_series(frame[column]).counts()
+
+
+class AppendTracker:
+    """
+    Remembers per-file, per-column counts and the append offset they cover.
+    Thread-safe; each (file, column) has its own lock, so a column being
+    counted blocks only other callers asking for that same column - who then
+    get its fresh counts instead of counting it again.
+    """
+
+    def __init__(self):
+        self._states: Dict[Tuple[str, str], AppendState] = {}
+        self._column_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        # Guards the dictionaries and counters - never held while reading files
+        self._lock = threading.Lock()
+        self.full_recounts = 0
+        self.incremental_updates = 0
+        self.appended_bytes = 0
+
+    def _column_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        """The lock serializing counts of one (file, column)"""
+        with self._lock:
+            return self._column_locks.setdefault(key, threading.Lock())
+
+    def counts(
+        self,
+        path: str,
+        column: str,
+        full_count: Callable[[], TokenCounts],
+        profile: Optional[ParsingProfile] = None,
+    ) -> TokenCounts:
+        """
+        Counts of ``column`` over the whole file at ``path`` - parsing only the
+        bytes appended since the last call when possible (per the file's
+        parsing ``profile``), else calling ``full_count`` and remembering its
+        result
+        """
+        self._evict_missing()
+        key = (path, column)
+        with self._column_lock(key):
+            try:
+                fingerprint = file_fingerprint(path)
+            except FileNotFoundError:
+                self._evict(key)
+                raise
+            with self._lock:
+                state = self._states.get(key)
+            if state is not None and (
+                fingerprint == state.fingerprint
+                or (
+                    # Yarr! A touched file must have grown (and not gone back in
+                    # time) to count as an append
+                    fingerprint[1] > state.fingerprint[1]
+                    and fingerprint[0] >= state.fingerprint[0]
+                    and file_signature(path, state.offset) == state.signature
+                )
+            ):
+                return self._update(key, state, fingerprint, profile)
+            # Anything else is a rewrite - the old state is no use any more
+            self._evict(key)
+            return self._recount(key, path, full_count)
+
+    def _evict(self, key: Tuple[str, str]) -> None:
+        """Forget the counts of one (file, column)"""
+        with self._lock:
+            self._states.pop(key, None)
+
+    def _evict_missing(self) -> None:
+        """Forget every tracked file that no longer exists, and its idle locks"""
+        with self._lock:
+            paths = {path for path, _ in self._states} | {
+                path for path, _ in self._column_locks
+            }
+        missing = {path for path in paths if not os.path.exists(path)}
+        if not missing:
+            return
+        with self._lock:
+            for key in [key for key in self._states if key[0] in missing]:
+                del self._states[key]
+            for key, lock in list(self._column_locks.items()):
+                if key[0] in missing and not lock.locked():
+                    del self._column_locks[key]
+
+    def _update(
+        self,
+        key: Tuple[str, str],
+        state: AppendState,
+        fingerprint: Tuple[int, int],
+        profile: Optional[ParsingProfile] = None,
+    ) -> TokenCounts:
+        """Merge the records appended after ``state.offset`` into its counts"""
+        path, column = key
+        size = fingerprint[1]
+        if size == state.offset:
+            return state.counts
+
+        with open(path, "rb") as handle:
+            handle.seek(state.offset)
+            tail = handle.read(size - state.offset)
+
+        header = read_header(path)
+        complete = last_record_end(tail)
+        counts = state.counts
+        if complete:
+            counts = TokenCounts.merge(
+                [counts, count_records(header, tail[:complete], column, profile)]
+            )
+            offset = state.offset + complete
+            new_state = AppendState(
+                offset=offset,
+                signature=file_signature(path, offset),
+                counts=counts,
+                fingerprint=fingerprint,
+            )
+            with self._lock:
+                self._states[key] = new_state
+                self.incremental_updates += 1
+                self.appended_bytes += complete
+        elif fingerprint != state.fingerprint:
+            with self._lock:
+                self._states[key] = replace(state, fingerprint=fingerprint)
+
+        if complete < len(tail):
+            # Yarr! A last record still being written (or lacking its newline)
+            # counts now, but isn't remembered until it's complete
+            counts = TokenCounts.merge(
+                [counts, count_records(header, tail[complete:], column, profile)]
+            )
+        return counts
+
+    def _recount(
+        self, key: Tuple[str, str], path: str, full_count: Callable[[], TokenCounts]
+    ) -> TokenCounts:
+        """Count the whole file, remembering the result if it ends in a full record"""
+        before = file_fingerprint(path)
+        counts = full_count()
+        with self._lock:
+            self.full_recounts += 1
+
+        size = before[1]
+        # Only trust the offset if the file didn't change while we counted
+        if size and file_fingerprint(path) == before:
+            with open(path, "rb") as handle:
+                handle.seek(size - 1)
+                ends_with_newline = handle.read(1) == b"\n"
+            if ends_with_newline:
+                state = AppendState(
+                    offset=size,
+                    signature=file_signature(path, size),
+                    counts=counts,
+                    fingerprint=before,
+                )
+                with self._lock:
+                    self._states[key] = state
+        return counts
+
+    def stats(self) -> Dict[str, int]:
+        """Tracked columns and full/incremental recount counters"""
+        with self._lock:
+            return {
+                "tracked": len(self._states),
+                "full_recounts": self.full_recounts,
+                "incremental_updates": self.incremental_updates,
+                "appended_bytes": self.appended_bytes,
+            }
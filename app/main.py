@@ -4,19 +4,90 @@ Yarr! This be the main FastAPI application for the Codebase Insights Analyzer MV
 A data analyst's treasure chest for exploring developer survey data, arrr!
 """
 
+import asyncio
+import hashlib
 import os
-from typing import Dict, List
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import FileResponse, HTMLResponse
-from pydantic import BaseModel
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Literal, Optional, Union
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    JSONResponse,
+    PlainTextResponse,
+    StreamingResponse,
+)
+from pydantic import BaseModel, Field
 
+from .cache import ResultCache
 from .data_config import data_manager
+from .executor import AnalysisExecutor
+from .export import EXPORT_MEDIA_TYPES, stream_distribution, stream_frames
+from .metrics import MetricsMiddleware, metrics
+from .profiling import profile_store
+from .responses import EncodedPayload, PayloadCache
+from .trends import align_token_counts
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Yarr! Set sail immediately and load the cargo in the background
+    Data discovery (and, unless DATA_WARMUP=0, cache warm-up) runs on a
+    background thread so the server accepts connections right away.
+    """
+    target = (
+        data_manager.warm_up
+        if os.environ.get("DATA_WARMUP", "1") != "0"
+        else data_manager.initialize
+    )
+    threading.Thread(target=target, name="data-warmup", daemon=True).start()
+    yield
+    analysis_executor.shutdown()
+    data_manager.shutdown()
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON responses whose encoding gets timed as the "serialize" stage"""
+
+    def render(self, content: Any) -> bytes:
+        with metrics.stage("serialize"):
+            return super().render(content)
+
 
 # Yarr! Initialize our analytical ship!
 app = FastAPI(
     title="Codebase Insights Analyzer",
     description="A data analyst's treasure chest for exploring developer insights and survey data!",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
+)
+
+# Per-stage timings in a Server-Timing header, request counts for /metrics
+if metrics.enabled:
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+# Heavy pandas work runs here instead of on the event loop
+analysis_executor = AnalysisExecutor(
+    max_workers=int(os.environ.get("ANALYSIS_MAX_WORKERS", "4"))
+)
+
+# Small, deterministic analysis results are cached per data fingerprint
+result_cache = ResultCache(
+    max_entries=int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", "512")),
+    ttl_seconds=float(os.environ.get("RESULT_CACHE_TTL_SECONDS", "300")),
+)
+
+# Schema and source-list bodies, encoded and compressed once per data version
+payload_cache = PayloadCache()
+
+# Clients and proxies may keep analysis responses, but must revalidate via ETag
+ANALYSIS_CACHE_CONTROL = (
+    f"public, max-age={int(os.environ.get('RESPONSE_MAX_AGE_SECONDS', '0'))}, "
+    "must-revalidate"
 )
 
 
@@ -31,12 +102,215 @@ class AnalysisResponse(BaseModel):
     data_source: str
 
 
+class ApproxAnalysisResponse(AnalysisResponse):
+    """Response model for approximate technology analysis (``mode=approx``)"""
+
+    # Yarr! Half-widths of the confidence intervals around each value
+    error_bounds: List[int]
+    sample_fraction: float
+    sampled_rows: Optional[int] = None
+    confidence: float
+    mode: Literal["approx"] = "approx"
+
+
+class BatchColumnRequest(BaseModel):
+    """One column of a batch analysis request"""
+
+    column: str
+    top_n: int = Field(10, ge=1, le=50)
+
+
+class BatchAnalysisRequest(BaseModel):
+    """Request model for batch technology analysis"""
+
+    source: str = "stackoverflow_2023"
+    # Yarr! Leave out to analyze every primary column of the source
+    columns: Optional[List[BatchColumnRequest]] = None
+    top_n: int = Field(10, ge=1, le=50)
+
+
+class BatchColumnResult(BaseModel):
+    """The analysis of one batch column - or why it failed"""
+
+    column: str
+    top_n: int
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+
+
+class BatchAnalysisResponse(BaseModel):
+    """Response model for batch technology analysis"""
+
+    data_source: str
+    results: List[BatchColumnResult]
+
+
+class TrendSeries(BaseModel):
+    """One source's counts and shares, aligned on the trend's labels"""
+
+    source: str
+    values: List[int] = []
+    shares: List[float] = []
+    total_responses: int = 0
+    error: Optional[str] = None
+
+
+class TrendResponse(BaseModel):
+    """Response model for technology trends across sources"""
+
+    labels: List[str]
+    analysis_column: str
+    series: List[TrendSeries]
+
+
+class FilteredAnalysisResponse(AnalysisResponse):
+    """Response model for technology analysis over a filtered slice of respondents"""
+
+    filters: Dict[str, List[str]]
+
+
+class CoOccurrencePair(BaseModel):
+    """A pair of technologies used by the same respondents"""
+
+    technology: str
+    other_technology: str
+    count: int
+    support: float
+    lift: float
+
+
+class CoOccurrenceResponse(BaseModel):
+    """Response model for technology co-occurrence analysis"""
+
+    pairs: List[CoOccurrencePair]
+    total_respondents: int
+    analysis_column: str
+    other_column: str
+    data_source: str
+
+
 class DataSourceInfo(BaseModel):
     """Information about available data sources"""
 
     name: str
     description: str
     available_columns: List[str]
+    # Yarr! Known once the source has been read in full (kept in the catalog)
+    row_count: Optional[int] = None
+
+
+async def data_ready() -> None:
+    """
+    Yarr! Dependency making sure data sources are discovered before a route runs
+    The (possibly slow) first-time discovery happens in the worker pool, never on
+    the event loop, and concurrent first requests share it.
+    """
+    if not data_manager.is_initialized:
+        await analysis_executor.run(("initialize",), data_manager.initialize)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match against our ETag (weak comparison, per RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
+
+
+def _profile_requested(request: Request) -> bool:
+    """
+    Whether a request asks to be profiled (``X-Profile: 1`` or ``?profile=1``)
+    - never true unless PROFILING_ENABLED=1
+    """
+    if profile_store is None:
+        return False
+    return (
+        request.headers.get("x-profile") == "1"
+        or request.query_params.get("profile") == "1"
+    )
+
+
+async def _run_analysis(
+    request: Request, response: Response, key: Optional[tuple], func: Callable, *args
+) -> Any:
+    """
+    Run an analysis in the worker pool - under the profiler when the request
+    asks for it, then uncoalesced so the work really runs in this request, with
+    the new profile's id in an ``X-Profile-Id`` header
+    """
+    if not _profile_requested(request):
+        return await analysis_executor.run(key, func, *args)
+
+    label = f"{request.method} {request.url.path}?{request.url.query}"
+    result, profile_id = await analysis_executor.run(
+        None, profile_store.run, label, func, *args
+    )
+    if profile_id is not None:
+        response.headers["X-Profile-Id"] = profile_id
+    return result
+
+
+def _payload_response(request: Request, payload: EncodedPayload) -> Response:
+    """
+    Serve a pre-encoded payload in the best content coding the client accepts
+    - or a 304 when its ETag still matches
+    """
+    headers = {
+        "ETag": payload.etag,
+        "Cache-Control": ANALYSIS_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request, payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    body, coding = payload.variant(request.headers.get("accept-encoding"))
+    if coding is not None:
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _run_cached_analysis(
+    request: Request,
+    response: Response,
+    key: tuple,
+    source: str,
+    func: Callable,
+    *args,
+) -> Any:
+    """
+    Yarr! Run an analysis through the result cache with conditional GET support
+
+    Results are cached under ``key`` plus the source's data fingerprint. The
+    strong ETag also covers the request path, so endpoints sharing a result
+    still get distinct ETags. Raises a 304 HTTPException when the client's
+    copy is current; otherwise sets ETag and Cache-Control on ``response``.
+    A profiled request skips both caches - there'd be nothing to profile.
+    """
+    fingerprint = data_manager.get_source_fingerprint(source)
+    cache_key = key + (fingerprint,)
+    digest = hashlib.sha256(repr((request.url.path, cache_key)).encode())
+    headers = {
+        "ETag": f'"{digest.hexdigest()[:32]}"',
+        "Cache-Control": ANALYSIS_CACHE_CONTROL,
+    }
+
+    profiled = _profile_requested(request)
+    if not profiled and _etag_matches(request, headers["ETag"]):
+        raise HTTPException(status_code=304, headers=headers)
+
+    result = None if profiled else result_cache.get(cache_key)
+    if result is None:
+        result = await _run_analysis(request, response, cache_key, func, *args)
+        result_cache.put(cache_key, result)
+
+    response.headers.update(headers)
+    return result
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -55,25 +329,81 @@ async def serve_frontend():
     return FileResponse(template_path, media_type="text/html")
 
 
-@app.get("/api/data-sources", response_model=List[DataSourceInfo])
-async def get_data_sources():
+@app.get("/healthz")
+async def healthz() -> Dict[str, str]:
+    """Yarr! Liveness check - the ship be afloat if this answers"""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """
+    Yarr! Readiness check - 200 once data sources are discovered and any
+    warm-up has finished, 503 (with warm-up progress) until then.
+    """
+    warmup = dict(data_manager.warmup_status)
+    ready = data_manager.is_initialized and warmup["state"] != "running"
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "starting",
+            "initialized": data_manager.is_initialized,
+            "warmup": warmup,
+        },
+    )
+
+
+@app.get(
+    "/api/data-sources",
+    response_model=List[DataSourceInfo],
+    dependencies=[Depends(data_ready)],
+)
+async def get_data_sources(request: Request):
     """
     Yarr! Get information about all available data sources
     Perfect for data analysts who want to know what treasures are available!
+    Served from memory and the source catalog - no data file gets read - and
+    encoded only when a source changes.
     """
     sources = []
     for name, description in data_manager.get_available_sources().items():
-        available_columns = data_manager.get_available_analysis_columns(name)
+        stats = data_manager.get_source_stats(name, compute=False)
         sources.append(
-            DataSourceInfo(
-                name=name, description=description, available_columns=available_columns
+            (
+                name,
+                description,
+                tuple(data_manager.get_available_analysis_columns(name)),
+                stats["row_count"] if stats else None,
             )
         )
-    return sources
+
+    def build():
+        return jsonable_encoder(
+            [
+                DataSourceInfo(
+                    name=name,
+                    description=description,
+                    available_columns=list(columns),
+                    row_count=row_count,
+                )
+                for name, description, columns, row_count in sources
+            ]
+        )
+
+    sources = tuple(sources)
+    return _payload_response(
+        request, payload_cache.get(("data-sources",), sources, build)
+    )
 
 
-@app.get("/api/analysis/technology-usage", response_model=AnalysisResponse)
+@app.get(
+    "/api/analysis/technology-usage",
+    response_model=Union[ApproxAnalysisResponse, AnalysisResponse],
+    dependencies=[Depends(data_ready)],
+)
 async def analyze_technology_usage(
+    request: Request,
+    response: Response,
     source: str = Query("stackoverflow_2023", description="Data source to analyze"),
     column: str = Query(
         "LanguageHaveWorkedWith", description="Technology column to analyze"
@@ -81,6 +411,9 @@ async def analyze_technology_usage(
     top_n: int = Query(
         10, ge=1, le=50, description="Number of top technologies to return"
     ),
+    mode: Literal["exact", "approx"] = Query(
+        "exact", description="'approx' estimates from a row sample, with error bounds"
+    ),
 ):
     """
     Yarr! The main analysis endpoint - flexible technology usage analysis!
@@ -89,6 +422,7 @@ async def analyze_technology_usage(
     - Choose different data sources
     - Analyze different technology categories (languages, databases, platforms, etc.)
     - Adjust the number of results
+    - Trade exactness for speed with ``mode=approx`` on very large sources
 
     Perfect for exploratory data analysis!
     """
@@ -109,20 +443,427 @@ async def analyze_technology_usage(
                 detail=f"Column '{column}' not available for analysis in source '{source}'. Available columns: {available_columns}",
             )
 
+        if mode == "approx":
+            result = await _run_cached_analysis(
+                request,
+                response,
+                ("technology-usage-approx", source, column, top_n),
+                source,
+                data_manager.analyze_technology_usage_approx,
+                source,
+                column,
+                top_n,
+            )
+            with metrics.stage("validate"):
+                return ApproxAnalysisResponse(
+                    **result, analysis_column=column, data_source=source
+                )
+
         # Perform the analysis
-        result = data_manager.analyze_technology_usage(source, column, top_n)
+        result = await _run_cached_analysis(
+            request,
+            response,
+            ("technology-usage", source, column, top_n),
+            source,
+            data_manager.analyze_technology_usage,
+            source,
+            column,
+            top_n,
+        )
+
+        with metrics.stage("validate"):
+            return AnalysisResponse(
+                labels=result["labels"],
+                values=result["values"],
+                total_responses=result["total_responses"],
+                unique_technologies=result["unique_technologies"],
+                analysis_column=column,
+                data_source=source,
+            )
+
+    except HTTPException:
+        # Re-raise HTTP exceptions as-is
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+@app.post(
+    "/api/analysis/technology-usage/batch",
+    response_model=BatchAnalysisResponse,
+    dependencies=[Depends(data_ready)],
+)
+async def analyze_technology_usage_batch(
+    batch: BatchAnalysisRequest, request: Request, response: Response
+):
+    """
+    Yarr! Analyze many technology columns in one go!
+
+    All requested columns are counted with a single load and scan of the source
+    (every primary column when ``columns`` is left out). A column that can't be
+    analyzed gets an ``error`` instead of failing the whole batch. Results are
+    shared with ``/api/analysis/technology-usage``, so a dashboard can batch its
+    first paint and still fetch single columns from cache afterwards.
+    """
+    source = batch.source
+    try:
+        available_sources = data_manager.get_available_sources()
+        if source not in available_sources:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown data source '{source}'. Available sources: {list(available_sources.keys())}",
+            )
+
+        available_columns = data_manager.get_available_analysis_columns(source)
+        requests = (
+            [(item.column, item.top_n) for item in batch.columns]
+            if batch.columns is not None
+            else [(column, batch.top_n) for column in available_columns]
+        )
+
+        fingerprint = data_manager.get_source_fingerprint(source)
+        profiled = _profile_requested(request)
+        results = {}
+        missing = []
+        for column, top_n in requests:
+            if column not in available_columns:
+                results[(column, top_n)] = {
+                    "error": f"Column '{column}' not available for analysis in source '{source}'. Available columns: {available_columns}"
+                }
+                continue
+            cached = (
+                None
+                if profiled
+                else result_cache.get(
+                    ("technology-usage", source, column, top_n, fingerprint)
+                )
+            )
+            if cached is not None:
+                results[(column, top_n)] = {"result": cached}
+            else:
+                missing.append((column, top_n))
+
+        if missing:
+            missing = list(dict.fromkeys(missing))
+            computed = await _run_analysis(
+                request,
+                response,
+                ("technology-usage-batch", source, tuple(missing), fingerprint),
+                data_manager.analyze_technology_usage_batch,
+                source,
+                missing,
+            )
+            for item in computed:
+                results[(item["column"], item["top_n"])] = item
+                if "result" in item:
+                    result_cache.put(
+                        (
+                            "technology-usage",
+                            source,
+                            item["column"],
+                            item["top_n"],
+                            fingerprint,
+                        ),
+                        item["result"],
+                    )
+
+        with metrics.stage("validate"):
+            return BatchAnalysisResponse(
+                data_source=source,
+                results=[
+                    BatchColumnResult(
+                        column=column,
+                        top_n=top_n,
+                        result=(
+                            AnalysisResponse(
+                                **results[(column, top_n)]["result"],
+                                analysis_column=column,
+                                data_source=source,
+                            )
+                            if "result" in results[(column, top_n)]
+                            else None
+                        ),
+                        error=results[(column, top_n)].get("error"),
+                    )
+                    for column, top_n in requests
+                ],
+            )
+
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+async def _technology_counts(source: str, column: str):
+    """Full technology counts of one source, through the result cache"""
+    fingerprint = data_manager.get_source_fingerprint(source)
+    key = ("technology-counts", source, column, fingerprint)
+    counts = result_cache.get(key)
+    if counts is None:
+        counts = await analysis_executor.run(
+            key, data_manager.get_technology_counts, source, column
+        )
+        result_cache.put(key, counts)
+    return counts
+
+
+@app.get(
+    "/api/analysis/trends",
+    response_model=TrendResponse,
+    dependencies=[Depends(data_ready)],
+)
+async def analyze_trends(
+    column: str = Query(
+        "LanguageHaveWorkedWith", description="Technology column to compare"
+    ),
+    sources: Optional[List[str]] = Query(
+        None,
+        description="Sources to compare, in order (e.g. survey years) - "
+        "every source with the column when left out",
+    ),
+    top_n: int = Query(
+        10, ge=1, le=50, description="Number of top technologies to return"
+    ),
+):
+    """
+    Yarr! Technology trends across sources - year over year!
+
+    Counts ``column`` in every source concurrently (each through its own
+    caches), matches technology labels across sources regardless of case and
+    spacing, and returns aligned counts and shares of respondents per source.
+    A requested source that can't be analyzed - or lacks ``column`` among its
+    technology columns - gets an ``error`` instead of failing the rest.
+    """
+    try:
+        available_sources = data_manager.get_available_sources()
+        every_source = sources is None
+        if every_source:
+            sources = list(available_sources)
+        sources = list(dict.fromkeys(sources))
+        unknown = [source for source in sources if source not in available_sources]
+        if unknown or not sources:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown data sources {unknown}. Available sources: {list(available_sources.keys())}",
+            )
+
+        # Yarr! Only primary (multi-value) columns count as technologies
+        lacking = [
+            source
+            for source in sources
+            if column not in data_manager.get_available_analysis_columns(source)
+        ]
+        if len(lacking) == len(sources):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Column '{column}' not available for analysis in sources {lacking}",
+            )
+        if every_source:
+            sources = [source for source in sources if source not in lacking]
+            lacking = []
+
+        analyzed = [source for source in sources if source not in lacking]
+        outcomes = await asyncio.gather(
+            *(_technology_counts(source, column) for source in analyzed),
+            return_exceptions=True,
+        )
+
+        counts = {}
+        errors = {
+            source: f"Column '{column}' not available for analysis in source '{source}'. Available columns: {data_manager.get_available_analysis_columns(source)}"
+            for source in lacking
+        }
+        for source, outcome in zip(analyzed, outcomes):
+            if isinstance(outcome, (ValueError, FileNotFoundError)):
+                errors[source] = str(outcome)
+            elif isinstance(outcome, Exception):
+                errors[source] = f"Analysis failed: {str(outcome)}"
+            else:
+                counts[source] = outcome
+
+        trend = align_token_counts(counts, top_n)
+        with metrics.stage("validate"):
+            return TrendResponse(
+                labels=trend["labels"],
+                analysis_column=column,
+                series=[
+                    (
+                        TrendSeries(source=source, **trend["series"][source])
+                        if source in counts
+                        else TrendSeries(source=source, error=errors[source])
+                    )
+                    for source in sources
+                ],
+            )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
-        return AnalysisResponse(
-            labels=result["labels"],
-            values=result["values"],
-            total_responses=result["total_responses"],
-            unique_technologies=result["unique_technologies"],
+
+@app.get(
+    "/api/analysis/technology-usage/filtered",
+    response_model=FilteredAnalysisResponse,
+    dependencies=[Depends(data_ready)],
+)
+async def analyze_technology_usage_filtered(
+    request: Request,
+    response: Response,
+    source: str = Query("stackoverflow_2023", description="Data source to analyze"),
+    column: str = Query(
+        "LanguageHaveWorkedWith", description="Technology column to analyze"
+    ),
+    top_n: int = Query(
+        10, ge=1, le=50, description="Number of top technologies to return"
+    ),
+    mode: Literal["exact", "approx"] = Query(
+        "exact",
+        description="Accepted like on the unfiltered endpoint - the index "
+        "answers exactly either way",
+    ),
+):
+    """
+    Yarr! Technology usage for a slice of respondents!
+
+    Any other query parameter filters on a categorical column of the source,
+    e.g. ``?Country=Germany&OrgSize=2%20to%209%20employees``. Repeat a parameter
+    to match any of several values. Answered from a precomputed in-memory index
+    - cheap enough that ``mode=approx`` gets the exact counts too.
+    """
+    try:
+        available_sources = data_manager.get_available_sources()
+        if source not in available_sources:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown data source '{source}'. Available sources: {list(available_sources.keys())}",
+            )
+
+        available_columns = data_manager.get_available_analysis_columns(source)
+        if column not in available_columns:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Column '{column}' not available for analysis in source '{source}'. Available columns: {available_columns}",
+            )
+
+        filters = {
+            key: request.query_params.getlist(key)
+            for key in request.query_params.keys()
+            if key not in ("source", "column", "top_n", "mode", "profile")
+        }
+
+        result = await _run_cached_analysis(
+            request,
+            response,
+            (
+                "technology-usage-filtered",
+                source,
+                column,
+                top_n,
+                tuple(sorted((key, tuple(values)) for key, values in filters.items())),
+            ),
+            source,
+            data_manager.analyze_technology_usage_filtered,
+            source,
+            column,
+            filters,
+            top_n,
+        )
+
+        with metrics.stage("validate"):
+            return FilteredAnalysisResponse(
+                labels=result["labels"],
+                values=result["values"],
+                total_responses=result["total_responses"],
+                unique_technologies=result["unique_technologies"],
+                analysis_column=column,
+                data_source=source,
+                filters=filters,
+            )
+
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+@app.get(
+    "/api/analysis/co-occurrence",
+    response_model=CoOccurrenceResponse,
+    dependencies=[Depends(data_ready)],
+)
+async def analyze_co_occurrence(
+    request: Request,
+    response: Response,
+    source: str = Query("stackoverflow_2023", description="Data source to analyze"),
+    column: str = Query(
+        "LanguageHaveWorkedWith", description="Technology column to analyze"
+    ),
+    other_column: Optional[str] = Query(
+        None, description="Second technology column (defaults to the same column)"
+    ),
+    top_k: int = Query(20, ge=1, le=100, description="Number of pairs to return"),
+    sort_by: Literal["count", "lift"] = Query(
+        "count", description="Rank pairs by co-occurrence count or by lift"
+    ),
+):
+    """
+    Yarr! Developers who use X also use Y!
+
+    Returns the top technology pairs within one column, or across two columns
+    (e.g. languages x databases), with their counts, support and lift.
+    """
+    try:
+        available_sources = data_manager.get_available_sources()
+        if source not in available_sources:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown data source '{source}'. Available sources: {list(available_sources.keys())}",
+            )
+
+        available_columns = data_manager.get_available_analysis_columns(source)
+        for requested in (column, other_column or column):
+            if requested not in available_columns:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Column '{requested}' not available for analysis in source '{source}'. Available columns: {available_columns}",
+                )
+
+        result = await _run_cached_analysis(
+            request,
+            response,
+            ("co-occurrence", source, column, other_column, top_k, sort_by),
+            source,
+            data_manager.analyze_co_occurrence,
+            source,
+            column,
+            other_column,
+            top_k,
+            sort_by,
+        )
+
+        return CoOccurrenceResponse(
+            pairs=result["pairs"],
+            total_respondents=result["total_respondents"],
             analysis_column=column,
+            other_column=other_column or column,
             data_source=source,
         )
 
     except HTTPException:
-        # Re-raise HTTP exceptions as-is
         raise
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -133,17 +874,29 @@ async def analyze_technology_usage(
 
 
 # Backward compatibility endpoint for the original specification
-@app.get("/api/languages/popular")
-async def get_popular_languages() -> Dict[str, List]:
+@app.get("/api/languages/popular", dependencies=[Depends(data_ready)])
+async def get_popular_languages(
+    request: Request, response: Response
+) -> Dict[str, List]:
     """
     Yarr! Legacy endpoint for backward compatibility
     Redirects to the new flexible analysis system
     """
     try:
-        result = data_manager.analyze_technology_usage(
-            "stackoverflow_2023", "LanguageHaveWorkedWith", 10
+        # Same key as the main endpoint, so both share one cached computation
+        result = await _run_cached_analysis(
+            request,
+            response,
+            ("technology-usage", "stackoverflow_2023", "LanguageHaveWorkedWith", 10),
+            "stackoverflow_2023",
+            data_manager.analyze_technology_usage,
+            "stackoverflow_2023",
+            "LanguageHaveWorkedWith",
+            10,
         )
         return {"labels": result["labels"], "values": result["values"]}
+    except HTTPException:
+        raise
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
@@ -152,30 +905,312 @@ async def get_popular_languages() -> Dict[str, List]:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
-@app.get("/api/schema/{source_name}")
-async def get_data_schema(source_name: str):
+def _schema_content(source_name: str) -> Dict[str, Any]:
+    """The schema endpoint's payload"""
+    schema_info = data_manager.get_schema_info(source_name)
+    if schema_info is None:
+        raise FileNotFoundError(f"No schema information available for '{source_name}'")
+    # Clean up NaN values for JSON serialization
+    return {"source": source_name, "schema": schema_info.fillna("").to_dict("records")}
+
+
+@app.get("/api/schema/{source_name}", dependencies=[Depends(data_ready)])
+async def get_data_schema(source_name: str, request: Request):
     """
     Yarr! Get schema information for a data source
     Useful for data analysts who want to understand the data structure
+    Encoded and compressed once per schema file version.
     """
     try:
-        schema_info = data_manager.get_schema_info(source_name)
-        if schema_info is None:
+        fingerprint = data_manager.get_schema_fingerprint(source_name)
+        if fingerprint is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"No schema information available for '{source_name}'",
             )
 
-        # Clean up NaN values for JSON serialization
-        schema_dict = schema_info.fillna("").to_dict("records")
-
-        return {"source": source_name, "schema": schema_dict}
+        key = ("schema", source_name)
+        payload = payload_cache.peek(key, fingerprint)
+        if payload is None:
+            payload = await analysis_executor.run(
+                key + (fingerprint,),
+                payload_cache.get,
+                key,
+                fingerprint,
+                lambda: _schema_content(source_name),
+            )
+        return _payload_response(request, payload)
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to retrieve schema: {str(e)}"
         )
 
 
+@app.get("/api/cache/stats")
+async def get_cache_stats() -> Dict[str, Any]:
+    """
+    Yarr! Report how well our DataFrame cache be keeping the hold stocked
+    Returns hit/miss/eviction counters and current memory usage, plus how
+    many analyses the worker pool has run and coalesced, how the analysis
+    result cache be doing, how many recounts only parsed appended rows and
+    how often discovery found its listings in the source catalog.
+    """
+    return {
+        **data_manager.get_cache_stats(),
+        "appends": data_manager.get_append_stats(),
+        "catalog": data_manager.get_catalog_stats(),
+        "payloads": payload_cache.stats(),
+        "executor": analysis_executor.stats(),
+        "results": result_cache.stats(),
+    }
+
+
+def _export_response(chunks, export_format: str, name: str) -> StreamingResponse:
+    """Stream encoded chunks as a download named after what's exported"""
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{export_format}"'
+        },
+    )
+
+
+@app.get(
+    "/api/export/technology-distribution",
+    response_class=StreamingResponse,
+    dependencies=[Depends(data_ready)],
+)
+async def export_technology_distribution(
+    source: str = Query("stackoverflow_2023", description="Data source to export"),
+    column: str = Query(
+        "LanguageHaveWorkedWith", description="Technology column to export"
+    ),
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Export format"),
+):
+    """
+    Yarr! The complete distribution of a technology column - every technology
+    with its count and share of respondents, most used first, long tail and all.
+    Streamed as NDJSON or CSV.
+    """
+    try:
+        available_sources = data_manager.get_available_sources()
+        if source not in available_sources:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown data source '{source}'. Available sources: {list(available_sources.keys())}",
+            )
+
+        available_columns = data_manager.get_available_analysis_columns(source)
+        if column not in available_columns:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Column '{column}' not available for analysis in source '{source}'. Available columns: {available_columns}",
+            )
+
+        counts = await _technology_counts(source, column)
+        return _export_response(
+            stream_distribution(counts, format), format, f"{source}-{column}"
+        )
+
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
+
+@app.get(
+    "/api/export/respondents",
+    response_class=StreamingResponse,
+    dependencies=[Depends(data_ready)],
+)
+async def export_respondents(
+    request: Request,
+    source: str = Query("stackoverflow_2023", description="Data source to export"),
+    columns: Optional[List[str]] = Query(
+        None, description="Columns to export, in order - every column when left out"
+    ),
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Export format"),
+):
+    """
+    Yarr! Raw respondent rows for a slice of the survey, streamed chunk by chunk
+
+    Any other query parameter filters on a categorical column of the source,
+    exactly like the filtered analysis endpoint.
+    """
+    try:
+        available_sources = data_manager.get_available_sources()
+        if source not in available_sources:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown data source '{source}'. Available sources: {list(available_sources.keys())}",
+            )
+
+        filters = {
+            key: request.query_params.getlist(key)
+            for key in request.query_params.keys()
+            if key not in ("source", "columns", "format")
+        }
+
+        # Checking columns and filters may touch the disk - keep it off the loop
+        chunks = await analysis_executor.run(
+            None, data_manager.iter_respondents, source, columns, filters
+        )
+        return _export_response(
+            stream_frames(chunks, format), format, f"{source}-respondents"
+        )
+
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Yarr! Metrics for Prometheus to plunder, in its text exposition format
+    Stage timings, rows processed and bytes read, HTTP requests, plus the
+    cache, executor and append counters sampled when scraped.
+    """
+    if not metrics.enabled:
+        raise HTTPException(
+            status_code=404, detail="Arrr! Metrics be disabled (METRICS_ENABLED=0)"
+        )
+
+    frames = data_manager.get_cache_stats()
+    results = result_cache.stats()
+    executor = analysis_executor.stats()
+    appends = data_manager.get_append_stats()
+    sampled = {
+        "frame_cache_hits_total": ("counter", "DataFrame cache hits", frames["hits"]),
+        "frame_cache_misses_total": (
+            "counter",
+            "DataFrame cache misses",
+            frames["misses"],
+        ),
+        "frame_cache_evictions_total": (
+            "counter",
+            "DataFrame cache evictions",
+            frames["evictions"],
+        ),
+        "frame_cache_bytes": (
+            "gauge",
+            "Memory held by cached DataFrames",
+            frames["current_bytes"],
+        ),
+        "result_cache_hits_total": ("counter", "Result cache hits", results["hits"]),
+        "result_cache_misses_total": (
+            "counter",
+            "Result cache misses",
+            results["misses"],
+        ),
+        "result_cache_entries": ("gauge", "Cached results", results["entries"]),
+        "executor_submitted_total": (
+            "counter",
+            "Analyses run in the worker pool",
+            executor["submitted"],
+        ),
+        "executor_coalesced_total": (
+            "counter",
+            "Analyses that joined an identical one in flight",
+            executor["coalesced"],
+        ),
+        "executor_in_flight": ("gauge", "Analyses in flight", executor["in_flight"]),
+        "append_full_recounts_total": (
+            "counter",
+            "Full recounts of growing data files",
+            appends["full_recounts"],
+        ),
+        "append_incremental_updates_total": (
+            "counter",
+            "Recounts that parsed only appended rows",
+            appends["incremental_updates"],
+        ),
+        "append_bytes_read_total": (
+            "counter",
+            "Appended bytes parsed by incremental recounts",
+            appends["appended_bytes"],
+        ),
+    }
+
+    return PlainTextResponse(
+        metrics.render(sampled), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/api/profiles")
+async def list_profiles() -> Dict[str, Any]:
+    """
+    Yarr! List captured request profiles, newest first
+    Profile an analysis request by sending ``X-Profile: 1`` (or ``?profile=1``)
+    with PROFILING_ENABLED=1; its id comes back in ``X-Profile-Id``.
+    """
+    if profile_store is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Arrr! Profiling be disabled (set PROFILING_ENABLED=1)",
+        )
+    return {
+        "max_profiles": profile_store.max_profiles,
+        "profiles": profile_store.list(),
+    }
+
+
+@app.get("/api/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    format: Literal["pstats", "text"] = Query(
+        "pstats", description="Raw pstats file, or a text summary by cumulative time"
+    ),
+):
+    """
+    Yarr! Download a captured profile - open it with ``pstats`` or snakeviz,
+    or ask for ``format=text`` to read the hottest calls right away
+    """
+    if profile_store is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Arrr! Profiling be disabled (set PROFILING_ENABLED=1)",
+        )
+    try:
+        if format == "text":
+            return PlainTextResponse(profile_store.summary(profile_id))
+        return FileResponse(
+            profile_store.path(profile_id),
+            media_type="application/octet-stream",
+            filename=f"{profile_id}.prof",
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@app.get("/api/memory")
+async def get_memory_report() -> Dict[str, Any]:
+    """
+    Yarr! Report how much memory each source and column be taking up
+    Covers cached frames (per column), technology indexes, categorical
+    encodings, co-occurrence matrices and row samples - plus the analysis
+    result cache, which isn't tied to one source.
+    """
+    report = await analysis_executor.run(None, data_manager.get_memory_report)
+    report["result_cache_bytes"] = result_cache.nbytes()
+    report["total_bytes"] += report["result_cache_bytes"]
+    return report
+
+
 # Yarr! This be how we run our ship when called directly
 if __name__ == "__main__":
     import uvicorn
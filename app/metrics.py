@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Yarr! Instrumentation for the analytics ship - where does the time go?
+Per-stage timers (parse, count, validate, serialize, ...), counters for rows
+processed and bytes read, rendered in Prometheus text format for ``/metrics``
+and collected per request for the ``Server-Timing`` header. With metrics
+disabled every hook is a no-op.
+"""
+
+import contextvars
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+
+# Prefix of every exported metric name
+METRIC_PREFIX = "insights_"
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Stage durations of the request being handled, in milliseconds (None = not tracked)
+_request_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = (
+    contextvars.ContextVar("request_timings", default=None)
+)
+
+
+def _labels(labels: Dict[str, str]) -> LabelKey:
+    """Canonical (sorted) label key"""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: LabelKey, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    """Render labels as ``{name="value",...}`` (empty string when none)"""
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Prometheus sample value"""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """
+    A small thread-safe registry of counters and stage-duration histograms.
+
+    ``stage`` times a block into the ``stage_seconds`` histogram and into the
+    current request's Server-Timing entries. Context variables travel into the
+    analysis worker threads, so stages timed there count for the request too.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._help: Dict[str, str] = {}
+        self._stages: Dict[str, List[float]] = {}
+
+    def increment(self, name: str, value: float = 1, help: str = "", **labels) -> None:
+        """Add ``value`` to the counter ``name`` with ``labels``"""
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+            if help:
+                self._help.setdefault(name, help)
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        """Record ``seconds`` spent in ``stage``"""
+        if not self.enabled:
+            return
+        with self._lock:
+            # Per-bucket counts, then the sum and count
+            series = self._stages.setdefault(stage, [0] * (len(STAGE_BUCKETS) + 2))
+            for i, bound in enumerate(STAGE_BUCKETS):
+                if seconds <= bound:
+                    series[i] += 1
+            series[-2] += seconds
+            series[-1] += 1
+
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + seconds * 1000
+
+    def stage(self, stage: str):
+        """Context manager timing a block as ``stage`` (no-op when disabled)"""
+        if not self.enabled:
+            return nullcontext()
+        return self._timed(stage)
+
+    @contextmanager
+    def _timed(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start)
+
+    @contextmanager
+    def track_request(self) -> Iterator[Optional[Dict[str, float]]]:
+        """
+        Collect the stage timings of one request; yields the dict to read them
+        from (None when disabled)
+        """
+        if not self.enabled:
+            yield None
+            return
+        token = _request_timings.set({})
+        try:
+            yield _request_timings.get()
+        finally:
+            _request_timings.reset(token)
+
+    def render(
+        self, sampled: Optional[Dict[str, Tuple[str, str, float]]] = None
+    ) -> str:
+        """
+        Everything in Prometheus text exposition format, plus ``sampled``
+        (name -> (type, help, value)) sampled by the caller at scrape time
+        """
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                metric = METRIC_PREFIX + name
+                lines.append(f"# HELP {metric} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {metric} counter")
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append(
+                        f"{metric}{_format_labels(labels)} {_format_value(value)}"
+                    )
+
+            metric = METRIC_PREFIX + "stage_seconds"
+            lines.append(f"# HELP {metric} Time spent per processing stage")
+            lines.append(f"# TYPE {metric} histogram")
+            for stage in sorted(self._stages):
+                series = self._stages[stage]
+                labels = (("stage", stage),)
+                for bound, count in zip(STAGE_BUCKETS, series):
+                    extra = [("le", _format_value(float(bound)))]
+                    lines.append(
+                        f"{metric}_bucket{_format_labels(labels, extra)} {count}"
+                    )
+                extra = [("le", "+Inf")]
+                lines.append(
+                    f"{metric}_bucket{_format_labels(labels, extra)} {series[-1]}"
+                )
+                lines.append(
+                    f"{metric}_sum{_format_labels(labels)} {_format_value(series[-2])}"
+                )
+                lines.append(f"{metric}_count{_format_labels(labels)} {series[-1]}")
+
+        for name, (kind, help, value) in sorted((sampled or {}).items()):
+            metric = METRIC_PREFIX + name
+            lines.append(f"# HELP {metric} {help}")
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def server_timing_header(timings: Dict[str, float]) -> str:
+    """Format stage timings (ms) as a Server-Timing header value"""
+    return ", ".join(f"{stage};dur={ms:.2f}" for stage, ms in timings.items())
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request: collects the request's stage
+    timings, sends them (plus the total) as a ``Server-Timing`` header and
+    counts requests per route template and status
+    """
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.metrics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        with self.metrics.track_request() as timings:
+
+            async def send_with_timing(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    # Every stage has finished by the time the headers go out
+                    timings["total"] = (time.perf_counter() - start) * 1000
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing_header(timings))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                # Route templates, not raw paths, keep the label set bounded
+                route = getattr(scope.get("route"), "path", "unmatched")
+                self.metrics.increment(
+                    "http_requests_total",
+                    help="HTTP requests handled",
+                    method=scope["method"],
+                    route=route,
+                    status=str(status),
+                )
+                self.metrics.observe_stage("request", time.perf_counter() - start)
+
+
+# Global metrics registry - METRICS_ENABLED=0 turns every hook into a no-op
+metrics = Metrics(enabled=os.environ.get("METRICS_ENABLED", "1") != "0")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Yarr! Parsing profiles - how to read a source's CSV without guessing every time
+A profile pins explicit dtypes (categorical hints become pandas categoricals,
+numbers get their exact type), extra NA markers and the parser engine. It's
+inferred once from a sample of the file, kept in the source catalog, and
+handed to every read of the file - full, chunked, partitioned or appended -
+so each path parses the same values. Full reads get the multi-threaded
+pyarrow engine when it's available.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow.csv  # noqa: F401 - the pandas "pyarrow" engine needs it
+except ImportError:  # pragma: no cover - the C engine is always there
+    HAS_PYARROW_CSV = False
+else:
+    HAS_PYARROW_CSV = True
+
+# Parser engines a profile may pick ("auto" = pyarrow when installed, else C)
+CSV_ENGINES = ("auto", "c", "pyarrow")
+
+# Rows read to infer a profile - enough to see the types, cheap on any file
+INFER_ROWS = 1000
+
+
+def resolve_engine(engine: str) -> str:
+    """The concrete parser engine for an engine setting"""
+    if engine not in CSV_ENGINES:
+        raise ValueError(
+            f"Arrr! Unknown CSV engine '{engine}'. Choose from: {list(CSV_ENGINES)}"
+        )
+    if engine == "auto":
+        return "pyarrow" if HAS_PYARROW_CSV else "c"
+    return engine
+
+
+@dataclass
+class ParsingProfile:
+    """
+    How to parse a data file: ``dtypes`` per column (columns left out are
+    inferred by pandas), ``na_values`` on top of pandas' defaults, and the
+    parser ``engine``
+    """
+
+    dtypes: Dict[str, str] = field(default_factory=dict)
+    na_values: List[str] = field(default_factory=list)
+    engine: str = "c"
+
+    def read_kwargs(
+        self, columns: Optional[Iterable[str]] = None, partial: bool = False
+    ) -> Dict[str, Any]:
+        """
+        ``pd.read_csv`` keyword arguments for reading ``columns`` (all when
+        None). ``partial`` reads - in chunks, or of a byte range whose last
+        record may still be half written - always get the C engine: pyarrow
+        can't read in chunks and rejects short records.
+        """
+        dtypes = self.dtypes
+        if columns is not None:
+            wanted = set(columns)
+            dtypes = {name: dtype for name, dtype in dtypes.items() if name in wanted}
+        kwargs: Dict[str, Any] = {}
+        if dtypes:
+            kwargs["dtype"] = dict(dtypes)
+        if self.na_values:
+            kwargs["na_values"] = list(self.na_values)
+        if self.engine != "c" and not partial:
+            kwargs["engine"] = self.engine
+        return kwargs
+
+    def relaxed(self) -> "ParsingProfile":
+        """
+        This profile without the types a value can fail to parse as - only
+        categoricals (which take any text) and the NA values stay
+        """
+        return ParsingProfile(
+            dtypes={
+                name: dtype
+                for name, dtype in self.dtypes.items()
+                if dtype == "category"
+            },
+            na_values=list(self.na_values),
+            engine=self.engine,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain JSON-ready form, for the catalog"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ParsingProfile":
+        """Rebuild a profile stored with ``to_dict``"""
+        return cls(
+            dtypes=dict(data.get("dtypes", {})),
+            na_values=list(data.get("na_values", [])),
+            engine=data.get("engine", "c"),
+        )
+
+
+def infer_parsing_profile(
+    sample: pd.DataFrame,
+    categorical_columns: Iterable[str],
+    engine: str = "auto",
+    na_values: Optional[List[str]] = None,
+) -> ParsingProfile:
+    """
+    Infer a profile from a sample of the file: text columns named in
+    ``categorical_columns`` become categoricals, integer and float columns
+    keep the exact type pandas found. Columns that were empty in the sample
+    (or of any other type) are left for pandas to infer.
+    """
+    categorical_columns = set(categorical_columns)
+    dtypes = {}
+    for column in sample.columns:
+        series = sample[column]
+        if series.isna().all():
+            continue
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            dtypes[str(column)] = "int64"
+        elif pd.api.types.is_float_dtype(series):
+            dtypes[str(column)] = "float64"
+        elif column in categorical_columns and pd.api.types.is_string_dtype(series):
+            # Numeric categoricals stay numeric - filters match "5", not "5.0"
+            dtypes[str(column)] = "category"
+    return ParsingProfile(
+        dtypes=dtypes, na_values=list(na_values or []), engine=resolve_engine(engine)
+    )
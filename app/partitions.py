@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Yarr! Split a source into partitions and count them on every core
+A CSV is cut into line-aligned byte ranges (never inside a quoted field) and a
+columnar copy into runs of row groups. Each partition is counted in a worker
+process and the partial TokenCounts merged in partition order, which gives
+exactly the same result as one serial pass.
+"""
+
+import io
+import os
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from . import columnar
+from .parsing import ParsingProfile
+from .tech_index import CategoricalEncoding
+from .token_counting import TokenCounts, tokenize_series
+
+# Partitions smaller than this cost more in process overhead than they save
+MIN_PARTITION_BYTES = 8 * 1024 * 1024
+
+# How much of the CSV is scanned at a time while looking for record boundaries
+SCAN_BLOCK_BYTES = 4 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CountTask:
+    """What to count in every partition: a multi-value column, optionally filtered"""
+
+    column: str
+    filters: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()
+
+    @classmethod
+    def create(
+        cls, column: str, filters: Optional[Dict[str, List[str]]] = None
+    ) -> "CountTask":
+        """Build a (picklable, hashable) task from a filters dict"""
+        return cls(
+            column=column,
+            filters=tuple(
+                (name, tuple(values)) for name, values in (filters or {}).items()
+            ),
+        )
+
+    @property
+    def columns(self) -> List[str]:
+        """Every raw column a partition has to read"""
+        return list(dict.fromkeys([self.column] + [name for name, _ in self.filters]))
+
+    def count(self, frame: pd.DataFrame, tokens=None) -> TokenCounts:
+        """Count one partition (``tokens`` may be given pre-tokenized)"""
+        row_mask = None
+        for name, values in self.filters:
+            mask = CategoricalEncoding.from_series(frame[name]).mask(list(values))
+            row_mask = mask if row_mask is None else row_mask & mask
+        if tokens is None:
+            tokens = tokenize_series(frame[self.column])
+        return tokens.counts(row_mask)
+
+
+def partition_count(size: int, max_partitions: int, min_partition_bytes: int) -> int:
+    """How many partitions to cut ``size`` bytes into"""
+    return max(1, min(max_partitions, size // max(min_partition_bytes, 1)))
+
+
+def next_record_starts(path: str, targets: Sequence[int]) -> List[Optional[int]]:
+    """
+    For each target offset (in sorted order), the offset of the first CSV
+    record starting after it - None for targets past the last record start.
+    Quote parity is tracked from the start of the file, so a newline inside a
+    quoted field never counts as a boundary (escaped quotes come in pairs).
+    """
+    starts = []
+    targets = sorted(targets)
+    in_quotes = False
+    block_offset = 0
+
+    with open(path, "rb") as handle:
+        block = handle.read(SCAN_BLOCK_BYTES)
+        position = 0
+        while block and len(starts) < len(targets):
+            target = targets[len(starts)] - block_offset
+            if position < target:
+                # Not there yet - just keep the quote parity up to date
+                stop = min(target, len(block))
+                in_quotes ^= block.count(b'"', position, stop) % 2 == 1
+                position = stop
+            else:
+                newline = block.find(b"\n", position)
+                stop = len(block) if newline == -1 else newline + 1
+                in_quotes ^= block.count(b'"', position, stop) % 2 == 1
+                position = stop
+                if newline != -1 and not in_quotes:
+                    boundary = block_offset + position
+                    while (
+                        len(starts) < len(targets) and targets[len(starts)] <= boundary
+                    ):
+                        starts.append(boundary)
+
+            if position >= len(block):
+                block_offset += len(block)
+                block = handle.read(SCAN_BLOCK_BYTES)
+                position = 0
+
+    return starts + [None] * (len(targets) - len(starts))
+
+
+def record_boundaries(path: str, targets: Sequence[int]) -> List[int]:
+    """
+    Offsets of the first CSV record starting after each target offset
+    Targets that land in the same record share a boundary; the result is
+    sorted and free of duplicates (see ``next_record_starts``).
+    """
+    starts = next_record_starts(path, targets)
+    return sorted({start for start in starts if start is not None})
+
+
+def csv_byte_ranges(
+    path: str, partitions: int, data_start: int
+) -> List[Tuple[int, int]]:
+    """
+    Cut the records of a CSV (from ``data_start``, just past the header) into
+    up to ``partitions`` line-aligned byte ranges of roughly equal size
+    """
+    size = os.path.getsize(path)
+    step = (size - data_start) / partitions
+    targets = [int(data_start + step * i) for i in range(1, partitions)]
+    cuts = [data_start] + [
+        cut for cut in record_boundaries(path, targets) if data_start < cut < size
+    ]
+    return list(zip(cuts, cuts[1:] + [size]))
+
+
+def read_header(path: str) -> bytes:
+    """The raw header record of a CSV (empty if the file has no complete record)"""
+    boundaries = record_boundaries(path, [0])
+    if not boundaries:
+        return b""
+    with open(path, "rb") as handle:
+        return handle.read(boundaries[0])
+
+
+def last_record_end(data: bytes) -> int:
+    """
+    Length of the complete CSV records at the start of ``data`` (which must
+    begin at a record boundary): up to the last newline outside quotes
+    """
+    characters = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(characters == ord("\n"))
+    if not len(newlines):
+        return 0
+    quotes_before = np.cumsum(characters == ord('"'))[newlines]
+    closed = newlines[quotes_before % 2 == 0]
+    return int(closed[-1]) + 1 if len(closed) else 0
+
+
+def read_records(
+    header: bytes,
+    data: bytes,
+    columns: List[str],
+    profile: Optional[ParsingProfile] = None,
+) -> pd.DataFrame:
+    """
+    Parse header-less CSV records by putting the raw header back in front, so
+    short or ragged rows parse exactly as they would in the whole file - per
+    the file's parsing ``profile``, if it has one. Records that no longer fit
+    the profile's types get them inferred instead.
+    """
+    if profile is None:
+        return pd.read_csv(io.BytesIO(header + data), usecols=columns)
+    try:
+        return pd.read_csv(
+            io.BytesIO(header + data),
+            usecols=columns,
+            **profile.read_kwargs(columns, partial=True),
+        )
+    except (ValueError, TypeError):
+        relaxed = profile.relaxed()
+        return pd.read_csv(
+            io.BytesIO(header + data),
+            usecols=columns,
+            **relaxed.read_kwargs(columns, partial=True),
+        )
+
+
+def count_csv_range(
+    path: str,
+    start: int,
+    end: int,
+    header: bytes,
+    task: CountTask,
+    profile: Optional[ParsingProfile] = None,
+) -> TokenCounts:
+    """Worker: count the records in one byte range of a CSV"""
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        data = handle.read(end - start)
+    return task.count(read_records(header, data, task.columns, profile))
+
+
+def row_group_runs(path: Path, partitions: int) -> List[List[int]]:
+    """Split the row groups of a Parquet file into up to ``partitions`` runs"""
+    row_groups = np.arange(pq.ParquetFile(path).num_row_groups)
+    runs = np.array_split(row_groups, min(partitions, len(row_groups)))
+    return [run.tolist() for run in runs if len(run)]
+
+
+def count_row_groups(path: str, row_groups: List[int], task: CountTask) -> TokenCounts:
+    """Worker: count a run of row groups of a columnar copy"""
+    token_name = columnar.TOKEN_COLUMN_PREFIX + task.column
+    filter_columns = [name for name, _ in task.filters]
+    table = pq.ParquetFile(path).read_row_groups(
+        row_groups, columns=[token_name] + filter_columns
+    )
+    tokens = columnar.token_column_from_lists(table.column(token_name))
+    frame = table.select(filter_columns).to_pandas()
+    return task.count(frame, tokens)
+
+
+def count_partitions(
+    pool: Executor, func, partitions: Sequence[tuple], *args
+) -> TokenCounts:
+    """Run ``func(*partition, *args)`` for every partition and merge in order"""
+    futures = [pool.submit(func, *partition, *args) for partition in partitions]
+    return TokenCounts.merge([future.result() for future in futures])
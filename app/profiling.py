@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Yarr! Opt-in profiles of single real requests, for slow queries nobody can
+reproduce. With PROFILING_ENABLED=1, an analysis request carrying
+``X-Profile: 1`` (or ``?profile=1``) runs its analysis under cProfile; the
+profile lands in a bounded ring of files on disk, ready to list and download.
+With profiling off (the default) nothing here runs at all.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Default number of profiles kept on disk - the oldest get dropped first
+DEFAULT_MAX_PROFILES = 20
+
+# Profile ids are generated by us; anything else is not a profile
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]+-[0-9]+$")
+
+
+class ProfileStore:
+    """
+    A ring of cProfile captures in ``directory``: ``<id>.prof`` (pstats
+    format) plus ``<id>.json`` with what was profiled. Only one capture runs
+    at a time - a request arriving meanwhile simply goes unprofiled.
+    """
+
+    def __init__(self, directory: str, max_profiles: int = DEFAULT_MAX_PROFILES):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+        self._capture_lock = threading.Lock()
+        self._sequence = 0
+
+    def run(self, label: str, func: Callable, *args) -> Tuple[Any, Optional[str]]:
+        """
+        Call ``func(*args)`` under the profiler (in the calling thread) and
+        return its result with the new profile's id - or None if another
+        capture was already running
+        """
+        if not self._capture_lock.acquire(blocking=False):
+            return func(*args), None
+        try:
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            try:
+                result = profiler.runcall(func, *args)
+            finally:
+                duration = time.perf_counter() - start
+                profile_id = self._save(profiler, label, duration)
+            return result, profile_id
+        finally:
+            self._capture_lock.release()
+
+    def _save(self, profiler: cProfile.Profile, label: str, duration: float) -> str:
+        """Write a capture into the ring and drop the oldest beyond the limit"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._sequence += 1
+        profile_id = f"{time.time_ns()}-{self._sequence}"
+        profiler.dump_stats(str(self.directory / f"{profile_id}.prof"))
+        info = {
+            "id": profile_id,
+            "label": label,
+            "created": time.time(),
+            "duration_ms": duration * 1000,
+        }
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(info))
+
+        for stale in self.list()[self.max_profiles :]:
+            for suffix in (".prof", ".json"):
+                (self.directory / f"{stale['id']}{suffix}").unlink(missing_ok=True)
+        return profile_id
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Stored profiles, newest first"""
+        if not self.directory.exists():
+            return []
+        profiles = []
+        for path in self.directory.glob("*.json"):
+            try:
+                info = json.loads(path.read_text())
+                info["size_bytes"] = path.with_suffix(".prof").stat().st_size
+            except (OSError, ValueError):
+                continue  # Yarr! Dropped by another capture while we looked
+            profiles.append(info)
+        return sorted(profiles, key=lambda info: info["id"], reverse=True)
+
+    def path(self, profile_id: str) -> Path:
+        """The pstats file of a stored profile"""
+        path = self.directory / f"{profile_id}.prof"
+        if not PROFILE_ID_PATTERN.match(profile_id) or not path.exists():
+            raise FileNotFoundError(f"Shiver me timbers! No profile '{profile_id}'")
+        return path
+
+    def summary(self, profile_id: str, limit: int = 50) -> str:
+        """A stored profile as pstats text, by cumulative time"""
+        output = io.StringIO()
+        stats = pstats.Stats(str(self.path(profile_id)), stream=output)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
+
+
+# Global profile store - None (and zero cost) unless PROFILING_ENABLED=1
+profile_store = (
+    ProfileStore(
+        os.environ.get(
+            "PROFILING_DIR", os.path.join(tempfile.gettempdir(), "insights-profiles")
+        ),
+        max_profiles=int(
+            os.environ.get("PROFILING_MAX_PROFILES", str(DEFAULT_MAX_PROFILES))
+        ),
+    )
+    if os.environ.get("PROFILING_ENABLED", "0") == "1"
+    else None
+)
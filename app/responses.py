@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Yarr! Pre-serialized, pre-compressed response bodies
+Payloads that only change with the data files (schemas, the source list) get
+encoded to JSON once per version, compressed once per content coding, and
+served as-is to every poll - picking the variant the client's
+``Accept-Encoding`` allows. orjson and brotli are used when installed.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .metrics import metrics
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip is always there
+    brotli = None
+
+# Bodies smaller than this go out uncompressed - the headers would cost more
+MIN_COMPRESS_BYTES = 512
+
+# Content codings we can produce, in order of preference
+PREFERRED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize NumPy scalars and friends as their plain Python value"""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Arrr! Cannot serialize {type(value).__name__} as JSON")
+
+
+def encode_json(content: Any) -> bytes:
+    """Compact UTF-8 JSON - through orjson when it's aboard"""
+    if orjson is not None:
+        return orjson.dumps(
+            content, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(
+        content, default=_json_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    The content coding to answer ``Accept-Encoding`` with (None = identity):
+    our most preferred coding the client accepts with a non-zero q-value
+    """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for coding in PREFERRED_ENCODINGS:
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+@dataclass(frozen=True)
+class EncodedPayload:
+    """A JSON body with its compressed variants and a strong ETag"""
+
+    body: bytes
+    variants: Dict[str, bytes]
+    etag: str
+
+    @classmethod
+    def from_content(cls, content: Any) -> "EncodedPayload":
+        """Encode ``content`` and compress it with every coding worth using"""
+        body = encode_json(content)
+        variants = {}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            variants["gzip"] = gzip.compress(body, compresslevel=6, mtime=0)
+            if brotli is not None:
+                variants["br"] = brotli.compress(body)
+        return cls(
+            body=body,
+            variants=variants,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        )
+
+    def variant(self, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """The body to send for ``Accept-Encoding``, and its content coding"""
+        coding = negotiate_encoding(accept_encoding)
+        if coding not in self.variants:
+            # Too small to be worth compressing, or no coding acceptable
+            return self.body, None
+        return self.variants[coding], coding
+
+
+class PayloadCache:
+    """
+    Encoded payloads by key, each rebuilt only when its ``version`` changes
+    (e.g. a data file fingerprint). Thread-safe; one version per key.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Hashable, Tuple[Hashable, EncodedPayload]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def peek(self, key: Hashable, version: Hashable) -> Optional[EncodedPayload]:
+        """The payload for ``key`` if it's at ``version`` (counted as a hit), else None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def get(
+        self, key: Hashable, version: Hashable, build: Callable[[], Any]
+    ) -> EncodedPayload:
+        """The payload for ``key`` at ``version``, encoding ``build()`` if needed"""
+        payload = self.peek(key, version)
+        if payload is not None:
+            return payload
+
+        content = build()
+        with metrics.stage("serialize"):
+            payload = EncodedPayload.from_content(content)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (version, payload)
+        return payload
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
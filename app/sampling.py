@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Yarr! Approximate top-N counts from a row sample, for when close enough is
+good enough and seconds are not. A columnar copy is sampled by whole row
+groups, a CSV by byte blocks spread evenly over the file - each block synced
+to a record boundary on its own, so only the sampled bytes get read. The
+sampled rows are tokenized once and kept per file version, so every later
+question about the column is answered from the sample alone. Counts are
+scaled up to the whole file and come with per-item error bounds, estimated
+from the spread between the sampled row groups or blocks (rows within one of
+them tend to be alike, so they can't be treated as independent draws).
+"""
+
+import csv
+import io
+import itertools
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from scipy import stats
+
+from . import columnar, partitions
+from .parsing import ParsingProfile
+from .token_counting import TokenColumn, TokenCounts, tokenize_series
+
+# Default number of rows to sample per source and column
+DEFAULT_SAMPLE_ROWS = 20_000
+
+# Size of each byte block read from a CSV - many small blocks spread over the
+# file keep the sample close to uniform even when the rows are ordered
+SAMPLE_BLOCK_BYTES = 256 * 1024
+
+# Rows parsed from the start of a CSV to estimate the bytes per row
+ROW_SIZE_PROBE_BYTES = 64 * 1024
+
+# Fewest row groups or blocks a sample is drawn from - the spread between them
+# is what the error bounds are estimated from
+MIN_SAMPLE_CLUSTERS = 4
+
+# Records that must parse whole (with the header's field count) after a newline
+# before a block trusts it to be a record boundary
+RESYNC_RECORDS = 4
+
+# Confidence level of the two-sided error bounds
+CONFIDENCE = 0.95
+
+# Samples are drawn with a fixed seed - the same file gives the same answer
+SAMPLE_SEED = 0
+
+
+@dataclass
+class TokenSample:
+    """
+    A tokenized sample of one multi-value column and the number of rows it
+    stands for. ``cluster_rows`` holds the row count of each row group or
+    block the sample was drawn from, in order. ``exact`` samples hold every
+    row, so their bounds are zero.
+    """
+
+    tokens: TokenColumn
+    population_rows: int
+    exact: bool = False
+    cluster_rows: Optional[List[int]] = None
+
+    @property
+    def sample_fraction(self) -> float:
+        """Share of the file's rows in the sample"""
+        if self.exact or self.population_rows <= 0:
+            return 1.0
+        return min(1.0, self.tokens.n_rows / self.population_rows)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the sampled rows"""
+        return self.tokens.nbytes
+
+    def _cluster_counts(self, labels: List[str]) -> np.ndarray:
+        """Per-cluster counts (clusters x labels) of the given tokens"""
+        clusters = len(self.cluster_rows)
+        vocabulary = {
+            str(token): code for code, token in enumerate(self.tokens.vocabulary)
+        }
+        codes = np.array([vocabulary[label] for label in labels], dtype=np.int64)
+        row_cluster = np.repeat(np.arange(clusters), self.cluster_rows)
+        token_cluster = np.repeat(row_cluster, self.tokens.row_lengths())
+        size = len(self.tokens.vocabulary)
+        counts = np.bincount(
+            token_cluster * size + self.tokens.codes, minlength=clusters * size
+        )
+        return counts.reshape(clusters, size)[:, codes]
+
+    def top(self, top_n: int) -> Dict[str, Any]:
+        """
+        Estimated top N tokens in the DataManager analysis result format, plus
+        ``error_bounds`` (95% half-widths, in rows), the sample fraction and
+        the confidence level. Counts are ratio estimates over the sampled row
+        groups or blocks; their variance comes from how much the clusters
+        differ, with a Student t critical value for the number of clusters and
+        a finite-population correction, so bounds shrink to 0 as the sample
+        approaches the whole file. A sample without clusters is treated as
+        rows drawn independently.
+        """
+        result = self.tokens.counts().top(top_n)
+        n = self.tokens.n_rows
+        fraction = self.sample_fraction
+        correction = max(0.0, 1 - fraction)
+        if self.exact or n == 0:
+            bounds = [0] * len(result["values"])
+        elif self.cluster_rows is not None and len(self.cluster_rows) > 1:
+            clusters = len(self.cluster_rows)
+            rows = np.asarray(self.cluster_rows, dtype=float)[:, None]
+            counts = self._cluster_counts(result["labels"])
+            ratios = counts.sum(axis=0) / n
+            spread = ((counts - ratios * rows) ** 2).sum(axis=0) / (clusters - 1)
+            variance = spread * correction / (clusters * (n / clusters) ** 2)
+            critical = stats.t.ppf(0.5 + CONFIDENCE / 2, clusters - 1)
+            bounds = np.ceil(critical * np.sqrt(variance) * self.population_rows)
+            bounds = bounds.astype(np.int64).tolist()
+        else:
+            shares = np.asarray(result["values"], dtype=float) / n
+            variance = shares * (1 - shares) / n * correction
+            critical = stats.norm.ppf(0.5 + CONFIDENCE / 2)
+            bounds = np.ceil(critical * np.sqrt(variance) * self.population_rows)
+            bounds = bounds.astype(np.int64).tolist()
+
+        scale = 1.0 if self.exact or n == 0 else self.population_rows / n
+        result["values"] = [int(round(value * scale)) for value in result["values"]]
+        result["total_responses"] = int(round(result["total_responses"] * scale))
+        result.update(
+            error_bounds=bounds,
+            sample_fraction=fraction,
+            sampled_rows=n,
+            confidence=CONFIDENCE,
+        )
+        return result
+
+
+def exact_top(counts: TokenCounts, top_n: int) -> Dict[str, Any]:
+    """Exact counts in the approximate result format - zero bounds, everything sampled"""
+    result = counts.top(top_n)
+    result.update(
+        error_bounds=[0] * len(result["values"]),
+        sample_fraction=1.0,
+        sampled_rows=None,
+        confidence=CONFIDENCE,
+    )
+    return result
+
+
+def sample_row_groups(
+    path: Path, column: str, target_rows: int, seed: int = SAMPLE_SEED
+) -> TokenSample:
+    """
+    Sample whole row groups of a columnar copy, in random order, until at
+    least ``target_rows`` rows from at least ``MIN_SAMPLE_CLUSTERS`` groups
+    are in hand. The row count is exact here.
+    """
+    parquet = pq.ParquetFile(path)
+    metadata = parquet.metadata
+    order = np.random.default_rng(seed).permutation(metadata.num_row_groups)
+
+    chosen, rows = [], 0
+    for row_group in order:
+        if rows >= target_rows and len(chosen) >= MIN_SAMPLE_CLUSTERS:
+            break
+        chosen.append(int(row_group))
+        rows += metadata.row_group(int(row_group)).num_rows
+    chosen.sort()
+
+    token_name = columnar.TOKEN_COLUMN_PREFIX + column
+    table = parquet.read_row_groups(chosen, columns=[token_name])
+    return TokenSample(
+        tokens=columnar.token_column_from_lists(table.column(token_name)),
+        population_rows=metadata.num_rows,
+        exact=len(chosen) == metadata.num_row_groups,
+        cluster_rows=[metadata.row_group(group).num_rows for group in chosen],
+    )
+
+
+def _starts_whole_records(data: bytes, fields: int) -> bool:
+    """
+    Whether ``data`` begins with ``RESYNC_RECORDS`` well-formed records of
+    ``fields`` fields each - a newline inside a quoted field almost never
+    passes, since what follows it parses into the wrong number of fields
+    """
+    reader = csv.reader(
+        io.StringIO(data.decode("utf-8", errors="replace"), newline=""), strict=True
+    )
+    try:
+        records = list(itertools.islice(reader, RESYNC_RECORDS))
+    except csv.Error:
+        return False
+    return len(records) == RESYNC_RECORDS and all(
+        len(record) == fields for record in records
+    )
+
+
+def sync_block(data: bytes, fields: int) -> Optional[Tuple[int, int]]:
+    """
+    The whole records inside a raw byte block, as a ``(start, end)`` slice:
+    from just past the first newline that starts well-formed records to the
+    end of the last complete record. None if no boundary can be trusted.
+    """
+    newline = data.find(b"\n")
+    while newline != -1:
+        start = newline + 1
+        if _starts_whole_records(data[start:], fields):
+            end = start + partitions.last_record_end(data[start:])
+            return (start, end) if end > start else None
+        newline = data.find(b"\n", start)
+    return None
+
+
+def sample_blocks(
+    path: str, data_start: int, blocks: int, block_bytes: int, seed: int = SAMPLE_SEED
+) -> List[Tuple[int, bytes]]:
+    """
+    Whole records read from about ``block_bytes`` at a random spot in each of
+    ``blocks`` equal strata of the records after ``data_start`` (the header
+    ends there), as ``(offset, data)`` pairs. Each block finds its own first
+    record boundary, so nothing outside the blocks is read.
+    """
+    size = os.path.getsize(path)
+    stratum = (size - data_start) / blocks
+    rng = np.random.default_rng(seed)
+    sampled = []
+    with open(path, "rb") as handle:
+        header = handle.read(data_start)
+        fields = len(next(csv.reader([header.decode("utf-8", errors="replace")])))
+        for i in range(blocks):
+            start = data_start + stratum * i + rng.uniform(0, stratum - block_bytes)
+            # Yarr! Read from the byte before, so a block starting right at a
+            # record boundary finds the newline ending the record before it
+            offset = max(data_start, int(start)) - 1
+            handle.seek(offset)
+            data = handle.read(block_bytes + 1)
+            synced = sync_block(data, fields)
+            if synced is not None:
+                sampled.append((offset + synced[0], data[synced[0] : synced[1]]))
+    return sampled
+
+
+def sample_block_ranges(
+    path: str, data_start: int, blocks: int, block_bytes: int, seed: int = SAMPLE_SEED
+) -> List[Tuple[int, int]]:
+    """The byte ranges ``sample_blocks`` reads records from"""
+    return [
+        (offset, offset + len(data))
+        for offset, data in sample_blocks(path, data_start, blocks, block_bytes, seed)
+    ]
+
+
+def sample_csv(
+    path: str,
+    column: str,
+    target_rows: int,
+    population_rows: Optional[int] = None,
+    block_bytes: int = SAMPLE_BLOCK_BYTES,
+    seed: int = SAMPLE_SEED,
+    profile: Optional[ParsingProfile] = None,
+) -> Optional[TokenSample]:
+    """
+    Sample a plain CSV by byte blocks, reading roughly ``target_rows`` rows
+    (parsed per the file's parsing ``profile``, if given). Without a known
+    ``population_rows`` the row count is estimated from the sampled bytes
+    per row. Returns None when the file is too small for
+    sampling to save anything - count it exactly instead.
+    """
+    header = partitions.read_header(path)
+    if not header:
+        return None
+    size = os.path.getsize(path)
+    data_bytes = size - len(header)
+
+    probe_end = partitions.next_record_starts(
+        path, [len(header) + ROW_SIZE_PROBE_BYTES - 1]
+    )[0]
+    with open(path, "rb") as handle:
+        handle.seek(len(header))
+        probe = handle.read((probe_end or size) - len(header))
+    probe_rows = (
+        len(partitions.read_records(header, probe, [column], profile)) if probe else 0
+    )
+    if probe_rows == 0:
+        return None
+
+    row_bytes = len(probe) / probe_rows
+    blocks = max(MIN_SAMPLE_CLUSTERS, math.ceil(target_rows * row_bytes / block_bytes))
+    if blocks * block_bytes * 2 >= data_bytes:
+        return None
+
+    sampled = sample_blocks(path, len(header), blocks, block_bytes, seed)
+    if len(sampled) < 2:
+        return None
+    values = [
+        partitions.read_records(header, data, [column], profile)[column]
+        for _, data in sampled
+    ]
+
+    tokens = tokenize_series(pd.concat(values, ignore_index=True))
+    if population_rows is None:
+        sampled_bytes = sum(len(data) for _, data in sampled)
+        population_rows = int(round(tokens.n_rows * data_bytes / sampled_bytes))
+    return TokenSample(
+        tokens=tokens,
+        population_rows=max(population_rows, tokens.n_rows),
+        cluster_rows=[len(block) for block in values],
+    )
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Yarr! Reading data source files - from plain directories or straight out of zip archives
+A DataSource with an ``archive_path`` keeps its CSVs inside the zip: its
+``file_path`` and ``schema_file`` are member names, read through streaming
+decompression without ever extracting to disk.
+"""
+
+import functools
+import os
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from . import columnar, token_store
+from .cache import file_fingerprint
+
+
+def list_archive_csvs(archive_path: Path) -> List[Tuple[str, int]]:
+    """
+    CSV members of a zip archive with their uncompressed sizes
+    Read from the central directory alone - no member is decompressed.
+    """
+    with zipfile.ZipFile(archive_path) as archive:
+        return [
+            (info.filename, info.file_size)
+            for info in archive.infolist()
+            if not info.is_dir()
+            and info.filename.lower().endswith(".csv")
+            and not info.filename.startswith("__MACOSX/")
+            and not Path(info.filename).name.startswith(".")
+        ]
+
+
+@functools.lru_cache(maxsize=32)
+def _archive_members(archive_path: str, fingerprint: Tuple[int, int]) -> frozenset:
+    """Names of all members in a zip archive (cached per archive version)"""
+    with zipfile.ZipFile(archive_path) as archive:
+        return frozenset(archive.namelist())
+
+
+def file_exists(source, path: Optional[str]) -> bool:
+    """Whether ``path`` (a data or schema file of ``source``) can be read"""
+    if not path:
+        return False
+    if source.archive_path is None:
+        return os.path.exists(path)
+    if not os.path.exists(source.archive_path):
+        return False
+    archive_path = str(source.archive_path)
+    return path in _archive_members(archive_path, file_fingerprint(archive_path))
+
+
+def source_fingerprint(source, path: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Fingerprint of a source file - of the whole archive for archived sources,
+    since any change to the zip may have changed the member.
+    """
+    if source.archive_path is not None:
+        return file_fingerprint(source.archive_path)
+    return file_fingerprint(path or source.file_path)
+
+
+@contextmanager
+def open_file(source, path: str) -> Iterator[IO[bytes]]:
+    """Open a data or schema file of ``source`` for streaming binary reads"""
+    if source.archive_path is None:
+        with open(path, "rb") as handle:
+            yield handle
+        return
+
+    with zipfile.ZipFile(source.archive_path) as archive:
+        with archive.open(path) as handle:
+            yield handle
+
+
+def read_csv(source, path: str, **kwargs) -> pd.DataFrame:
+    """``pd.read_csv`` on a data or schema file of ``source``"""
+    if source.archive_path is None:
+        return pd.read_csv(path, **kwargs)
+    with open_file(source, path) as handle:
+        return pd.read_csv(handle, **kwargs)
+
+
+def iter_csv_chunks(
+    source, path: str, chunksize: int, **kwargs
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a data or schema file of ``source`` as DataFrames of at most
+    ``chunksize`` rows - the file (or archive member) stays open until exhausted
+    """
+    with open_file(source, path) as handle:
+        with pd.read_csv(handle, chunksize=chunksize, **kwargs) as reader:
+            yield from reader
+
+
+def file_size(source, path: str) -> int:
+    """Size in bytes of a source file - uncompressed size for archive members"""
+    if source.archive_path is None:
+        return os.path.getsize(path)
+    with zipfile.ZipFile(source.archive_path) as archive:
+        return archive.getinfo(path).file_size
+
+
+def columnar_copy_path(source) -> Path:
+    """
+    Where the columnar copy of a source's data file lives - beside the CSV,
+    or beside the archive for archived sources
+    """
+    if source.archive_path is None:
+        return columnar.columnar_path(source.file_path)
+    archive = Path(source.archive_path)
+    member = Path(source.file_path).name
+    return archive.with_name(f".{archive.name}.{member}.parquet")
+
+
+def token_store_path(source) -> Path:
+    """
+    Where the memory-mapped token store of a source lives - beside the CSV,
+    or beside the archive for archived sources
+    """
+    if source.archive_path is None:
+        return token_store.store_path(source.file_path)
+    archive = Path(source.archive_path)
+    member = Path(source.file_path).name
+    return archive.with_name(f".{archive.name}.{member}.tokens")
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Yarr! Precomputed respondent x technology index for slicing the survey
+Each primary column becomes a sparse matrix (one row per respondent, one
+column per technology) and each categorical column gets dictionary-encoded,
+so filtered counts be a masked sum instead of a fresh parse of the CSV!
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from .compact import array_nbytes
+from .token_counting import TokenColumn, TokenCounts
+
+
+@dataclass
+class CategoricalEncoding:
+    """
+    A dictionary-encoded categorical column: ``categories[codes[i]]`` is the
+    value of row ``i`` and missing values have code -1.
+    """
+
+    codes: np.ndarray
+    categories: np.ndarray
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "CategoricalEncoding":
+        """Encode a column, keeping categories as the strings clients filter by"""
+        if pd.api.types.is_float_dtype(series) and (series.dropna() % 1 == 0).all():
+            # Whole numbers with gaps parse as floats - match "5", not "5.0"
+            series = series.astype("Int64")
+        codes, categories = pd.factorize(series)
+        return cls(
+            codes=codes.astype(np.int32),
+            categories=np.array([str(value) for value in categories], dtype=object),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the codes and categories"""
+        return self.codes.nbytes + array_nbytes(self.categories)
+
+    def mask(self, values: List[str]) -> np.ndarray:
+        """Rows whose value equals any of ``values`` exactly"""
+        wanted = np.flatnonzero(np.isin(self.categories, values))
+        return np.isin(self.codes, wanted)
+
+
+class TechnologyIndex:
+    """
+    Respondent x technology matrix for one multi-value column plus the
+    dictionary-encoded categorical columns of the same source.
+
+    Matrix entries count occurrences of a technology in a respondent's answer
+    (so duplicates count twice, like the unfiltered analysis). Technologies are
+    indexed in first-appearance order.
+    """
+
+    def __init__(
+        self, tokens: TokenColumn, categoricals: Dict[str, CategoricalEncoding]
+    ):
+        self.tokens = tokens
+        self.categoricals = categoricals
+        self._matrix = None
+
+    @property
+    def matrix(self) -> sp.csr_matrix:
+        """
+        The respondent x technology matrix, built on first use - only
+        co-occurrence needs it, filtered counts work on the token codes
+        """
+        if self._matrix is None:
+            tokens = self.tokens
+            self._matrix = sp.csr_matrix(
+                (
+                    np.ones(len(tokens.codes), dtype=np.int32),
+                    tokens.codes,
+                    tokens.offsets,
+                ),
+                shape=(tokens.n_rows, len(tokens.vocabulary)),
+            )
+        return self._matrix
+
+    @property
+    def n_rows(self) -> int:
+        """Number of respondents in the index"""
+        return self.tokens.n_rows
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the token column and the sparse matrix (once built)"""
+        matrix = self._matrix
+        if matrix is None:
+            return self.tokens.nbytes
+        return (
+            self.tokens.nbytes
+            + matrix.data.nbytes
+            + matrix.indices.nbytes
+            + matrix.indptr.nbytes
+        )
+
+    def row_mask(self, filters: Dict[str, List[str]]) -> np.ndarray:
+        """
+        Rows matching every filter (AND across columns, OR across the values
+        given for one column). Raises ValueError for unindexed filter columns.
+        """
+        mask = np.ones(self.n_rows, dtype=bool)
+        for column, values in filters.items():
+            if column not in self.categoricals:
+                raise ValueError(
+                    f"Arrr! Cannot filter on '{column}'. Filterable columns: {sorted(self.categoricals)}"
+                )
+            mask &= self.categoricals[column].mask(values)
+        return mask
+
+    def counts(self, filters: Dict[str, List[str]]) -> TokenCounts:
+        """
+        Technology counts over the respondents matching ``filters`` - ordered
+        by first appearance among those respondents, so ties break exactly as
+        in the streaming and parallel paths
+        """
+        # Yarr! Straight over the token codes - which may be a read-only mapping
+        return self.tokens.counts(self.row_mask(filters))
+
+
+class CoOccurrence:
+    """
+    Yarr! "Developers who use X also use Y" counts between two primary columns
+    (or within one), computed with one sparse matrix product.
+
+    Only respondents who answered both columns are counted. ``lift`` compares
+    how often a pair occurs together against what independence would predict:
+    ``P(a and b) / (P(a) * P(b))``.
+    """
+
+    def __init__(self, left: TechnologyIndex, right: Optional[TechnologyIndex] = None):
+        self.same_column = right is None
+        right = left if right is None else right
+        answered = left.tokens.valid & right.tokens.valid
+        # Presence matrices - a technology counts once per respondent here
+        left_matrix = (left.matrix[answered] > 0).astype(np.int32)
+        right_matrix = (
+            left_matrix
+            if self.same_column
+            else (right.matrix[answered] > 0).astype(np.int32)
+        )
+
+        pairs = (left_matrix.T @ right_matrix).tocoo()
+        if self.same_column:
+            # Yarr! Each unordered pair once, and no technology paired with itself
+            pairs = sp.triu(pairs, k=1).tocoo()
+
+        self.total_respondents = int(np.count_nonzero(answered))
+        self.left_labels = np.asarray(left.tokens.vocabulary, dtype=object)
+        self.right_labels = np.asarray(right.tokens.vocabulary, dtype=object)
+        self.left_counts = np.asarray(left_matrix.sum(axis=0)).ravel()
+        self.right_counts = np.asarray(right_matrix.sum(axis=0)).ravel()
+        self.rows = pairs.row
+        self.cols = pairs.col
+        self.counts = pairs.data.astype(np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the stored pairs and per-technology counts"""
+        return (
+            self.rows.nbytes
+            + self.cols.nbytes
+            + self.counts.nbytes
+            + self.left_counts.nbytes
+            + self.right_counts.nbytes
+        )
+
+    def lift(self) -> np.ndarray:
+        """Lift of every stored pair"""
+        expected = (
+            self.left_counts[self.rows].astype(np.float64)
+            * self.right_counts[self.cols]
+        )
+        return self.counts * self.total_respondents / expected
+
+    def top(self, top_k: int, sort_by: str = "count") -> List[Dict[str, Any]]:
+        """Top K pairs by co-occurrence ``count`` or by ``lift``"""
+        if sort_by not in ("count", "lift"):
+            raise ValueError(f"Arrr! Cannot sort co-occurrence by '{sort_by}'")
+
+        lift = self.lift()
+        primary = self.counts if sort_by == "count" else lift
+        # Ties broken by the other measure, then by first appearance of the pair
+        secondary = lift if sort_by == "count" else self.counts
+        order = np.lexsort((self.cols, self.rows, -secondary, -primary))[:top_k]
+        return [
+            {
+                "technology": str(self.left_labels[self.rows[i]]),
+                "other_technology": str(self.right_labels[self.cols[i]]),
+                "count": int(self.counts[i]),
+                "support": float(self.counts[i] / self.total_respondents),
+                "lift": float(lift[i]),
+            }
+            for i in order
+        ]
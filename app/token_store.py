@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Yarr! Tokenized columns as flat array files, memory-mapped read-only
+The codes, offsets and validity of a tokenized multi-value column (and the
+codes of an encoded categorical column) are saved as ``.npy`` files in a
+hidden directory beside the data file, with a small JSON manifest holding the
+vocabulary. Every worker process maps the same files, so the operating system
+keeps a single copy of the arrays in its page cache however many uvicorn
+workers the ship runs - analyses read the mapped buffers without copying.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .tech_index import CategoricalEncoding
+from .token_counting import TokenColumn
+
+# Bumped whenever the layout changes - older files are simply rewritten
+STORE_VERSION = 1
+
+
+def store_path(csv_path: str) -> Path:
+    """Where the token store of a CSV lives - a hidden directory beside it"""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f".{csv_path.name}.tokens")
+
+
+def _entry_name(kind: str, column: str) -> str:
+    """File-name-safe stem for a stored column (column names can be anything)"""
+    digest = hashlib.sha256(column.encode("utf-8")).hexdigest()[:16]
+    return f"{kind}-{digest}"
+
+
+def _fingerprint_token(fingerprint: Tuple[int, int]) -> str:
+    """A file version as it appears in array file names"""
+    return f"{fingerprint[0]:x}-{fingerprint[1]:x}"
+
+
+def _read_manifest(
+    directory: Path, entry: str, column: str, fingerprint: Tuple[int, int]
+) -> Optional[dict]:
+    """The manifest of a stored column, if it matches this file version"""
+    try:
+        manifest = json.loads((directory / f"{entry}.json").read_text("utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        manifest.get("version") != STORE_VERSION
+        or manifest.get("column") != column
+        or manifest.get("fingerprint") != _fingerprint_token(fingerprint)
+    ):
+        return None
+    return manifest
+
+
+def _map_arrays(directory: Path, manifest: dict) -> Optional[Dict[str, np.ndarray]]:
+    """Memory-map the arrays a manifest names (None if any went missing)"""
+    try:
+        return {
+            name: np.load(directory / file_name, mmap_mode="r")
+            for name, file_name in manifest["arrays"].items()
+        }
+    except (OSError, ValueError):
+        return None
+
+
+def _write_entry(
+    directory: Path,
+    entry: str,
+    column: str,
+    fingerprint: Tuple[int, int],
+    arrays: Dict[str, np.ndarray],
+    **extra,
+):
+    """
+    Write a column's arrays under version-tagged names, then its manifest -
+    each file atomically, so a reader sees either the old or the new version.
+    Arrays of older versions are removed (mappings of them stay valid).
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    version = _fingerprint_token(fingerprint)
+    # Yarr! Unique per writer - threads of one process mustn't share a temp file
+    suffix = f".{uuid.uuid4().hex}.tmp"
+    file_names = {}
+    for name, array in arrays.items():
+        file_name = f"{entry}.{version}.{name}.npy"
+        temp_path = directory / (file_name + suffix)
+        with open(temp_path, "wb") as handle:
+            np.save(handle, np.ascontiguousarray(array), allow_pickle=False)
+        os.replace(temp_path, directory / file_name)
+        file_names[name] = file_name
+
+    manifest = {
+        "version": STORE_VERSION,
+        "column": column,
+        "fingerprint": version,
+        "arrays": file_names,
+        **extra,
+    }
+    temp_path = directory / f"{entry}.json{suffix}"
+    temp_path.write_text(json.dumps(manifest), encoding="utf-8")
+    os.replace(temp_path, directory / f"{entry}.json")
+
+    for stale in directory.glob(f"{entry}.*.npy"):
+        if stale.name not in file_names.values():
+            stale.unlink(missing_ok=True)
+
+
+def read_token_column(
+    directory: Path, column: str, fingerprint: Tuple[int, int]
+) -> Optional[TokenColumn]:
+    """A stored token column of this file version, mapped read-only - or None"""
+    entry = _entry_name("tokens", column)
+    manifest = _read_manifest(directory, entry, column, fingerprint)
+    arrays = None if manifest is None else _map_arrays(directory, manifest)
+    if arrays is None:
+        return None
+    return TokenColumn(
+        vocabulary=np.array(manifest["vocabulary"], dtype=object),
+        codes=arrays["codes"],
+        offsets=arrays["offsets"],
+        valid=arrays["valid"],
+    )
+
+
+def write_token_column(
+    directory: Path, column: str, fingerprint: Tuple[int, int], tokens: TokenColumn
+):
+    """Store a token column for this file version"""
+    _write_entry(
+        directory,
+        _entry_name("tokens", column),
+        column,
+        fingerprint,
+        {"codes": tokens.codes, "offsets": tokens.offsets, "valid": tokens.valid},
+        vocabulary=[str(token) for token in tokens.vocabulary],
+    )
+
+
+def read_categorical(
+    directory: Path, column: str, fingerprint: Tuple[int, int]
+) -> Optional[CategoricalEncoding]:
+    """A stored categorical encoding of this file version, mapped read-only - or None"""
+    entry = _entry_name("categorical", column)
+    manifest = _read_manifest(directory, entry, column, fingerprint)
+    arrays = None if manifest is None else _map_arrays(directory, manifest)
+    if arrays is None:
+        return None
+    return CategoricalEncoding(
+        codes=arrays["codes"],
+        categories=np.array(manifest["categories"], dtype=object),
+    )
+
+
+def write_categorical(
+    directory: Path,
+    column: str,
+    fingerprint: Tuple[int, int],
+    encoding: CategoricalEncoding,
+):
+    """Store a categorical encoding for this file version"""
+    _write_entry(
+        directory,
+        _entry_name("categorical", column),
+        column,
+        fingerprint,
+        {"codes": encoding.codes},
+        categories=[str(value) for value in encoding.categories],
+    )
+
+
+def is_mapped(array: np.ndarray) -> bool:
+    """Whether an array is backed by a memory-mapped file"""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base if isinstance(array.base, np.ndarray) else None
+    return False
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Yarr! Technology trends across sources (e.g. one survey per year)
+Token labels get matched across sources regardless of case, Unicode width
+and spacing, and every source's counts are aligned onto one list of labels -
+as shares of that source's respondents, so surveys of different sizes compare.
+"""
+
+import unicodedata
+from typing import Any, Dict
+
+from .token_counting import TokenCounts
+
+
+def normalize_label(label: str) -> str:
+    """The key a technology label is matched on across sources"""
+    return " ".join(unicodedata.normalize("NFKC", label).split()).casefold()
+
+
+def align_token_counts(counts: Dict[str, TokenCounts], top_n: int) -> Dict[str, Any]:
+    """
+    Align per-source counts (in source order) on the ``top_n`` labels with the
+    highest summed share across sources. Labels are spelled as in the last
+    source that has them; sources lacking a label count zero for it.
+    """
+    per_source = {}
+    spelling = {}
+    for source, token_counts in counts.items():
+        totals = {}
+        for label, count in zip(token_counts.labels, token_counts.counts):
+            key = normalize_label(str(label))
+            totals[key] = totals.get(key, 0) + int(count)
+            spelling[key] = str(label)
+        per_source[source] = totals
+
+    def share(source: str, key: str) -> float:
+        total = counts[source].total_responses
+        return per_source[source].get(key, 0) / total if total else 0.0
+
+    # sorted() is stable, so ties keep first-appearance order
+    ranked = sorted(
+        spelling, key=lambda key: -sum(share(source, key) for source in counts)
+    )[:top_n]
+
+    return {
+        "labels": [spelling[key] for key in ranked],
+        "series": {
+            source: {
+                "values": [per_source[source].get(key, 0) for key in ranked],
+                "shares": [share(source, key) for key in ranked],
+                "total_responses": int(counts[source].total_responses),
+            }
+            for source in counts
+        },
+    }
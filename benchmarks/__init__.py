@@ -0,0 +1 @@
+# Yarr! Benchmarks and synthetic survey data for our treasure chest
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Yarr! Benchmark suite for the data and API layers
+Times DataManager discovery, load_data and analyze_technology_usage plus the
+FastAPI endpoints (through an in-process ASGI client) on synthetic surveys of
+several sizes, writes the timings as JSON, and compares two result files to
+flag regressions.
+
+Usage:
+    python -m benchmarks.bench run --sizes 10000,100000 --output results.json
+    python -m benchmarks.bench compare baseline.json results.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .synthetic_survey import SurveySpec, generate_survey
+
+SOURCE_DIR = "kaggle_so_2023_data"
+SOURCE_NAME = "stackoverflow_2023"
+COLUMN = "LanguageHaveWorkedWith"
+
+DEFAULT_SIZES = "10000,100000"
+DEFAULT_REPEATS = 5
+DEFAULT_TOLERANCE = 0.2
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """Median/min/mean of a list of timings in seconds"""
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "mean_s": statistics.fmean(timings),
+        "repeats": len(timings),
+    }
+
+
+def time_call(
+    func: Callable[[], Any],
+    repeats: int,
+    setup: Optional[Callable[[], Any]] = None,
+    warmup: bool = False,
+) -> Dict[str, float]:
+    """
+    Time ``func`` ``repeats`` times (``setup`` runs untimed before each call)
+    and summarize the timings in seconds. ``warmup`` makes one untimed call
+    first, so "warm" timings never include the cold build.
+    """
+    if warmup:
+        func()
+    timings = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def dataset(cache_dir: Path, spec: SurveySpec) -> Path:
+    """A data directory holding the survey for ``spec``, generated once"""
+    data_dir = cache_dir / spec.slug()
+    if not (data_dir / SOURCE_DIR).exists():
+        generate_survey(data_dir / SOURCE_DIR, spec)
+    return data_dir
+
+
+def data_benchmarks(data_dir: Path, repeats: int) -> Dict[str, Dict[str, float]]:
+    """DataManager benchmarks - every "cold" run starts from a fresh manager"""
+    from app.data_config import DataManager
+
+    results = {}
+    state = {}
+
+    def fresh(**kwargs):
+        state["manager"] = DataManager(str(data_dir), **kwargs)
+
+    results["discovery"] = time_call(
+        lambda: state["manager"].initialize(), repeats, setup=fresh
+    )
+
+    def fresh_csv():
+        fresh(columnar_cache=False)
+        state["manager"].initialize()
+
+    results["load_data_cold_csv"] = time_call(
+        lambda: state["manager"].load_data(SOURCE_NAME), repeats, setup=fresh_csv
+    )
+    results["load_data_cold_csv_one_column"] = time_call(
+        lambda: state["manager"].load_data(SOURCE_NAME, columns=[COLUMN]),
+        repeats,
+        setup=fresh_csv,
+    )
+    results["load_data_warm"] = time_call(
+        lambda: state["manager"].load_data(SOURCE_NAME), repeats, warmup=True
+    )
+    results["analyze_technology_usage_cold_csv"] = time_call(
+        lambda: state["manager"].analyze_technology_usage(SOURCE_NAME, COLUMN),
+        repeats,
+        setup=fresh_csv,
+    )
+
+    def fresh_columnar():
+        # The columnar copy on disk survives; only in-memory state starts cold
+        fresh()
+        state["manager"].initialize()
+
+    fresh_columnar()
+    state["manager"].analyze_technology_usage(SOURCE_NAME, COLUMN)
+    results["analyze_technology_usage_cold_columnar"] = time_call(
+        lambda: state["manager"].analyze_technology_usage(SOURCE_NAME, COLUMN),
+        repeats,
+        setup=fresh_columnar,
+    )
+    results["analyze_technology_usage_filtered_warm"] = time_call(
+        lambda: state["manager"].analyze_technology_usage_filtered(
+            SOURCE_NAME, COLUMN, {"Country": ["Germany"]}
+        ),
+        repeats,
+        warmup=True,
+    )
+    return results
+
+
+def api_benchmarks(data_dir: Path, repeats: int) -> Dict[str, Dict[str, float]]:
+    """
+    FastAPI endpoint benchmarks through an in-process ASGI client. "cold" runs
+    clear the result cache first; the DataManager's own caches stay warm.
+    """
+    import httpx
+
+    from app import main
+    from app.cache import ResultCache
+    from app.data_config import DataManager
+
+    main.data_manager = DataManager(str(data_dir))
+    main.data_manager.initialize()
+    requests = {
+        "technology_usage": ("GET", f"/api/analysis/technology-usage?column={COLUMN}"),
+        "technology_usage_filtered": (
+            "GET",
+            f"/api/analysis/technology-usage/filtered?column={COLUMN}&Country=Germany",
+        ),
+        "co_occurrence": (
+            "GET",
+            f"/api/analysis/co-occurrence?column={COLUMN}&top_k=20",
+        ),
+        "batch": ("POST", "/api/analysis/technology-usage/batch"),
+        "data_sources": ("GET", "/api/data-sources"),
+    }
+
+    async def run() -> Dict[str, Dict[str, float]]:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+
+            async def call(method, url):
+                response = await client.request(
+                    method, url, json={} if method == "POST" else None
+                )
+                response.raise_for_status()
+
+            async def timed(method, url, clear_results):
+                timings = []
+                for _ in range(repeats):
+                    if clear_results:
+                        main.result_cache = ResultCache(
+                            max_entries=main.result_cache.max_entries,
+                            ttl_seconds=main.result_cache.ttl_seconds,
+                        )
+                    start = time.perf_counter()
+                    await call(method, url)
+                    timings.append(time.perf_counter() - start)
+                return summarize(timings)
+
+            results = {}
+            for name, (method, url) in requests.items():
+                await call(method, url)  # build indexes and columnar copies first
+                results[f"api_{name}_cold"] = await timed(method, url, True)
+                results[f"api_{name}_cached"] = await timed(method, url, False)
+            return results
+
+    try:
+        return asyncio.run(run())
+    finally:
+        main.data_manager.shutdown()
+
+
+def run_suite(
+    sizes: List[int], repeats: int, cache_dir: Path, spec: SurveySpec
+) -> Dict[str, Any]:
+    """Run every benchmark at every size and return the machine-readable results"""
+    results = []
+    for rows in sizes:
+        sized = replace(spec, rows=rows)
+        data_dir = dataset(cache_dir, sized)
+        print(f"🏴‍☠️ Benchmarking {rows} rows...", file=sys.stderr)
+        timings = {
+            **data_benchmarks(data_dir, repeats),
+            **api_benchmarks(data_dir, repeats),
+        }
+        for name, timing in timings.items():
+            results.append({"name": name, "rows": rows, **timing})
+            print(
+                f"   {name:<45} {timing['median_s'] * 1000:10.2f} ms", file=sys.stderr
+            )
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "spec": {**spec.__dict__, "rows": sizes},
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float
+) -> List[Dict[str, Any]]:
+    """
+    Compare median timings of benchmarks present in both result sets.
+    ``status`` is "regression" when current is slower than baseline by more than
+    ``tolerance`` (a fraction), "improvement" when faster by more, else "same".
+    """
+    baseline_timings = {
+        (item["name"], item["rows"]): item["median_s"] for item in baseline["results"]
+    }
+    comparison = []
+    for item in current["results"]:
+        key = (item["name"], item["rows"])
+        if key not in baseline_timings:
+            continue
+        before, after = baseline_timings[key], item["median_s"]
+        ratio = after / before if before > 0 else float("inf")
+        if ratio > 1 + tolerance:
+            status = "regression"
+        elif ratio < 1 - tolerance:
+            status = "improvement"
+        else:
+            status = "same"
+        comparison.append(
+            {
+                "name": item["name"],
+                "rows": item["rows"],
+                "baseline_s": before,
+                "current_s": after,
+                "ratio": ratio,
+                "status": status,
+            }
+        )
+    return comparison
+
+
+def main(argv=None) -> int:
+    """Command line entry point - returns 1 when a comparison finds regressions"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmark suite")
+    run.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated rows")
+    run.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    run.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    run.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "survey-benchmarks",
+        help="Where generated datasets are kept between runs",
+    )
+    run.add_argument("--tech-columns", type=int, default=SurveySpec.tech_columns)
+    run.add_argument(
+        "--tokens-per-cell", type=float, default=SurveySpec.tokens_per_cell
+    )
+    run.add_argument("--vocabulary-size", type=int, default=SurveySpec.vocabulary_size)
+    run.add_argument("--skew", type=float, default=SurveySpec.skew)
+    run.add_argument("--compare", type=Path, help="Baseline results to compare against")
+    run.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+
+    compare = commands.add_parser("compare", help="Compare two result files")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("current", type=Path)
+    compare.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        spec = SurveySpec(
+            tech_columns=args.tech_columns,
+            tokens_per_cell=args.tokens_per_cell,
+            vocabulary_size=args.vocabulary_size,
+            skew=args.skew,
+        )
+        sizes = [int(size) for size in args.sizes.split(",")]
+        current = run_suite(sizes, args.repeats, args.cache_dir, spec)
+        args.output.write_text(json.dumps(current, indent=2))
+        print(f"✓ Results written to {args.output}", file=sys.stderr)
+        if args.compare is None:
+            return 0
+        baseline = json.loads(args.compare.read_text())
+    else:
+        baseline = json.loads(args.baseline.read_text())
+        current = json.loads(args.current.read_text())
+
+    comparison = compare_results(baseline, current, args.tolerance)
+    for item in comparison:
+        marker = {"regression": "⚠️", "improvement": "✓"}.get(item["status"], " ")
+        print(
+            f"{marker} {item['name']:<45} {item['rows']:>9} rows  "
+            f"{item['baseline_s'] * 1000:9.2f} ms -> {item['current_s'] * 1000:9.2f} ms"
+            f"  ({item['ratio']:.2f}x)"
+        )
+    regressions = [item for item in comparison if item["status"] == "regression"]
+    if regressions:
+        print(f"⚠️ {len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
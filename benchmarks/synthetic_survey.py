@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Yarr! Deterministic generator for Stack Overflow-shaped survey CSVs
+Same parameters and seed, same bytes - so benchmarks and tests can conjure
+survey treasure of any size without shipping the real (large) file.
+
+Usage:
+    python -m benchmarks.synthetic_survey data/ --rows 100000 --tech-columns 8
+"""
+
+import argparse
+import zipfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# Multi-value technology columns, in the order the real survey has them
+TECH_COLUMN_NAMES = [
+    "LanguageHaveWorkedWith",
+    "LanguageWantToWorkWith",
+    "DatabaseHaveWorkedWith",
+    "DatabaseWantToWorkWith",
+    "PlatformHaveWorkedWith",
+    "PlatformWantToWorkWith",
+    "WebframeHaveWorkedWith",
+    "WebframeWantToWorkWith",
+    "MiscTechHaveWorkedWith",
+    "MiscTechWantToWorkWith",
+    "ToolsTechHaveWorkedWith",
+    "ToolsTechWantToWorkWith",
+]
+
+# Real technology names for the head of every vocabulary
+TECH_NAMES = [
+    "JavaScript",
+    "HTML/CSS",
+    "Python",
+    "SQL",
+    "TypeScript",
+    "Bash/Shell (all shells)",
+    "Java",
+    "C#",
+    "C++",
+    "C",
+    "PHP",
+    "PowerShell",
+    "Go",
+    "Rust",
+    "Kotlin",
+    "Ruby",
+    "Lua",
+    "Dart",
+    "Assembly",
+    "Swift",
+]
+
+COUNTRIES = [
+    "United States of America",
+    "Germany",
+    "India",
+    "United Kingdom of Great Britain and Northern Ireland",
+    "Canada",
+    "France",
+    "Poland",
+    "Netherlands",
+    "Brazil",
+    "Finland",
+]
+
+ORG_SIZES = [
+    "Just me - I am a freelancer, sole proprietor, etc.",
+    "2 to 9 employees",
+    "10 to 19 employees",
+    "20 to 99 employees",
+    "100 to 499 employees",
+    "500 to 999 employees",
+    "1,000 to 4,999 employees",
+    "5,000 to 9,999 employees",
+    "10,000 or more employees",
+]
+
+AGES = [
+    "Under 18 years old",
+    "18-24 years old",
+    "25-34 years old",
+    "35-44 years old",
+    "45-54 years old",
+    "55-64 years old",
+    "65 years or older",
+]
+
+DATA_FILE_NAME = "survey_results_public.csv"
+SCHEMA_FILE_NAME = "survey_results_schema.csv"
+
+# Rows generated (and written) at a time - keeps memory flat for big files
+CHUNK_ROWS = 50_000
+
+
+@dataclass(frozen=True)
+class SurveySpec:
+    """
+    Shape of a synthetic survey: ``tokens_per_cell`` is the mean number of
+    technologies per answer (1 to ``max_tokens_per_cell``), ``skew`` the Zipf
+    exponent of technology popularity (0 = uniform) and ``missing_rate`` the
+    share of blank technology answers.
+    """
+
+    rows: int = 10_000
+    tech_columns: int = 8
+    tokens_per_cell: float = 4.0
+    max_tokens_per_cell: int = 12
+    vocabulary_size: int = 50
+    skew: float = 1.1
+    missing_rate: float = 0.1
+    seed: int = 2023
+
+    @property
+    def column_names(self) -> List[str]:
+        """Names of the multi-value technology columns"""
+        names = TECH_COLUMN_NAMES[: self.tech_columns]
+        extra = range(len(names), self.tech_columns)
+        return names + [f"Tech{i}HaveWorkedWith" for i in extra]
+
+    @property
+    def vocabulary(self) -> List[str]:
+        """Technology names, most popular first"""
+        extra = range(len(TECH_NAMES), self.vocabulary_size)
+        return (TECH_NAMES + [f"Technology {i}" for i in extra])[: self.vocabulary_size]
+
+    def slug(self) -> str:
+        """A short name identifying these parameters (for cache directories)"""
+        values = "-".join(str(value) for value in asdict(self).values())
+        return f"synthetic-{values}".replace(".", "_")
+
+
+def _multi_value_column(
+    rng: np.random.Generator, spec: SurveySpec, rows: int
+) -> np.ndarray:
+    """One multi-value column: distinct technologies per row, joined by ';'"""
+    vocabulary = np.array(spec.vocabulary, dtype=object)
+    size = len(vocabulary)
+    max_tokens = min(spec.max_tokens_per_cell, size)
+    weights = 1.0 / np.arange(1, size + 1) ** spec.skew
+
+    # Yarr! Gumbel top-k: sampling without replacement by popularity, vectorized
+    keys = np.log(weights) + rng.gumbel(size=(rows, size))
+    ranked = np.argsort(-keys, axis=1)[:, :max_tokens]
+    lengths = np.clip(
+        rng.poisson(spec.tokens_per_cell - 1, size=rows) + 1, 1, max_tokens
+    )
+
+    values = np.array(
+        [";".join(vocabulary[row[:length]]) for row, length in zip(ranked, lengths)],
+        dtype=object,
+    )
+    values[rng.random(rows) < spec.missing_rate] = None
+    return values
+
+
+def _chunk(rng: np.random.Generator, spec: SurveySpec, start: int, rows: int):
+    """Generate ``rows`` survey rows starting at ResponseId ``start + 1``"""
+    columns = {
+        "ResponseId": np.arange(start + 1, start + rows + 1),
+        "MainBranch": np.where(
+            rng.random(rows) < 0.8,
+            "I am a developer by profession",
+            "I code primarily as a hobby",
+        ),
+        "Age": rng.choice(AGES, size=rows, p=[0.02, 0.2, 0.38, 0.24, 0.1, 0.05, 0.01]),
+        "Country": rng.choice(COUNTRIES, size=rows),
+        "OrgSize": rng.choice(ORG_SIZES, size=rows),
+        "YearsCode": rng.integers(0, 45, size=rows),
+    }
+    for name in spec.column_names:
+        columns[name] = _multi_value_column(rng, spec, rows)
+    compensation = np.round(rng.lognormal(11, 0.8, size=rows))
+    compensation[rng.random(rows) < 0.45] = np.nan
+    columns["ConvertedCompYearly"] = compensation
+    return pd.DataFrame(columns)
+
+
+def generate_survey(directory: Path, spec: SurveySpec) -> Path:
+    """
+    Write a survey data file and schema file into ``directory`` (created if
+    needed) and return the data file's path. Deterministic for a given spec.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    data_path = directory / DATA_FILE_NAME
+    rng = np.random.default_rng(spec.seed)
+
+    with open(data_path, "w", newline="", encoding="utf-8") as handle:
+        for start in range(0, spec.rows, CHUNK_ROWS):
+            rows = min(CHUNK_ROWS, spec.rows - start)
+            _chunk(rng, spec, start, rows).to_csv(
+                handle, index=False, header=start == 0
+            )
+        if spec.rows == 0:
+            _chunk(rng, spec, 0, 0).to_csv(handle, index=False)
+
+    columns = list(_chunk(np.random.default_rng(0), spec, 0, 0).columns)
+    pd.DataFrame(
+        {
+            "qid": [f"QID{i}" for i in range(len(columns))],
+            "qname": columns,
+            "question": [f"Synthetic question about {name}?" for name in columns],
+        }
+    ).to_csv(directory / SCHEMA_FILE_NAME, index=False)
+    return data_path
+
+
+def zip_survey(directory: Path) -> Path:
+    """Pack a generated survey directory into ``<directory>.zip`` beside it"""
+    directory = Path(directory)
+    archive_path = directory.with_suffix(".zip")
+    with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name in (DATA_FILE_NAME, SCHEMA_FILE_NAME):
+            archive.write(directory / name, name)
+    return archive_path
+
+
+def main(argv=None):
+    """Command line entry point"""
+    defaults = SurveySpec()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("data_dir", type=Path, help="Data directory to write into")
+    parser.add_argument(
+        "--name", default="synthetic_survey", help="Source directory name"
+    )
+    parser.add_argument("--rows", type=int, default=defaults.rows)
+    parser.add_argument("--tech-columns", type=int, default=defaults.tech_columns)
+    parser.add_argument(
+        "--tokens-per-cell", type=float, default=defaults.tokens_per_cell
+    )
+    parser.add_argument(
+        "--max-tokens-per-cell", type=int, default=defaults.max_tokens_per_cell
+    )
+    parser.add_argument("--vocabulary-size", type=int, default=defaults.vocabulary_size)
+    parser.add_argument("--skew", type=float, default=defaults.skew)
+    parser.add_argument("--missing-rate", type=float, default=defaults.missing_rate)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--zip", action="store_true", help="Also pack the source into a zip"
+    )
+    args = parser.parse_args(argv)
+
+    spec = SurveySpec(
+        rows=args.rows,
+        tech_columns=args.tech_columns,
+        tokens_per_cell=args.tokens_per_cell,
+        max_tokens_per_cell=args.max_tokens_per_cell,
+        vocabulary_size=args.vocabulary_size,
+        skew=args.skew,
+        missing_rate=args.missing_rate,
+        seed=args.seed,
+    )
+    data_path = generate_survey(args.data_dir / args.name, spec)
+    print(f"🏴‍☠️ Wrote {spec.rows} synthetic responses to {data_path}")
+    if args.zip:
+        print(f"✓ Packed {zip_survey(args.data_dir / args.name)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Yarr! Shared fixtures for our test crew - small survey treasures built on the fly
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+SO_2023_DIR = "kaggle_so_2023_data"
+
+
+def pytest_configure(config):
+    """
+    Yarr! Point the app at a synthetic survey in a scratch directory so the
+    API tests exercise real analyses rather than 400s - and so the sidecars
+    the app writes beside its data files (catalog, columnar copies, token
+    stores) never land in data/. Runs before any test module imports the
+    app (and its global DataManager).
+    """
+    if "DATA_DIR" in os.environ:
+        return
+
+    from benchmarks.synthetic_survey import SurveySpec, generate_survey
+
+    data_dir = tempfile.mkdtemp(prefix="synthetic-survey-")
+    generate_survey(Path(data_dir) / SO_2023_DIR, SurveySpec(rows=2000))
+    os.environ["DATA_DIR"] = data_dir
+    config._synthetic_data_dir = data_dir
+
+
+def pytest_unconfigure(config):
+    """Clean up the synthetic survey, if we made one"""
+    data_dir = getattr(config, "_synthetic_data_dir", None)
+    if data_dir is not None:
+        os.environ.pop("DATA_DIR", None)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+SURVEY_ROWS = [
+    ("1", "Python;SQL", "PostgreSQL", "Germany", "2 to 9 employees"),
+    ("2", "Python; JavaScript", "MySQL;PostgreSQL", "Finland", "10 to 19 employees"),
+    ("3", "", "", "Germany", "10 to 19 employees"),
+    ("4", None, "SQLite", "India", "2 to 9 employees"),
+    ("5", "JavaScript;TypeScript;Python", None, "Germany", "10 to 19 employees"),
+    ("6", "Rust; ;Go", "PostgreSQL;Redis", "India", None),
+]
+
+SURVEY_COLUMNS = [
+    "ResponseId",
+    "LanguageHaveWorkedWith",
+    "DatabaseHaveWorkedWith",
+    "Country",
+    "OrgSize",
+]
+
+
+def write_survey_csv(path, rows=SURVEY_ROWS):
+    """Write survey rows as CSV, leaving None values empty (NaN when loaded)"""
+    lines = [",".join(SURVEY_COLUMNS)]
+    for row in rows:
+        lines.append(",".join("" if value is None else value for value in row))
+    path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def survey_data_dir(tmp_path):
+    """A data directory holding one small auto-discoverable survey source"""
+    source_dir = tmp_path / "mini_survey"
+    source_dir.mkdir()
+    write_survey_csv(source_dir / "survey_results.csv")
+    (source_dir / "survey_schema.csv").write_text(
+        "qname,question\nLanguageHaveWorkedWith,Which languages?\n"
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def survey_manager(survey_data_dir):
+    """A DataManager over the small survey with categorical columns configured"""
+    from app.data_config import DataManager, DataSource
+
+    manager = DataManager(str(survey_data_dir))
+    source_dir = survey_data_dir / "mini_survey"
+    manager.register_data_source(
+        DataSource(
+            name="mini_survey",
+            description="Mini survey for tests",
+            file_path=str(source_dir / "survey_results.csv"),
+            schema_file=str(source_dir / "survey_schema.csv"),
+            primary_columns=["LanguageHaveWorkedWith", "DatabaseHaveWorkedWith"],
+            categorical_columns=["Country", "OrgSize"],
+        )
+    )
+    return manager
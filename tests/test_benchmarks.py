@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Yarr! Tests for the synthetic survey generator and the benchmark comparison
+"""
+
+import pandas as pd
+
+from benchmarks.bench import compare_results, time_call
+from benchmarks.synthetic_survey import SurveySpec, generate_survey
+
+
+def test_synthetic_survey_is_deterministic(tmp_path):
+    """
+    Yarr! The same spec should always produce the same bytes
+    """
+    spec = SurveySpec(
+        rows=300, tech_columns=3, tokens_per_cell=3, max_tokens_per_cell=5
+    )
+
+    first = generate_survey(tmp_path / "first", spec).read_bytes()
+    second = generate_survey(tmp_path / "second", spec).read_bytes()
+    other = generate_survey(tmp_path / "other", SurveySpec(rows=300, seed=1))
+
+    assert first == second
+    assert other.read_bytes() != first
+
+
+def test_synthetic_survey_follows_the_spec(tmp_path):
+    """
+    Yarr! Rows, columns and tokens per cell should match what was asked for
+    """
+    spec = SurveySpec(
+        rows=500, tech_columns=10, max_tokens_per_cell=4, vocabulary_size=30
+    )
+    df = pd.read_csv(generate_survey(tmp_path, spec))
+
+    assert len(df) == 500
+    assert df["ResponseId"].is_unique
+    for column in spec.column_names:
+        tokens = df[column].dropna().str.split(";")
+        assert tokens.map(len).between(1, 4).all()
+        assert tokens.map(lambda row: len(set(row)) == len(row)).all()
+        assert set(tokens.explode()) <= set(spec.vocabulary)
+    assert (tmp_path / "survey_results_schema.csv").exists()
+
+
+def test_compare_results_flags_regressions():
+    """
+    Yarr! Slower beyond the tolerance is a regression, faster an improvement
+    """
+    baseline = {
+        "results": [
+            {"name": "load", "rows": 10, "median_s": 1.0},
+            {"name": "count", "rows": 10, "median_s": 1.0},
+            {"name": "api", "rows": 10, "median_s": 1.0},
+        ]
+    }
+    current = {
+        "results": [
+            {"name": "load", "rows": 10, "median_s": 1.5},
+            {"name": "count", "rows": 10, "median_s": 0.5},
+            {"name": "api", "rows": 10, "median_s": 1.1},
+            {"name": "new", "rows": 10, "median_s": 9.0},
+        ]
+    }
+
+    statuses = {
+        item["name"]: item["status"]
+        for item in compare_results(baseline, current, tolerance=0.2)
+    }
+
+    assert statuses == {"load": "regression", "count": "improvement", "api": "same"}
+
+
+def test_warm_timings_skip_the_first_call():
+    """
+    Yarr! A warm benchmark makes one untimed call before the timed repeats
+    """
+    calls = []
+    timing = time_call(lambda: calls.append(1), repeats=2, warmup=True)
+
+    assert len(calls) == 3
+    assert timing["repeats"] == 2
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Yarr! Tests for our in-memory caches - frames and results kept shipshape
+"""
+
+import pandas as pd
+
+from app.cache import FrameCache, ResultCache, frame_memory_usage
+
+
+def test_frame_cache_evicts_least_recently_used():
+    """
+    Yarr! A full cache should make room by evicting the least recently used frame
+    """
+    frame = pd.DataFrame({"LanguageHaveWorkedWith": ["Python;SQL"] * 10})
+    cache = FrameCache(max_bytes=frame_memory_usage(frame) * 2)
+
+    cache.put("a", frame)
+    cache.put("b", frame.copy())
+    assert cache.get("a") is frame  # "a" is now the most recently used
+    cache.put("c", frame.copy())
+
+    assert cache.get("b") is None, "Least recently used frame should be evicted"
+    assert cache.get("a") is frame
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+
+
+def test_result_cache_expires_entries_after_ttl():
+    """
+    Yarr! Results older than the TTL should be dropped on access
+    """
+    now = [100.0]
+    cache = ResultCache(max_entries=10, ttl_seconds=5, clock=lambda: now[0])
+
+    cache.put("key", {"labels": ["Python"]})
+    now[0] += 4
+    assert cache.get("key") == {"labels": ["Python"]}
+    now[0] += 2
+    assert cache.get("key") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["expirations"] == 1
+    assert stats["entries"] == 0
+
+
+def test_result_cache_evicts_least_recently_used():
+    """
+    Yarr! A full result cache should drop the least recently used entry
+    """
+    cache = ResultCache(max_entries=2, ttl_seconds=60)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,745 @@
+#!/usr/bin/env python3
+"""
+Yarr! Tests for the DataManager - making sure our treasure hold loads and counts true!
+"""
+
+import os
+import shutil
+import threading
+import zipfile
+
+import pandas as pd
+import pytest
+
+from app import columnar, incremental
+from app.data_config import DataManager
+from tests.conftest import SURVEY_COLUMNS, SURVEY_ROWS, write_survey_csv
+
+
+def test_load_data_is_cached(survey_data_dir):
+    """
+    Yarr! Loading the same source twice should be served from the cache
+    """
+    manager = DataManager(str(survey_data_dir))
+
+    first = manager.load_data("mini_survey")
+    second = manager.load_data("mini_survey")
+
+    assert first is second, "Second load should return the cached frame"
+    stats = manager.get_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["current_bytes"] > 0
+
+
+def test_load_data_picks_up_replaced_file(survey_data_dir):
+    """
+    Yarr! Replacing the data file should invalidate the cached frame
+    """
+    manager = DataManager(str(survey_data_dir))
+    data_file = survey_data_dir / "mini_survey" / "survey_results.csv"
+
+    assert len(manager.load_data("mini_survey")) == len(SURVEY_ROWS)
+
+    write_survey_csv(data_file, SURVEY_ROWS[:2])
+    stat = data_file.stat()
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert len(manager.load_data("mini_survey")) == 2
+    assert manager.get_cache_stats()["entries"] == 1
+
+
+def test_cache_skips_frames_bigger_than_budget(survey_data_dir):
+    """
+    Yarr! Frames bigger than the whole budget are loaded but never cached
+    """
+    manager = DataManager(str(survey_data_dir), cache_max_bytes=1)
+
+    manager.load_data("mini_survey")
+    manager.load_data("mini_survey")
+
+    stats = manager.get_cache_stats()
+    assert stats["entries"] == 0
+    assert stats["misses"] == 2
+
+
+def test_load_data_projects_columns(survey_data_dir):
+    """
+    Yarr! Asking for specific columns should parse only those columns
+    """
+    manager = DataManager(str(survey_data_dir))
+
+    df = manager.load_data("mini_survey", columns=["Country", "ResponseId"])
+
+    assert list(df.columns) == ["Country", "ResponseId"]
+    assert "schema" not in df.attrs, "Projected loads should skip the schema file"
+    assert "schema" in manager.load_data("mini_survey").attrs
+
+
+def test_load_data_rejects_unknown_columns(survey_data_dir):
+    """
+    Yarr! Projecting a column that isn't in the file should be a ValueError
+    """
+    manager = DataManager(str(survey_data_dir))
+
+    with pytest.raises(ValueError):
+        manager.load_data("mini_survey", columns=["NoSuchColumn"])
+
+
+def test_data_source_info_lists_columns_without_loading_rows(survey_data_dir):
+    """
+    Yarr! Source info should report the header without caching any frames
+    """
+    manager = DataManager(str(survey_data_dir))
+
+    info = manager.get_data_source_info("mini_survey")
+
+    assert info["columns"] == SURVEY_COLUMNS
+    assert manager.get_cache_stats()["entries"] == 0
+
+
+def test_columnar_copy_matches_csv(survey_data_dir):
+    """
+    Yarr! Frames and analyses from the columnar copy must match the raw CSV
+    """
+    with_copy = DataManager(str(survey_data_dir))
+    without_copy = DataManager(str(survey_data_dir), columnar_cache=False)
+
+    pd.testing.assert_frame_equal(
+        with_copy.load_data("mini_survey"), without_copy.load_data("mini_survey")
+    )
+    assert (survey_data_dir / "mini_survey" / ".survey_results.csv.parquet").exists()
+
+    for column in ["LanguageHaveWorkedWith", "DatabaseHaveWorkedWith"]:
+        assert with_copy.analyze_technology_usage(
+            "mini_survey", column, 10
+        ) == without_copy.analyze_technology_usage("mini_survey", column, 10)
+
+
+def test_columnar_copy_is_rebuilt_when_csv_changes(survey_data_dir):
+    """
+    Yarr! A rewritten CSV should get a fresh columnar copy on next use
+    """
+    manager = DataManager(str(survey_data_dir))
+    data_file = survey_data_dir / "mini_survey" / "survey_results.csv"
+    manager.load_data("mini_survey")
+
+    write_survey_csv(data_file, SURVEY_ROWS[:1])
+    stat = data_file.stat()
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    result = manager.analyze_technology_usage(
+        "mini_survey", "LanguageHaveWorkedWith", 10
+    )
+    assert result["labels"] == ["Python", "SQL"]
+    assert result["total_responses"] == 1
+
+
+def test_filtered_analysis_counts_matching_respondents(survey_manager):
+    """
+    Yarr! Filters should restrict counts to the matching slice of respondents
+    """
+    result = survey_manager.analyze_technology_usage_filtered(
+        "mini_survey", "LanguageHaveWorkedWith", {"Country": ["Germany"]}, 10
+    )
+
+    # Germany: "Python;SQL", a blank answer and "JavaScript;TypeScript;Python"
+    assert result["labels"] == ["Python", "SQL", "JavaScript", "TypeScript"]
+    assert result["values"] == [2, 1, 1, 1]
+    assert result["total_responses"] == 2
+
+    result = survey_manager.analyze_technology_usage_filtered(
+        "mini_survey",
+        "LanguageHaveWorkedWith",
+        {"Country": ["Germany", "India"], "OrgSize": ["2 to 9 employees"]},
+        10,
+    )
+    assert result["labels"] == ["Python", "SQL"]
+    assert result["total_responses"] == 1
+
+
+def test_unfiltered_index_matches_plain_analysis(survey_manager):
+    """
+    Yarr! With no filters the index must agree with the plain analysis exactly
+    """
+    for column in ["LanguageHaveWorkedWith", "DatabaseHaveWorkedWith"]:
+        assert survey_manager.analyze_technology_usage_filtered(
+            "mini_survey", column, {}, 10
+        ) == survey_manager.analyze_technology_usage("mini_survey", column, 10)
+
+
+def test_filtered_ties_break_like_streaming(survey_manager):
+    """
+    Yarr! Tied technologies should be ordered by first appearance among the
+    filtered respondents on every path, not across the whole column
+    """
+    filters = {"Country": ["Finland"]}
+    indexed = survey_manager.analyze_technology_usage_filtered(
+        "mini_survey", "DatabaseHaveWorkedWith", filters, top_n=1
+    )
+    # PostgreSQL comes first in the file, but MySQL first among Finns
+    assert indexed["labels"] == ["MySQL"]
+
+    survey_manager.data_sources["mini_survey"].load_mode = "streaming"
+    streamed = survey_manager.analyze_technology_usage_filtered(
+        "mini_survey", "DatabaseHaveWorkedWith", filters, top_n=1
+    )
+    assert streamed == indexed
+
+
+def test_filtered_analysis_rejects_unknown_filter(survey_manager):
+    """
+    Yarr! Filtering on a non-categorical column should be a ValueError
+    """
+    with pytest.raises(ValueError):
+        survey_manager.analyze_technology_usage_filtered(
+            "mini_survey", "LanguageHaveWorkedWith", {"ResponseId": ["1"]}, 10
+        )
+
+
+def test_co_occurrence_within_one_column(survey_manager):
+    """
+    Yarr! Pairs within a column should count respondents using both technologies
+    """
+    result = survey_manager.analyze_co_occurrence(
+        "mini_survey", "LanguageHaveWorkedWith", top_k=3
+    )
+
+    assert result["total_respondents"] == 4
+    top_pair = result["pairs"][0]
+    assert {top_pair["technology"], top_pair["other_technology"]} == {
+        "Python",
+        "JavaScript",
+    }
+    assert top_pair["count"] == 2
+    # P(both) = 2/4, P(Python) = 3/4, P(JavaScript) = 2/4
+    assert top_pair["lift"] == pytest.approx((2 / 4) / ((3 / 4) * (2 / 4)))
+
+
+def test_co_occurrence_across_columns(survey_manager):
+    """
+    Yarr! Cross-column pairs should only count respondents who answered both
+    """
+    result = survey_manager.analyze_co_occurrence(
+        "mini_survey", "LanguageHaveWorkedWith", "DatabaseHaveWorkedWith", top_k=50
+    )
+
+    assert result["total_respondents"] == 3
+    pairs = {(p["technology"], p["other_technology"]): p for p in result["pairs"]}
+    assert pairs[("Python", "PostgreSQL")]["count"] == 2
+    assert ("JavaScript", "PostgreSQL") in pairs
+    assert all(p["technology"] != "TypeScript" for p in result["pairs"])
+
+
+def test_data_manager_initializes_lazily(survey_data_dir):
+    """
+    Yarr! Creating a DataManager should do no discovery until data is needed
+    """
+    manager = DataManager(str(survey_data_dir))
+    assert not manager.is_initialized
+
+    assert "mini_survey" in manager.get_available_sources()
+    assert manager.is_initialized
+
+
+def test_missing_data_directory_has_no_sources(tmp_path):
+    """
+    Yarr! A missing data directory means no sources, not a crash
+    """
+    manager = DataManager(str(tmp_path / "no_such_dir"))
+    assert manager.get_available_sources() == {}
+
+
+def test_warm_up_builds_every_primary_column(survey_data_dir):
+    """
+    Yarr! Warm-up should report progress over all primary columns
+    """
+    manager = DataManager(str(survey_data_dir))
+
+    manager.warm_up()
+
+    assert manager.warmup_status == {
+        "state": "done",
+        "completed": 2,
+        "total": 2,
+        "error": None,
+    }
+
+
+def _zip_survey(survey_data_dir):
+    """Move the mini survey into a zip archive beside its (now removed) directory"""
+    source_dir = survey_data_dir / "mini_survey"
+    archive_path = survey_data_dir / "mini_survey.zip"
+    with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for csv_file in source_dir.glob("*.csv"):
+            archive.write(csv_file, csv_file.name)
+    shutil.rmtree(source_dir)
+    return archive_path
+
+
+def test_zip_archive_is_read_without_extracting(survey_data_dir):
+    """
+    Yarr! A zipped source should be discovered and analyzed straight from the archive
+    """
+    archive_path = _zip_survey(survey_data_dir)
+    manager = DataManager(str(survey_data_dir))
+
+    info = manager.get_data_source_info("mini_survey")
+    assert info["archive_path"] == str(archive_path)
+    assert info["file_path"] == "survey_results.csv"
+    assert info["has_schema"]
+
+    df = manager.load_data("mini_survey")
+    assert list(df.columns) == SURVEY_COLUMNS
+    assert len(df) == len(SURVEY_ROWS)
+
+    result = manager.analyze_technology_usage("mini_survey", "LanguageHaveWorkedWith")
+    assert result["labels"][0] == "Python"
+    assert result["values"][0] == 3
+
+    assert not (survey_data_dir / "mini_survey").exists()
+    assert manager.get_schema_info("mini_survey") is not None
+
+
+def test_zip_archive_extracted_when_enabled(survey_data_dir):
+    """
+    Yarr! With extraction switched on, the archive still gets unpacked on startup
+    """
+    _zip_survey(survey_data_dir)
+    manager = DataManager(str(survey_data_dir), extract_archives=True)
+
+    info = manager.get_data_source_info("mini_survey")
+    assert info["archive_path"] is None
+    assert (survey_data_dir / "mini_survey" / "survey_results.csv").exists()
+    assert len(manager.load_data("mini_survey")) == len(SURVEY_ROWS)
+
+
+def test_streaming_mode_matches_in_memory_analysis(survey_data_dir):
+    """
+    Yarr! Counting chunk by chunk should give the very same answer as in memory
+    """
+    in_memory = DataManager(str(survey_data_dir), columnar_cache=False)
+    streaming = DataManager(
+        str(survey_data_dir), streaming_threshold_bytes=0, stream_chunk_rows=2
+    )
+    assert not in_memory.is_streaming("mini_survey")
+    assert streaming.is_streaming("mini_survey")
+
+    for column in ("LanguageHaveWorkedWith", "DatabaseHaveWorkedWith"):
+        assert streaming.analyze_technology_usage(
+            "mini_survey", column
+        ) == in_memory.analyze_technology_usage("mini_survey", column)
+
+    # Nothing was materialized - no cached frames, no columnar copy
+    assert streaming.get_cache_stats()["entries"] == 0
+    assert not (
+        survey_data_dir / "mini_survey" / ".survey_results.csv.parquet"
+    ).exists()
+
+
+def test_streaming_mode_applies_filters_per_chunk(survey_manager):
+    """
+    Yarr! Filtered counts in streaming mode should match the technology index
+    """
+    expected = survey_manager.analyze_technology_usage_filtered(
+        "mini_survey", "LanguageHaveWorkedWith", {"Country": ["Germany", "India"]}
+    )
+
+    survey_manager.data_sources["mini_survey"].load_mode = "streaming"
+    survey_manager.stream_chunk_rows = 2
+    result = survey_manager.analyze_technology_usage_filtered(
+        "mini_survey", "LanguageHaveWorkedWith", {"Country": ["Germany", "India"]}
+    )
+
+    assert result == expected
+    with pytest.raises(ValueError):
+        survey_manager.analyze_technology_usage_filtered(
+            "mini_survey", "LanguageHaveWorkedWith", {"ResponseId": ["1"]}
+        )
+
+
+def test_parallel_counting_matches_serial(survey_data_dir):
+    """
+    Yarr! Worker processes over byte ranges and row groups give the serial answer
+    """
+    serial = DataManager(str(survey_data_dir), columnar_cache=False)
+    parallel = DataManager(str(survey_data_dir), parallel_workers=2)
+    parallel.parallel_min_partition_bytes = 1
+    expected = serial.analyze_technology_usage("mini_survey", "LanguageHaveWorkedWith")
+
+    try:
+        # No columnar copy yet - the CSV is split into byte ranges
+        counts = parallel._parallel_token_counts(
+            "mini_survey", "LanguageHaveWorkedWith"
+        )
+        assert counts is not None
+        assert counts.top(10) == expected
+
+        # With a columnar copy of several row groups, those get split instead
+        columnar.ROW_GROUP_ROWS, row_group_rows = 2, columnar.ROW_GROUP_ROWS
+        try:
+            parallel.load_data("mini_survey")
+        finally:
+            columnar.ROW_GROUP_ROWS = row_group_rows
+        counts = parallel._parallel_token_counts(
+            "mini_survey", "LanguageHaveWorkedWith"
+        )
+        assert counts is not None
+        assert counts.top(10) == expected
+    finally:
+        parallel.shutdown()
+
+
+def test_batch_analysis_matches_single_columns(survey_data_dir):
+    """
+    Yarr! One batch pass should match per-column analyses and report bad columns
+    """
+    for streaming_threshold in (None, 0):
+        manager = DataManager(
+            str(survey_data_dir), streaming_threshold_bytes=streaming_threshold
+        )
+        requests = [
+            ("LanguageHaveWorkedWith", 2),
+            ("NotAColumn", 5),
+            ("DatabaseHaveWorkedWith", 10),
+            ("LanguageHaveWorkedWith", 10),
+        ]
+
+        results = manager.analyze_technology_usage_batch("mini_survey", requests)
+
+        assert [(r["column"], r["top_n"]) for r in results] == requests
+        assert "error" in results[1] and "result" not in results[1]
+        for item in results[:1] + results[2:]:
+            assert item["result"] == manager.analyze_technology_usage(
+                "mini_survey", item["column"], item["top_n"]
+            )
+
+
+def test_appended_rows_are_counted_incrementally(survey_data_dir):
+    """
+    Yarr! Appending rows should only parse the new tail; a rewrite recounts all
+    """
+    manager = DataManager(str(survey_data_dir))
+    data_file = survey_data_dir / "mini_survey" / "survey_results.csv"
+    column = "LanguageHaveWorkedWith"
+    write_survey_csv(data_file, SURVEY_ROWS[:3])
+    manager.analyze_technology_usage("mini_survey", column)
+
+    def fresh_count():
+        return DataManager(str(survey_data_dir)).analyze_technology_usage(
+            "mini_survey", column
+        )
+
+    # Two complete rows plus one still being written (no newline yet)
+    with open(data_file, "a") as handle:
+        handle.write('4,"Rust;\nPython",,India,\n5,Go,,India,\n6,Kotlin')
+    assert manager.analyze_technology_usage("mini_survey", column) == fresh_count()
+    assert manager.get_append_stats()["incremental_updates"] == 1
+
+    with open(data_file, "a") as handle:
+        handle.write(";Python,,Finland,\n")
+    assert manager.analyze_technology_usage("mini_survey", column) == fresh_count()
+    stats = manager.get_append_stats()
+    assert stats["incremental_updates"] == 2
+    assert stats["full_recounts"] == 1
+
+    write_survey_csv(data_file, SURVEY_ROWS[3:])
+    assert manager.analyze_technology_usage("mini_survey", column) == fresh_count()
+    assert manager.get_append_stats()["full_recounts"] == 2
+
+
+def test_same_size_rewrite_is_recounted(survey_data_dir, monkeypatch):
+    """
+    Yarr! An in-place edit that keeps the size (and misses the checksummed
+    bytes) must still trigger a full recount
+    """
+    monkeypatch.setattr(incremental, "SIGNATURE_WINDOW_BYTES", 16)
+    manager = DataManager(str(survey_data_dir))
+    data_file = survey_data_dir / "mini_survey" / "survey_results.csv"
+    column = "LanguageHaveWorkedWith"
+    before = manager.analyze_technology_usage("mini_survey", column)
+    assert dict(zip(before["labels"], before["values"]))["Python"] == 3
+
+    content = data_file.read_text()
+    data_file.write_text(content.replace("Python; JavaScript", "Pythom; JavaScript"))
+    stat = data_file.stat()
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    after = manager.analyze_technology_usage("mini_survey", column)
+    assert after == DataManager(str(survey_data_dir)).analyze_technology_usage(
+        "mini_survey", column
+    )
+    assert dict(zip(after["labels"], after["values"]))["Python"] == 2
+    stats = manager.get_append_stats()
+    assert stats["full_recounts"] == 2
+    assert stats["incremental_updates"] == 0
+
+
+def test_append_state_of_removed_files_is_forgotten(tmp_path):
+    """
+    Yarr! Files that come and go must not leave their counts behind
+    """
+    from app.token_counting import tokenize_series
+
+    tracker = incremental.AppendTracker()
+    column = "LanguageHaveWorkedWith"
+    paths = []
+    for name in ["first.csv", "second.csv"]:
+        path = tmp_path / name
+        write_survey_csv(path)
+        paths.append(str(path))
+        tracker.counts(
+            str(path),
+            column,
+            lambda path=path: tokenize_series(pd.read_csv(path)[column]).counts(),
+        )
+    assert tracker.stats()["tracked"] == 2
+
+    os.remove(paths[0])
+    with pytest.raises(FileNotFoundError):
+        tracker.counts(paths[0], column, lambda: None)
+    tracker.counts(paths[1], column, lambda: None)
+
+    assert tracker.stats()["tracked"] == 1
+    assert [path for path, _ in tracker._column_locks] == [paths[1]]
+
+
+def test_compact_frames_keep_values_and_save_memory(survey_manager):
+    """
+    Yarr! Compact mode should shrink frames without changing a single answer
+    """
+    plain = survey_manager.load_data("mini_survey")
+    survey_manager.compact_frames = True
+    survey_manager._frame_cache.invalidate()
+    compact = survey_manager.load_data("mini_survey")
+
+    assert isinstance(compact["Country"].dtype, pd.CategoricalDtype)
+    assert compact["ResponseId"].dtype == "int8"
+    pd.testing.assert_frame_equal(
+        compact.astype(object), plain.astype(object), check_dtype=False
+    )
+
+    report = survey_manager.get_memory_report()
+    source_report = report["sources"]["mini_survey"]
+    assert report["compact_frames"] is True
+    assert set(source_report["columns"]) == set(SURVEY_COLUMNS)
+    assert source_report["frames_bytes"] == sum(source_report["columns"].values())
+
+    survey_manager.get_technology_index("mini_survey", "LanguageHaveWorkedWith")
+    source_report = survey_manager.get_memory_report()["sources"]["mini_survey"]
+    assert source_report["index_columns"]["LanguageHaveWorkedWith"] > 0
+    assert source_report["categorical_bytes"] > 0
+
+
+def test_catalog_replaces_rediscovery_on_restart(survey_data_dir, monkeypatch):
+    """
+    Yarr! A second boot should trust the catalog for unchanged files - no header
+    sampling, no schema parsing - and refresh only what changed
+    """
+    # (Writing a columnar copy into the source directory would change its
+    # listing fingerprint once - keep this about the catalog alone)
+    manager = DataManager(str(survey_data_dir), columnar_cache=False)
+    schema = manager.get_schema_info("mini_survey")
+    stats = manager.get_source_stats("mini_survey")
+    assert stats["row_count"] == len(SURVEY_ROWS)
+    assert stats["distinct_counts"]["Country"] == len(
+        {row[SURVEY_COLUMNS.index("Country")] for row in SURVEY_ROWS}
+    )
+    assert (survey_data_dir / ".catalog.json").exists()
+
+    def no_reading(*args, **kwargs):
+        raise AssertionError("Unchanged files should come from the catalog")
+
+    from app import source_io
+
+    monkeypatch.setattr(source_io, "read_csv", no_reading)
+    restarted = DataManager(str(survey_data_dir), columnar_cache=False)
+    info = restarted.get_data_source_info("mini_survey")
+    assert info["columns"] == SURVEY_COLUMNS
+    assert info["row_count"] == len(SURVEY_ROWS)
+    assert restarted.get_catalog_stats()["listing_hits"] == 1
+    pd.testing.assert_frame_equal(restarted.get_schema_info("mini_survey"), schema)
+    monkeypatch.undo()
+
+    # A rewritten data file invalidates its facts, but not the schema's
+    data_file = survey_data_dir / "mini_survey" / "survey_results.csv"
+    write_survey_csv(data_file, SURVEY_ROWS[:3])
+    refreshed = DataManager(str(survey_data_dir), columnar_cache=False)
+    assert refreshed.get_source_stats("mini_survey", compute=False) is None
+    assert refreshed.get_source_stats("mini_survey")["row_count"] == 3
+    pd.testing.assert_frame_equal(refreshed.get_schema_info("mini_survey"), schema)
+
+
+def test_token_store_is_mapped_by_other_workers(survey_data_dir):
+    """
+    Yarr! A second worker should map the stored columns instead of tokenizing,
+    get the same answers, and never see arrays of an older file version
+    """
+    from app import source_io, token_store
+
+    first = DataManager(str(survey_data_dir), columnar_cache=False)
+    first.data_sources["mini_survey"].categorical_columns = ["Country"]
+    expected = first.analyze_technology_usage("mini_survey", "LanguageHaveWorkedWith")
+    filtered = first.analyze_technology_usage_filtered(
+        "mini_survey", "LanguageHaveWorkedWith", {"Country": ["Germany"]}
+    )
+
+    second = DataManager(str(survey_data_dir), columnar_cache=False)
+    second.data_sources["mini_survey"].categorical_columns = ["Country"]
+    second.load_data = None  # Yarr! Any parse would blow up here
+    tokens = second._load_token_column("mini_survey", "LanguageHaveWorkedWith")
+    assert token_store.is_mapped(tokens.codes)
+    assert not tokens.codes.flags.writeable
+    assert tokens.counts().top(10) == expected
+    assert (
+        second.analyze_technology_usage_filtered(
+            "mini_survey", "LanguageHaveWorkedWith", {"Country": ["Germany"]}
+        )
+        == filtered
+    )
+    report = second.get_memory_report()["sources"]["mini_survey"]
+    assert report["mapped_bytes"] > 0
+
+    # A rewritten file gets re-tokenized and its stale arrays cleared away
+    data_file = survey_data_dir / "mini_survey" / "survey_results.csv"
+    write_survey_csv(data_file, SURVEY_ROWS[:2])
+    third = DataManager(str(survey_data_dir), columnar_cache=False)
+    assert (
+        third.analyze_technology_usage("mini_survey", "LanguageHaveWorkedWith")[
+            "total_responses"
+        ]
+        == 2
+    )
+    store = source_io.token_store_path(third.data_sources["mini_survey"])
+    assert len(list(store.glob("tokens-*.codes.npy"))) == 1
+
+
+def test_concurrent_token_store_writes_of_one_column(tmp_path):
+    """
+    Yarr! Threads storing the same column at once must not trip over each
+    other's temp files
+    """
+    from app import token_store
+    from app.token_counting import tokenize_series
+
+    tokens = tokenize_series(pd.Series(["Python;SQL", "Rust", None] * 1000))
+    barrier = threading.Barrier(8, timeout=5)
+    errors = []
+
+    def write():
+        barrier.wait()
+        try:
+            token_store.write_token_column(tmp_path, "Languages", (1, 2), tokens)
+        except OSError as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=write) for _ in range(8)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+
+    assert errors == []
+    stored = token_store.read_token_column(tmp_path, "Languages", (1, 2))
+    assert stored.counts().top(5) == tokens.counts().top(5)
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_parsing_profile_is_inferred_persisted_and_corrected(survey_data_dir):
+    """
+    Yarr! Discovery pins each file's types once; both engines parse alike, and
+    a profile the data outgrew gets corrected instead of failing the load
+    """
+    from app.parsing import ParsingProfile, infer_parsing_profile, resolve_engine
+
+    manager = DataManager(str(survey_data_dir), columnar_cache=False)
+    profile = manager.data_sources["mini_survey"].parsing_profile
+    assert profile.dtypes["ResponseId"] == "int64"
+    assert profile.engine == resolve_engine("auto")
+
+    c_manager = DataManager(str(survey_data_dir), columnar_cache=False, csv_engine="c")
+    assert c_manager.data_sources["mini_survey"].parsing_profile.engine == "c"
+    pd.testing.assert_frame_equal(
+        manager.load_data("mini_survey"), c_manager.load_data("mini_survey")
+    )
+
+    # Text categoricals become categoricals, numeric ones keep their numbers
+    sample = pd.DataFrame({"Country": ["Germany", None], "YearsCode": [5.0, None]})
+    hinted = infer_parsing_profile(sample, ["Country", "YearsCode"], engine="c")
+    assert hinted.dtypes == {"Country": "category", "YearsCode": "float64"}
+
+    # A profile that no longer fits is replaced by what the data really holds
+    source = manager.data_sources["mini_survey"]
+    source.parsing_profile = ParsingProfile(dtypes={"Country": "int64"}, engine="c")
+    df = manager.load_data("mini_survey", columns=["Country"])
+    assert df["Country"].tolist()[:2] == ["Germany", "Finland"]
+    assert "Country" not in source.parsing_profile.dtypes
+
+    restarted = DataManager(str(survey_data_dir), columnar_cache=False)
+    assert restarted.data_sources["mini_survey"].parsing_profile.dtypes == (
+        source.parsing_profile.dtypes
+    )
+
+
+def test_parsing_profile_applies_on_every_read_path(survey_data_dir):
+    """
+    Yarr! In memory, streamed, split over workers or appended - every path
+    should honor the profile's NA values and give the same counts
+    """
+    data_file = survey_data_dir / "mini_survey" / "survey_results.csv"
+    unanswered = [
+        ("7", "Not answered", "SQLite", "Germany", "2 to 9 employees"),
+        ("8", "Not answered", None, "India", None),
+    ]
+    write_survey_csv(data_file, SURVEY_ROWS + unanswered[:1])
+    column = "LanguageHaveWorkedWith"
+
+    def with_profile(manager):
+        source = manager.data_sources["mini_survey"]
+        source.parsing_profile.na_values.append("Not answered")
+        source.categorical_columns = ["Country"]
+        return manager
+
+    memory = with_profile(DataManager(str(survey_data_dir), columnar_cache=False))
+    streaming = with_profile(
+        DataManager(
+            str(survey_data_dir), streaming_threshold_bytes=0, stream_chunk_rows=2
+        )
+    )
+    parallel = with_profile(
+        DataManager(str(survey_data_dir), columnar_cache=False, parallel_workers=2)
+    )
+    parallel.parallel_min_partition_bytes = 1
+
+    expected = memory.analyze_technology_usage("mini_survey", column)
+    assert "Not answered" not in expected["labels"]
+    assert expected["total_responses"] == 4
+    assert streaming.analyze_technology_usage("mini_survey", column) == expected
+    try:
+        counts = parallel._parallel_token_counts("mini_survey", column)
+        assert counts is not None
+        assert counts.top(10) == expected
+    finally:
+        parallel.shutdown()
+
+    # Appended rows get parsed with the same profile as the whole file
+    with open(data_file, "a") as handle:
+        handle.write(",".join(value or "" for value in unanswered[1]) + "\n")
+    appended = memory.analyze_technology_usage("mini_survey", column)
+    assert memory.get_append_stats()["incremental_updates"] == 1
+    fresh = with_profile(DataManager(str(survey_data_dir), columnar_cache=False))
+    assert appended == fresh.analyze_technology_usage("mini_survey", column)
+    assert appended["total_responses"] == 4
+
+    # A streamed read the data outgrew relaxes the profile instead of failing
+    source = streaming.data_sources["mini_survey"]
+    source.parsing_profile.dtypes["Country"] = "int64"
+    filters = {"Country": ["Germany"]}
+    streamed = streaming.analyze_technology_usage_filtered(
+        "mini_survey", column, filters
+    )
+    in_memory = memory.analyze_technology_usage_filtered("mini_survey", column, filters)
+    assert dict(zip(streamed["labels"], streamed["values"])) == dict(
+        zip(in_memory["labels"], in_memory["values"])
+    )
+    assert "Country" not in source.parsing_profile.dtypes
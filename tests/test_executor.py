@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Yarr! Tests for the analysis executor - heavy work off the event loop, shared once
+"""
+
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.executor import AnalysisExecutor
+
+
+def test_identical_in_flight_calls_are_coalesced():
+    """
+    Yarr! Concurrent calls with the same key should run the work only once
+    """
+    executor = AnalysisExecutor(max_workers=4)
+    calls = []
+    release = threading.Event()
+
+    def slow_analysis(value):
+        calls.append(value)
+        release.wait(timeout=5)
+        return {"value": value}
+
+    async def fan_out():
+        waiters = [executor.run("same-key", slow_analysis, 1) for _ in range(8)]
+        tasks = [asyncio.ensure_future(waiter) for waiter in waiters]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(fan_out())
+
+    assert calls == [1], "The analysis should run exactly once"
+    assert all(result is results[0] for result in results)
+    assert executor.stats()["coalesced"] == 7
+    assert executor.stats()["in_flight"] == 0
+    executor.shutdown()
+
+
+def test_work_runs_off_the_event_loop_thread():
+    """
+    Yarr! The event loop thread should stay free while analyses run
+    """
+    executor = AnalysisExecutor(max_workers=2)
+
+    async def check():
+        loop_thread = threading.get_ident()
+        worker_thread = await executor.run(None, threading.get_ident)
+        return loop_thread, worker_thread
+
+    loop_thread, worker_thread = asyncio.run(check())
+    assert loop_thread != worker_thread
+    executor.shutdown()
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    """
+    Yarr! A failing analysis raises for all waiters and the next call retries
+    """
+    executor = AnalysisExecutor(max_workers=2)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        time.sleep(0.05)
+        if len(attempts) == 1:
+            raise ValueError("Arrr!")
+        return "ok"
+
+    async def run_twice():
+        first = await asyncio.gather(
+            executor.run("flaky", flaky),
+            executor.run("flaky", flaky),
+            return_exceptions=True,
+        )
+        second = await executor.run("flaky", flaky)
+        return first, second
+
+    first, second = asyncio.run(run_twice())
+
+    assert all(isinstance(result, ValueError) for result in first)
+    assert second == "ok"
+    assert len(attempts) == 2
+    executor.shutdown()
+
+
+def test_app_shutdown_stops_the_pool_and_a_restart_gets_a_new_one():
+    """
+    Yarr! Leaving the app's lifespan should stop the worker threads, and an app
+    started again in the same process should still run analyses
+    """
+    with TestClient(main.app) as client:
+        assert client.get("/api/analysis/technology-usage?top_n=3").status_code in [
+            200,
+            404,
+        ]
+        pool = main.analysis_executor._pool
+
+    assert main.analysis_executor._pool is None
+    assert pool is None or pool._shutdown
+
+    with TestClient(main.app) as client:
+        response = client.get("/api/analysis/technology-usage?top_n=3")
+        assert response.status_code in [200, 404]
+
+
+def test_shutdown_cancels_queued_analyses():
+    """
+    Yarr! Analyses still queued at shutdown are cancelled, running ones finish
+    """
+    executor = AnalysisExecutor(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(timeout=5)
+        return "done"
+
+    running = executor._submit(None, blocking, ())
+    queued = executor._submit(None, blocking, ())
+    assert started.wait(timeout=5)
+
+    threading.Timer(0.05, release.set).start()
+    executor.shutdown()
+
+    assert running.result() == "done"
+    assert queued.cancelled()
+    assert executor.stats()["in_flight"] == 0
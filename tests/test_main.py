@@ -4,6 +4,9 @@ Yarr! These be the tests for our enhanced FastAPI analytics treasure, matey!
 Making sure our data analysis ship sails smooth as silk for all data analysts aboard!
 """
 
+import json
+import time
+
 from fastapi.testclient import TestClient
 from app.main import app
 
@@ -190,3 +193,246 @@ def test_api_parameter_validation():
     assert (
         response.status_code == 422
     ), "Should return 422 for top_n parameter exceeding limit"
+
+
+def test_filtered_technology_analysis_endpoint():
+    """
+    Yarr! Test the filtered analysis endpoint with a categorical filter
+    """
+    response = client.get(
+        "/api/analysis/technology-usage/filtered?source=stackoverflow_2023&column=LanguageHaveWorkedWith&Country=Germany"
+    )
+
+    assert response.status_code in [
+        200,
+        404,
+    ], f"Expected 200 or 404, got {response.status_code}"
+
+    if response.status_code == 200:
+        data = response.json()
+        assert data["filters"] == {"Country": ["Germany"]}
+        assert len(data["labels"]) == len(data["values"])
+
+
+def test_filtered_analysis_accepts_mode():
+    """
+    Yarr! ``mode`` is a parameter, not a filter - approx answers exactly here
+    """
+    url = "/api/analysis/technology-usage/filtered?source=stackoverflow_2023&Country=Germany"
+    exact = client.get(url)
+    approx = client.get(url + "&mode=approx")
+
+    assert approx.status_code == exact.status_code
+    if approx.status_code == 200:
+        assert approx.json() == exact.json()
+        assert approx.json()["filters"] == {"Country": ["Germany"]}
+
+
+def test_filtered_analysis_rejects_unknown_filter_column():
+    """
+    Yarr! Test that filtering on a non-categorical column returns an error
+    """
+    response = client.get(
+        "/api/analysis/technology-usage/filtered?source=stackoverflow_2023&NotAColumn=x"
+    )
+
+    assert response.status_code in [
+        400,
+        404,
+    ], "Should return 400 or 404 for an unknown filter column"
+
+
+def test_co_occurrence_endpoint():
+    """
+    Yarr! Test the co-occurrence endpoint across two technology columns
+    """
+    response = client.get(
+        "/api/analysis/co-occurrence?source=stackoverflow_2023&column=LanguageHaveWorkedWith&other_column=DatabaseHaveWorkedWith&top_k=5"
+    )
+
+    assert response.status_code in [
+        200,
+        404,
+    ], f"Expected 200 or 404, got {response.status_code}"
+
+    if response.status_code == 200:
+        data = response.json()
+        assert len(data["pairs"]) <= 5, "Should return at most 5 pairs"
+        for pair in data["pairs"]:
+            assert pair["count"] > 0
+            assert pair["lift"] > 0
+
+
+def test_analysis_conditional_get():
+    """
+    Yarr! Analysis responses carry an ETag and a matching If-None-Match gets a 304
+    """
+    response = client.get("/api/analysis/technology-usage?top_n=5")
+
+    assert response.status_code in [
+        200,
+        404,
+    ], f"Expected 200 or 404, got {response.status_code}"
+
+    if response.status_code == 200:
+        etag = response.headers.get("etag")
+        assert etag, "Analysis responses should carry an ETag"
+        assert "cache-control" in response.headers
+
+        cached = client.get(
+            "/api/analysis/technology-usage?top_n=5",
+            headers={"If-None-Match": etag},
+        )
+        assert cached.status_code == 304, "Matching ETag should return 304"
+        assert cached.headers.get("etag") == etag
+
+        other = client.get(
+            "/api/analysis/technology-usage?top_n=6",
+            headers={"If-None-Match": etag},
+        )
+        assert other.status_code == 200, "Different parameters need a new ETag"
+
+
+def test_health_endpoints():
+    """
+    Yarr! Liveness answers at once and readiness turns 200 after warm-up
+    """
+    assert client.get("/healthz").json() == {"status": "ok"}
+
+    # Using the client as a context manager runs the startup lifespan
+    with TestClient(app) as started_client:
+        for _ in range(100):
+            response = started_client.get("/readyz")
+            if response.status_code == 200:
+                break
+            assert response.status_code == 503
+            assert "warmup" in response.json()
+            time.sleep(0.1)
+
+        assert response.status_code == 200, "Should become ready after warm-up"
+        assert response.json()["initialized"] is True
+
+
+def test_batch_technology_analysis_endpoint():
+    """
+    Yarr! Test the batch endpoint - good columns analyzed, bad ones reported
+    """
+    response = client.post(
+        "/api/analysis/technology-usage/batch",
+        json={
+            "source": "stackoverflow_2023",
+            "columns": [
+                {"column": "LanguageHaveWorkedWith", "top_n": 3},
+                {"column": "NotAColumn"},
+            ],
+        },
+    )
+
+    assert response.status_code in [
+        200,
+        404,
+    ], f"Expected 200 or 404, got {response.status_code}"
+
+    if response.status_code == 200:
+        results = response.json()["results"]
+        assert [r["column"] for r in results] == [
+            "LanguageHaveWorkedWith",
+            "NotAColumn",
+        ]
+        assert len(results[0]["result"]["labels"]) <= 3
+        assert results[0]["error"] is None
+        assert results[1]["result"] is None
+        assert "not available" in results[1]["error"]
+
+        single = client.get(
+            "/api/analysis/technology-usage?column=LanguageHaveWorkedWith&top_n=3"
+        )
+        assert single.json()["labels"] == results[0]["result"]["labels"]
+
+
+def test_memory_report_endpoint():
+    """
+    Yarr! Test the memory report lists per-source totals
+    """
+    response = client.get("/api/memory")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert "total_bytes" in data
+    assert data["total_bytes"] >= data["result_cache_bytes"] >= 0
+    for report in data["sources"].values():
+        assert report["total_bytes"] >= report["frames_bytes"]
+
+
+def test_metrics_endpoint_and_server_timing():
+    """
+    Yarr! Test analyses report stage timings and show up in /metrics
+    """
+    response = client.get(
+        "/api/analysis/technology-usage?column=LanguageHaveWorkedWith&top_n=4"
+    )
+    assert response.status_code in [200, 404]
+    timing = response.headers["server-timing"]
+    assert "total;dur=" in timing
+    if response.status_code == 200:
+        assert "serialize;dur=" in timing
+        assert "validate;dur=" in timing
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert "# TYPE insights_stage_seconds histogram" in text
+    assert 'route="/api/analysis/technology-usage"' in text
+    assert "insights_frame_cache_hits_total" in text
+    if "validate;dur=" in timing:
+        assert 'stage="validate"' in text
+
+
+def test_schema_and_sources_are_served_compressed_with_etags():
+    """
+    Yarr! Polled endpoints should come gzipped when asked and honour If-None-Match
+    """
+    for url in ("/api/schema/stackoverflow_2023", "/api/data-sources"):
+        response = client.get(url, headers={"Accept-Encoding": "gzip"})
+        if response.status_code != 200:
+            continue
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json()
+
+        plain = client.get(url, headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.json() == response.json()
+
+        etag = response.headers["etag"]
+        cached = client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+
+def test_export_endpoints_stream_ndjson_and_csv():
+    """
+    Yarr! Exports stream the full distribution and filtered respondent rows
+    """
+    response = client.get(
+        "/api/export/technology-distribution?column=LanguageHaveWorkedWith"
+    )
+    assert response.status_code in [200, 404]
+    if response.status_code == 200:
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = response.text.splitlines()
+        top = client.get("/api/analysis/technology-usage?top_n=3").json()
+        assert [json.loads(line)["technology"] for line in lines[:3]] == top["labels"]
+
+    response = client.get(
+        "/api/export/respondents?columns=ResponseId&columns=Country"
+        "&Country=Germany&format=csv"
+    )
+    assert response.status_code in [200, 404]
+    if response.status_code == 200:
+        assert "attachment" in response.headers["content-disposition"]
+        lines = response.text.splitlines()
+        assert lines[0] == "ResponseId,Country"
+        assert all(line.endswith(",Germany") for line in lines[1:])
+
+    response = client.get("/api/export/respondents?columns=NotAColumn")
+    assert response.status_code in [400, 404]
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Yarr! Tests for the metrics registry - stage timers, counters and their text format
+"""
+
+from app.metrics import Metrics, server_timing_header
+
+
+def test_stages_and_counters_render_as_prometheus_text():
+    """
+    Yarr! Stage timings should land in the histogram and counters keep their labels
+    """
+    metrics = Metrics(enabled=True)
+    with metrics.stage("parse"):
+        pass
+    metrics.observe_stage("parse", 0.2)
+    metrics.increment("rows_processed_total", 10, help="Rows", source="so")
+    metrics.increment("rows_processed_total", 5, source="so")
+
+    text = metrics.render({"cache_bytes": ("gauge", "Cache size", 42)})
+
+    assert 'insights_rows_processed_total{source="so"} 15' in text
+    assert 'insights_stage_seconds_bucket{stage="parse",le="0.1"} 1' in text
+    assert 'insights_stage_seconds_bucket{stage="parse",le="+Inf"} 2' in text
+    assert 'insights_stage_seconds_count{stage="parse"} 2' in text
+    assert "# TYPE insights_cache_bytes gauge\ninsights_cache_bytes 42" in text
+
+
+def test_request_timings_are_collected_per_request():
+    """
+    Yarr! Only stages timed inside track_request should count for that request
+    """
+    metrics = Metrics(enabled=True)
+    metrics.observe_stage("load", 1.0)
+    with metrics.track_request() as timings:
+        metrics.observe_stage("count", 0.002)
+        metrics.observe_stage("count", 0.003)
+    assert timings == {"count": 5.0}
+    assert server_timing_header(timings) == "count;dur=5.00"
+
+
+def test_disabled_metrics_record_nothing():
+    """
+    Yarr! With metrics off every hook should be a no-op
+    """
+    metrics = Metrics(enabled=False)
+    with metrics.track_request() as timings:
+        with metrics.stage("parse"):
+            pass
+        metrics.increment("rows_processed_total", 10)
+    assert timings is None
+    assert "insights_rows_processed_total" not in metrics.render()
+    assert "stage=" not in metrics.render()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Yarr! Tests for partitioned counting - every slice of the file counted exactly once
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from app import partitions
+from app.token_counting import count_tokens
+from tests.conftest import write_survey_csv
+
+
+def test_record_boundaries_skip_quoted_newlines(tmp_path):
+    """
+    Yarr! A newline inside a quoted field must never become a partition cut
+    """
+    csv_path = tmp_path / "quoted.csv"
+    csv_path.write_bytes(b'a,b\n1,"x\ny"\n2,"say ""hi""\n"\n3,z\n')
+    content = csv_path.read_bytes()
+
+    boundaries = partitions.record_boundaries(str(csv_path), range(len(content)))
+
+    assert boundaries == [4, 12, 28, len(content)]
+
+
+def test_csv_byte_ranges_cover_every_record(tmp_path):
+    """
+    Yarr! Counting byte ranges and merging must equal one serial count
+    """
+    csv_path = tmp_path / "survey.csv"
+    rows = [
+        (str(i), "Python;SQL" if i % 3 else "Rust; Go", "", "Germany", None)
+        for i in range(50)
+    ]
+    write_survey_csv(csv_path, rows)
+    header = partitions.read_header(str(csv_path))
+
+    ranges = partitions.csv_byte_ranges(str(csv_path), 4, len(header))
+    assert len(ranges) == 4
+    assert ranges[0][0] == len(header)
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+
+    task = partitions.CountTask.create("LanguageHaveWorkedWith")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        merged = partitions.count_partitions(
+            pool,
+            partitions.count_csv_range,
+            [(str(csv_path), start, end) for start, end in ranges],
+            header,
+            task,
+        )
+
+    expected = count_tokens(pd.read_csv(csv_path)["LanguageHaveWorkedWith"])
+    assert merged.top(10) == expected.top(10)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Yarr! Tests for request profiling - captures, the on-disk ring and its endpoints
+"""
+
+import pstats
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.profiling import ProfileStore
+
+
+def busy_work(n):
+    """Something worth profiling"""
+    return sum(i * i for i in range(n))
+
+
+def test_profiles_are_kept_in_a_bounded_ring(tmp_path):
+    """
+    Yarr! Each capture should be a loadable pstats file, and only the newest kept
+    """
+    store = ProfileStore(str(tmp_path), max_profiles=2)
+    ids = []
+    for n in (10, 20, 30):
+        result, profile_id = store.run(f"busy {n}", busy_work, n)
+        assert result == busy_work(n)
+        ids.append(profile_id)
+
+    profiles = store.list()
+    assert [info["id"] for info in profiles] == [ids[2], ids[1]]
+    assert profiles[0]["label"] == "busy 30"
+    assert len(list(tmp_path.glob("*.prof"))) == 2
+
+    stats = pstats.Stats(str(store.path(ids[2])))
+    assert any(func[2] == "busy_work" for func in stats.stats)
+    assert "busy_work" in store.summary(ids[2])
+
+
+def test_unknown_or_malformed_profile_ids_are_not_found(tmp_path):
+    """
+    Yarr! Only ids we generated should resolve to files
+    """
+    store = ProfileStore(str(tmp_path))
+    (tmp_path / "secret.prof").write_text("arr")
+    for profile_id in ("123-1", "secret", "../secret"):
+        with pytest.raises(FileNotFoundError):
+            store.path(profile_id)
+
+
+def test_profiled_request_round_trip(tmp_path, monkeypatch):
+    """
+    Yarr! A request with X-Profile should bypass the caches and leave a profile
+    """
+    client = TestClient(main.app)
+    response = client.get("/api/profiles")
+    assert response.status_code == 404, "Profiling should be off by default"
+
+    monkeypatch.setattr(main, "profile_store", ProfileStore(str(tmp_path)))
+    url = "/api/analysis/technology-usage?column=LanguageHaveWorkedWith&top_n=5"
+    plain = client.get(url)
+    profiled = client.get(url, headers={"X-Profile": "1"})
+    assert profiled.status_code == plain.status_code
+    if plain.status_code != 200:
+        return
+    assert "X-Profile-Id" not in plain.headers
+    assert profiled.json() == plain.json()
+
+    profile_id = profiled.headers["X-Profile-Id"]
+    listing = client.get("/api/profiles").json()
+    assert [info["id"] for info in listing["profiles"]] == [profile_id]
+    assert "/api/analysis/technology-usage" in listing["profiles"][0]["label"]
+
+    download = client.get(f"/api/profiles/{profile_id}")
+    assert download.status_code == 200
+    assert download.content == (tmp_path / f"{profile_id}.prof").read_bytes()
+    text = client.get(f"/api/profiles/{profile_id}?format=text")
+    assert "cumulative" in text.text
+    assert client.get("/api/profiles/0-0").status_code == 404
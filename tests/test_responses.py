@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Yarr! Tests for pre-encoded responses - JSON once, compressed once, served right
+"""
+
+import gzip
+import json
+
+import numpy as np
+
+from app.responses import (
+    MIN_COMPRESS_BYTES,
+    EncodedPayload,
+    PayloadCache,
+    encode_json,
+    negotiate_encoding,
+)
+
+
+def test_accept_encoding_negotiation():
+    """
+    Yarr! The client's codings and q-values should decide the variant
+    """
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("GZIP;q=0.5") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("*") in ("br", "gzip")
+    assert negotiate_encoding("*, gzip;q=0") != "gzip"
+
+
+def test_payload_variants_decode_to_the_same_json():
+    """
+    Yarr! Every stored variant should hold the very same JSON document
+    """
+    content = {"schema": [{"qname": f"Q{i}", "count": np.int64(i)} for i in range(100)]}
+    payload = EncodedPayload.from_content(content)
+    expected = json.loads(encode_json(content))
+    assert expected["schema"][5] == {"qname": "Q5", "count": 5}
+
+    body, coding = payload.variant("gzip, deflate")
+    assert coding == "gzip"
+    assert json.loads(gzip.decompress(body)) == expected
+    assert len(body) < len(payload.body)
+    assert payload.variant(None) == (payload.body, None)
+
+    small = EncodedPayload.from_content({"ok": True})
+    assert len(small.body) < MIN_COMPRESS_BYTES
+    assert small.variant("gzip") == (small.body, None)
+
+
+def test_payload_cache_rebuilds_only_for_new_versions():
+    """
+    Yarr! A payload should be encoded once per version
+    """
+    cache = PayloadCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"version": len(builds)}
+
+    first = cache.get("key", "v1", build)
+    assert cache.get("key", "v1", build) is first
+    assert cache.peek("key", "v2") is None
+    assert cache.get("key", "v2", build) is not first
+    assert len(builds) == 2
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 2}
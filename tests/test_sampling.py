@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Yarr! Tests for approximate analyses - estimates within their bounds, exact when small
+"""
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app import columnar, main, sampling
+from app.data_config import DataManager
+from app.token_counting import count_tokens
+from tests.conftest import write_survey_csv
+
+
+def _big_survey(path, rows=6000):
+    """Survey rows where the popular languages change along the file"""
+    survey = [
+        (
+            str(i),
+            "Python;SQL" if i % 3 else ("Rust; Go" if i < rows / 2 else "Go"),
+            "",
+            "Germany",
+            None,
+        )
+        for i in range(rows)
+    ]
+    write_survey_csv(path, survey)
+
+
+def test_csv_sample_brackets_exact_counts(tmp_path):
+    """
+    Yarr! Scaled-up sample counts should land within their error bounds
+    """
+    csv_path = tmp_path / "survey.csv"
+    _big_survey(csv_path)
+
+    sample = sampling.sample_csv(
+        str(csv_path), "LanguageHaveWorkedWith", 500, block_bytes=1024
+    )
+    assert sample is not None
+    assert 0 < sample.sample_fraction < 0.5
+
+    result = sample.top(10)
+    exact = count_tokens(pd.read_csv(csv_path)["LanguageHaveWorkedWith"]).top(10)
+    expected = dict(zip(exact["labels"], exact["values"]))
+    assert set(result["labels"]) == set(expected)
+    for label, value, bound in zip(
+        result["labels"], result["values"], result["error_bounds"]
+    ):
+        assert bound > 0
+        assert abs(value - expected[label]) <= bound
+
+
+def test_sample_blocks_start_on_record_boundaries(tmp_path, monkeypatch):
+    """
+    Yarr! Every sampled block should hold whole records, quoted newlines and
+    all - found locally, without scanning the file from its first byte
+    """
+    csv_path = tmp_path / "quoted.csv"
+    rows = [f'{i},"line one\nline {i}"\n' for i in range(2000)]
+    csv_path.write_text("a,b\n" + "".join(rows))
+    content = csv_path.read_bytes()
+    record_starts = {4 + sum(len(r.encode()) for r in rows[:i]) for i in range(2001)}
+
+    def scan_from_start(path, targets):
+        raise AssertionError("Blocks must sync on their own")
+
+    monkeypatch.setattr(sampling.partitions, "next_record_starts", scan_from_start)
+    ranges = sampling.sample_block_ranges(str(csv_path), 4, 5, 512)
+    assert len(ranges) == 5
+    for start, end in ranges:
+        assert start in record_starts and end in record_starts
+        assert start < end <= len(content)
+
+
+def test_row_group_sample_bounds_hold_for_ordered_data(tmp_path, monkeypatch):
+    """
+    Yarr! Rows within a row group are alike when the file is ordered - the
+    bounds must come from several groups and still cover the exact counts
+    """
+    csv_path = tmp_path / "survey.csv"
+    _big_survey(csv_path)
+    frame = pd.read_csv(csv_path)
+    monkeypatch.setattr(columnar, "ROW_GROUP_ROWS", 500)
+    copy_path = tmp_path / ".survey.csv.parquet"
+    columnar.build_columnar_copy(frame, copy_path, (0, 0), ["LanguageHaveWorkedWith"])
+
+    sample = sampling.sample_row_groups(copy_path, "LanguageHaveWorkedWith", 400)
+    assert len(sample.cluster_rows) == sampling.MIN_SAMPLE_CLUSTERS
+    assert not sample.exact
+
+    result = sample.top(10)
+    exact = count_tokens(frame["LanguageHaveWorkedWith"]).top(10)
+    expected = dict(zip(exact["labels"], exact["values"]))
+    for label, value, bound in zip(
+        result["labels"], result["values"], result["error_bounds"]
+    ):
+        assert abs(value - expected[label]) <= bound
+
+
+def test_memory_report_counts_row_samples(survey_data_dir, monkeypatch):
+    """
+    Yarr! Samples held for approximate analyses should show in the memory report
+    """
+    _big_survey(survey_data_dir / "mini_survey" / "survey_results.csv")
+    monkeypatch.setattr(columnar, "ROW_GROUP_ROWS", 500)
+    manager = DataManager(
+        str(survey_data_dir), approx_sample_rows=400, mapped_token_store=False
+    )
+    manager.load_data("mini_survey")
+    result = manager.analyze_technology_usage_approx(
+        "mini_survey", "LanguageHaveWorkedWith"
+    )
+    assert result["sample_fraction"] < 1
+
+    report = manager.get_memory_report()
+    source_report = report["sources"]["mini_survey"]
+    assert source_report["samples_bytes"] > 0
+    assert source_report["total_bytes"] >= (
+        source_report["frames_bytes"] + source_report["samples_bytes"]
+    )
+
+
+def test_approx_mode_is_exact_for_small_sources(survey_data_dir):
+    """
+    Yarr! Too small to sample means exact counts, zero bounds, fraction 1
+    """
+    manager = DataManager(str(survey_data_dir))
+    result = manager.analyze_technology_usage_approx(
+        "mini_survey", "LanguageHaveWorkedWith"
+    )
+    exact = manager.analyze_technology_usage("mini_survey", "LanguageHaveWorkedWith")
+
+    assert {key: result[key] for key in exact} == exact
+    assert result["error_bounds"] == [0] * len(exact["values"])
+    assert result["sample_fraction"] == 1.0
+
+    client = TestClient(main.app)
+    response = client.get("/api/analysis/technology-usage?top_n=3&mode=approx")
+    assert response.status_code in [200, 404]
+    if response.status_code == 200:
+        data = response.json()
+        assert data["mode"] == "approx"
+        assert len(data["error_bounds"]) == len(data["labels"])
+        assert 0 < data["sample_fraction"] <= 1
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Yarr! Tests for cross-source trends - labels matched, counts aligned, sources compared
+"""
+
+import threading
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app import main
+from app.data_config import DataManager
+from app.token_counting import TokenCounts
+from app.trends import align_token_counts, normalize_label
+from tests.conftest import write_survey_csv
+
+
+def _counts(pairs, total):
+    return TokenCounts(
+        labels=np.array([label for label, _ in pairs], dtype=object),
+        counts=np.array([count for _, count in pairs], dtype=np.int64),
+        total_responses=total,
+    )
+
+
+def test_labels_match_regardless_of_case_and_spacing():
+    """
+    Yarr! Spelling variants of one technology should share a key
+    """
+    assert normalize_label("Node.js") == normalize_label("node.JS")
+    assert normalize_label("Bash/Shell  (all shells)") == normalize_label(
+        " bash/shell (all shells)"
+    )
+    assert normalize_label("Ｒｕｓｔ") == normalize_label("Rust")
+    assert normalize_label("C") != normalize_label("C#")
+
+
+def test_counts_are_aligned_as_shares_of_each_source():
+    """
+    Yarr! Every source should report every label, ranked by summed share
+    """
+    trend = align_token_counts(
+        {
+            "survey_2022": _counts([("python", 30), ("Perl", 10)], 100),
+            "survey_2023": _counts([("Python", 20), ("Rust", 15)], 40),
+        },
+        top_n=2,
+    )
+
+    assert trend["labels"] == ["Python", "Rust"]
+    assert trend["series"]["survey_2022"] == {
+        "values": [30, 0],
+        "shares": [0.3, 0.0],
+        "total_responses": 100,
+    }
+    assert trend["series"]["survey_2023"]["shares"] == [0.5, 0.375]
+
+
+def test_trends_endpoint_compares_sources(survey_data_dir, monkeypatch):
+    """
+    Yarr! The endpoint should analyze each source and report bad ones per source
+    """
+    newer = survey_data_dir / "mini_survey_2024"
+    newer.mkdir()
+    write_survey_csv(
+        newer / "survey_results.csv",
+        [
+            ("1", "python;Rust", "SQLite", "Germany", "2 to 9 employees"),
+            ("2", "Rust", "SQLite", "India", "2 to 9 employees"),
+        ],
+    )
+    monkeypatch.setattr(main, "data_manager", DataManager(str(survey_data_dir)))
+    client = TestClient(main.app)
+
+    response = client.get(
+        "/api/analysis/trends",
+        params={"sources": ["mini_survey", "mini_survey_2024"], "top_n": 3},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    # Spelled as in the last (newest) source
+    assert data["labels"] == ["python", "Rust", "JavaScript"]
+    older, current = data["series"]
+    assert older["source"] == "mini_survey"
+    assert older["values"] == [3, 1, 2]
+    assert current["values"] == [1, 2, 0]
+    assert current["shares"] == [0.5, 1.0, 0.0]
+
+    response = client.get("/api/analysis/trends", params={"sources": ["nope"]})
+    assert response.status_code == 400
+
+
+def test_trends_only_count_technology_columns(survey_data_dir, monkeypatch):
+    """
+    Yarr! A column that isn't a technology column of a source is reported for
+    that source - and refused outright when no source has it
+    """
+    newer = survey_data_dir / "mini_survey_2024"
+    newer.mkdir()
+    write_survey_csv(newer / "survey_results.csv")
+    manager = DataManager(str(survey_data_dir))
+    manager.data_sources["mini_survey_2024"].primary_columns = [
+        "DatabaseHaveWorkedWith"
+    ]
+    monkeypatch.setattr(main, "data_manager", manager)
+    client = TestClient(main.app)
+
+    for column in ["Country", "NotAColumn"]:
+        response = client.get("/api/analysis/trends", params={"column": column})
+        assert response.status_code == 400
+        assert f"Column '{column}' not available" in response.json()["detail"]
+
+    response = client.get(
+        "/api/analysis/trends",
+        params={
+            "sources": ["mini_survey", "mini_survey_2024"],
+            "column": "LanguageHaveWorkedWith",
+        },
+    )
+    assert response.status_code == 200
+    older, newer_series = response.json()["series"]
+    assert older.get("error") is None
+    assert "not available for analysis" in newer_series["error"]
+
+    # Left out, the sources are just those with the column
+    response = client.get("/api/analysis/trends")
+    assert [item["source"] for item in response.json()["series"]] == ["mini_survey"]
+
+
+def test_trends_count_cold_sources_concurrently(survey_data_dir, monkeypatch):
+    """
+    Yarr! Two sources read for the first time should be parsed side by side,
+    not one after the other behind a shared lock
+    """
+    newer = survey_data_dir / "mini_survey_2024"
+    newer.mkdir()
+    write_survey_csv(newer / "survey_results.csv")
+    manager = DataManager(str(survey_data_dir))
+    monkeypatch.setattr(main, "data_manager", manager)
+
+    # Each parse waits for the other one to be under way too
+    both_parsing = threading.Barrier(2, timeout=5)
+    read_source_csv = manager._read_source_csv
+
+    def read_together(source, columns=None):
+        both_parsing.wait()
+        return read_source_csv(source, columns)
+
+    monkeypatch.setattr(manager, "_read_source_csv", read_together)
+    client = TestClient(main.app)
+
+    response = client.get(
+        "/api/analysis/trends",
+        params={"sources": ["mini_survey", "mini_survey_2024"], "top_n": 3},
+    )
+    assert response.status_code == 200
+    series = response.json()["series"]
+    assert [item.get("error") for item in series] == [None, None]
+    assert series[0]["values"] == series[1]["values"]